@@ -0,0 +1,252 @@
+"""
+Persistent on-disk cache for models in sparse representation.
+
+Models are stored in the binary model format (see :func:`stormpy.export_binary`) in a local directory.
+The key of a model is a hash of the symbolic model description (including the values of its constants),
+the preserved formulas and the builder options. The least recently used models are evicted if the cache exceeds its size bound.
+
+The cache is opt-in: after calling :func:`enable_model_cache`, :func:`stormpy.build_model`, :func:`stormpy.build_sparse_model`
+and :func:`stormpy.build_sparse_model_with_options` transparently return cached models.
+"""
+import hashlib
+import os
+import tempfile
+
+_SUFFIX = ".stormmodel"
+# Version of the key computation, increase if the key or the stored format changes
+_KEY_VERSION = 1
+
+
+def _default_directory():
+    base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "stormpy", "models")
+
+
+class ModelCache:
+    """
+    Directory of built models with size-bounded LRU eviction.
+    The access time of an entry is recorded as the modification time of its file, such that multiple processes can share the directory.
+    """
+
+    def __init__(self, directory=None, max_size=2**30):
+        """
+        :param directory: Directory of the cache. It is created if it does not exist. Defaults to ~/.cache/stormpy/models.
+        :param max_size: Maximal total size of the cached models in bytes.
+        """
+        self._directory = directory if directory is not None else _default_directory()
+        self._max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def key(self, symbolic_description, formulas=None, options=None):
+        """
+        Compute the key of a model.
+
+        :param symbolic_description: PRISM program, JANI model or symbolic model description.
+        :param formulas: Formulas (or properties) that are preserved, None if all are preserved.
+        :param options: BuilderOptions, None if the default options for the formulas are used.
+        :return: Hexadecimal hash.
+        """
+        import stormpy
+        import stormpy.info
+
+        if isinstance(symbolic_description, stormpy.SymbolicModelDescription):
+            if symbolic_description.is_prism_program:
+                symbolic_description = symbolic_description.as_prism_program()
+            else:
+                symbolic_description = symbolic_description.as_jani_model()
+        parts = [
+            "key version {}".format(_KEY_VERSION),
+            "stormpy {}".format(stormpy.__version__),
+            "storm {}".format(stormpy.info.storm_version()),
+            type(symbolic_description).__name__,
+            # The textual representation contains the definitions of all constants
+            str(symbolic_description),
+        ]
+        if formulas is None:
+            parts.append("all formulas")
+        else:
+            parts.append("formulas")
+            parts.extend(str(prop.raw_formula if isinstance(prop, stormpy.Property) else prop) for prop in formulas)
+        if options is not None:
+            parts.append("options")
+            parts.extend(
+                "{}={}".format(name, getattr(options, name))
+                for name in [
+                    "build_state_valuations",
+                    "build_observation_valuations",
+                    "build_with_choice_origins",
+                    "add_out_of_bounds_state",
+                    "add_overlapping_guards_label",
+                    "build_choice_labels",
+                    "exploration_checks",
+                    "build_all_labels",
+                    "build_all_reward_models",
+                ]
+            )
+            parts.append("labels={}".format(sorted(options.preserved_label_names)))
+            parts.append("reward models={}".format(sorted(options.preserved_reward_model_names)))
+            parts.append("expression labels={}".format(options.preserved_expression_labels))
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + _SUFFIX)
+
+    def get(self, key, expression_manager=None):
+        """
+        Get a cached model.
+
+        :param key: Key of the model.
+        :param expression_manager: Expression manager whose variables are used in the state valuations (optional).
+        :return: The model or None if the model is not cached.
+        """
+        import stormpy
+
+        path = self._path(key)
+        try:
+            model = stormpy.load_binary(path, expression_manager=expression_manager)
+        except (OSError, ValueError, RuntimeError, stormpy.StormError):
+            # Missing, removed concurrently, or corrupt (errors of the native decoder are RuntimeErrors)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return model
+
+    def put(self, key, model):
+        """
+        Store a model and evict least recently used models if the cache is too large.
+        Models that cannot be stored in the binary model format are ignored.
+
+        :param key: Key of the model.
+        :param model: Model in sparse representation with double values.
+        :return: True iff the model was stored.
+        """
+        import stormpy
+
+        if not model.is_sparse_model or model.supports_parameters or model.supports_uncertainty or model.is_exact:
+            return False
+        if model.model_type not in [stormpy.ModelType.DTMC, stormpy.ModelType.MDP, stormpy.ModelType.POMDP, stormpy.ModelType.CTMC, stormpy.ModelType.MA]:
+            return False
+        # Write to a temporary file first such that readers never see partially written files
+        handle, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        os.close(handle)
+        try:
+            stormpy.export_binary(model, temporary)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.evict()
+        return True
+
+    def get_or_build(self, key, build, expression_manager=None):
+        """
+        Get a cached model or build and store it.
+
+        :param key: Key of the model.
+        :param build: Function without arguments building the model.
+        :param expression_manager: Expression manager whose variables are used in the state valuations of a cached model (optional).
+        :return: The model.
+        """
+        model = self.get(key, expression_manager)
+        if model is None:
+            model = build()
+            self.put(key, model)
+        return model
+
+    def entries(self):
+        """
+        :return: List of tuples (key, size in bytes, last access time) of the cached models, least recently used first.
+        """
+        result = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                result.append((entry.name[: -len(_SUFFIX)], stat.st_size, stat.st_mtime))
+        result.sort(key=lambda item: item[2])
+        return result
+
+    def size(self):
+        """
+        :return: Total size of the cached models in bytes.
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Remove least recently used models until the cache does not exceed its maximal size.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """
+        Remove all cached models.
+        """
+        for key, _, _ in self.entries():
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+_active_cache = None
+
+
+def enable_model_cache(directory=None, max_size=2**30):
+    """
+    Enable the model cache for all subsequent calls building sparse models with double values.
+
+    :param directory: Directory of the cache. Defaults to ~/.cache/stormpy/models.
+    :param max_size: Maximal total size of the cached models in bytes.
+    :return: The cache.
+    """
+    global _active_cache
+    _active_cache = ModelCache(directory, max_size)
+    return _active_cache
+
+
+def disable_model_cache():
+    """
+    Disable the model cache. Cached models remain on disk.
+    """
+    global _active_cache
+    _active_cache = None
+
+
+def get_model_cache():
+    """
+    :return: The enabled model cache or None if caching is disabled.
+    """
+    return _active_cache
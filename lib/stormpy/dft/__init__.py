@@ -3,6 +3,11 @@ from . import _config
 if not _config.storm_with_dft:
     raise ImportError("No support for DFTs was built in Storm.")
 
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 from . import dft
 from .dft import *
 from .modules import modules_json
@@ -18,12 +23,12 @@ def analyze_dft(ft, properties, symred=True, allow_modularisation=False, relevan
         return dft._analyze_dft_ratfunc(ft, properties, symred, allow_modularisation, relevant_events, allow_dc_for_relevant)
 
 
-def build_model(ft, symmetries=DftSymmetries(), relevant_events=RelevantEvents(), allow_dc_for_relevant=False):
+def build_model(ft, symmetries=DftSymmetries(), relevant_events=RelevantEvents(), allow_dc_for_relevant=False, progress=None):
     if isinstance(ft, DFT_double):
-        return dft._build_model_double(ft, symmetries, relevant_events, allow_dc_for_relevant)
+        return dft._build_model_double(ft, symmetries, relevant_events, allow_dc_for_relevant, progress)
     else:
         assert isinstance(ft, DFT_ratfunc)
-        return dft._build_model_ratfunc(ft, symmetries, relevant_events, allow_dc_for_relevant)
+        return dft._build_model_ratfunc(ft, symmetries, relevant_events, allow_dc_for_relevant, progress)
 
 
 def transform_dft(ft, unique_constant_be, binary_fdeps, exponential_distributions):
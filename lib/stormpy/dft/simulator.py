@@ -1,5 +1,8 @@
+import random
+
 import stormpy
 import stormpy.dft
+from stormpy.smc import _wilson_interval
 
 
 class DftSimulator:
@@ -21,11 +24,13 @@ class DftSimulator:
         relevant_events = stormpy.dft.compute_relevant_events([], additional_relevant_names=relevant)
         self._dft.set_relevant_events(relevant_events, False)
         # Create information for state space generation
-        info = self._dft.state_generation_info()
+        self._info = self._dft.state_generation_info()
         # Initialize random generator
         generator = stormpy.dft.RandomGenerator.create(seed)
         # Create simulator
-        self._simulator = stormpy.dft.DFTSimulator_double(self._dft, info, generator)
+        self._simulator = stormpy.dft.DFTSimulator_double(self._dft, self._info, generator)
+        # Random generator for seeding parallel simulations
+        self._parallel_rng = random.Random(seed)
         # Initialize variables
         self._state = None
         self._fail_candidates = dict()
@@ -155,6 +160,30 @@ class DftSimulator:
         self.reset()
         return success
 
+    def simulate_traces_parallel(self, timebound, nr_traces, threads=0, seed=None, confidence=0.95, failure_times=False):
+        """
+        Simulate a number of traces via Monte Carlo simulation in parallel and check how many led to an overall failure within the given timebound.
+        Each worker thread uses its own simulator state and an independent random number stream derived from the seed.
+        The state of this simulator is not changed.
+
+        :param timebound: Time bound up till which traces are simulated.
+        :param nr_traces: The number of traces to simulate.
+        :param threads: Number of worker threads. If 0, the number of hardware threads is used.
+        :param seed: Seed for the random number streams. If None, a seed is drawn from a generator initialized with the seed of the simulator.
+        :param confidence: Confidence level of the returned interval.
+        :param failure_times: Whether to additionally return the failure times as NumPy array (inf for traces without failure).
+        :return: Tuple of the number of traces which led to an overall failure and the (Wilson score) confidence interval for the failure probability.
+            If failure_times is True, the failure times are returned as third element.
+        """
+        if seed is None:
+            seed = self._parallel_rng.getrandbits(64)
+        failures, times = stormpy.dft.DFTSimulator_double._simulate_traces_parallel(self._dft, self._info, timebound, nr_traces, threads, seed,
+                                                                                      failure_times)
+        interval = _wilson_interval(failures, nr_traces, confidence)
+        if failure_times:
+            return failures, interval, times
+        return failures, interval
+
     def reset(self):
         """
         Reset the simulator to the initial state.
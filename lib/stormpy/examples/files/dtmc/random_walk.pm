@@ -0,0 +1,17 @@
+// Random walk with a drift towards zero, reaching the upper boundary is a rare event
+dtmc
+
+const int N = 10;
+const double p = 0.2;
+
+module walk
+
+	x : [0..N] init 1;
+	
+	[] x>0 & x<N -> p : (x'=x+1) + 1-p : (x'=x-1);
+	[] x=0 | x=N -> 1 : (x'=x);
+	
+endmodule
+
+label "empty" = x=0;
+label "full" = x=N;
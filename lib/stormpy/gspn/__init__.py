@@ -3,5 +3,10 @@ from . import _config
 if not _config.storm_with_gspn:
     raise ImportError("No support for GSPNs was built in Storm.")
 
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 from . import gspn
 from .gspn import *
@@ -1,2 +1,7 @@
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 from . import logic
 from .logic import *
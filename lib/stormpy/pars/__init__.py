@@ -3,9 +3,15 @@ from . import _config
 if not _config.storm_with_pars:
     raise ImportError("No support for parametric analysis was built in Storm.")
 
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 from . import pars
 from .pars import *
 
+import stormpy
 from stormpy import ModelType, StormError
 
 pars._set_up()
@@ -41,6 +47,70 @@ class ModelInstantiator:
         return self._instantiator.instantiate(valuation)
 
 
+class IncrementalModelBuilder:
+    """
+    Builder for models that are repeatedly built for different values of constants.
+
+    If the undefined constants of the symbolic description are graph-preserving, i.e., they only occur in probabilities, rates and rewards,
+    the state space is explored once into a parametric model with the constants as parameters.
+    Subsequent builds reuse the explored states (including their ids) and the matrix structure, and only evaluate the transition and reward
+    values for the given constants.
+    Transitions whose value is zero for the given constants are kept as explicit zero entries.
+    Otherwise, the model is fully rebuilt for each set of values.
+    """
+
+    def __init__(self, symbolic_description, properties=None):
+        """
+        Constructor.
+        :param symbolic_description: PRISM program or JANI model with undefined constants.
+        :param properties: List of properties that should be preserved during the translation. If None, then all properties are preserved.
+        """
+        self._description = symbolic_description
+        self._properties = properties
+        self._instantiator = None
+        self._parametric_model = None
+        self._parameters = dict()
+        self._undefined_constants = {constant.name for constant in symbolic_description.constants if not constant.defined}
+        if symbolic_description.undefined_constants_are_graph_preserving:
+            parametric_model = stormpy.build_sparse_parametric_model(symbolic_description, properties)
+            if parametric_model.model_type in [ModelType.DTMC, ModelType.MDP, ModelType.CTMC, ModelType.MA]:
+                # The instantiator refers to the parametric model, which is therefore kept alive
+                self._parametric_model = parametric_model
+                self._instantiator = ModelInstantiator(parametric_model)
+                self._parameters = {parameter.name: parameter for parameter in parametric_model.collect_all_parameters()}
+
+    @property
+    def incremental(self):
+        """
+        Flag whether models are built incrementally.
+        """
+        return self._instantiator is not None
+
+    def build(self, constants):
+        """
+        Build the model for the given values of the undefined constants.
+        :param constants: Dictionary from constant names to values, or string of constant definitions, e.g., "p=0.3,q=0.5".
+        :return: Model in sparse representation.
+        """
+        if isinstance(constants, str):
+            constants = dict(definition.split("=", 1) for definition in constants.split(",") if definition.strip())
+        constants = {name.strip(): str(value).strip() for name, value in constants.items()}
+        unknown = [name for name in constants if name not in self._undefined_constants and name not in self._parameters]
+        if unknown:
+            raise StormError("Constants {} are not undefined constants of the model".format(", ".join(sorted(unknown))))
+        if not self.incremental:
+            definitions = ",".join("{}={}".format(name, value) for name, value in constants.items())
+            description = stormpy.preprocess_symbolic_input(self._description, [], definitions)[0]
+            description = description.as_prism_program() if description.is_prism_program else description.as_jani_model()
+            return stormpy.build_model(description, self._properties)
+
+        missing = [name for name in self._parameters if name not in constants]
+        if missing:
+            raise StormError("No values given for constants {}".format(", ".join(sorted(missing))))
+        valuation = {parameter: stormpy.RationalRF(constants[name]) for name, parameter in self._parameters.items()}
+        return self._instantiator.instantiate(valuation)
+
+
 def simplify_model(model, formula):
     """
     Simplify parametric model preserving the given formula by eliminating states with constant outgoing probabilities.
@@ -1,4 +1,6 @@
+from collections import namedtuple
 from enum import Enum
+import random
 
 import stormpy.core
 
@@ -11,6 +13,8 @@ class SimulatorActionMode(Enum):
     INDEX_LEVEL = 0,
     GLOBAL_NAMES = 1
 
+PrismSimulatorCacheInfo = namedtuple("PrismSimulatorCacheInfo", ["hits", "misses", "capacity", "size"])
+
 class Simulator:
     """
     Abstract base class for simulators.
@@ -20,6 +24,7 @@ class Simulator:
         self._observation_mode = SimulatorObservationMode.STATE_LEVEL
         self._action_mode = SimulatorActionMode.INDEX_LEVEL
         self._full_observe = False
+        self._recorder = None
 
     def nr_available_actions(self):
         """
@@ -92,6 +97,52 @@ class Simulator:
         """
         self._full_observe = value
 
+    def start_recording(self, path, chunk_size=65536, compression=None):
+        """
+        Record all subsequent steps into a binary trace file, see stormpy.traces.
+        Each restart starts a new trace, the current state starts the first trace.
+        Each step stores the reached state, the action offset (-1 if unknown, e.g., for the first step of a trace), the rewards and the label mask.
+        An ongoing recording is stopped.
+
+        :param path: Path of the trace file.
+        :param chunk_size: Number of steps per chunk.
+        :param compression: None or "zlib".
+        """
+        import stormpy.traces
+        self.stop_recording()
+        columns, metadata = self._trace_columns()
+        columns["actions"] = ("i8", ())
+        self._recorder = stormpy.traces.TraceWriter(path, columns, chunk_size=chunk_size, compression=compression, metadata=metadata)
+        self._recorder.start_trace()
+        self._record(-1)
+
+    def stop_recording(self):
+        """
+        Stop recording and close the trace file.
+        """
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def _trace_columns(self):
+        """
+        :return: Tuple of the columns of a step (except the action) and the metadata of trace files.
+        """
+        raise NotImplementedError("Recording is not supported by this simulator")
+
+    def _trace_step(self):
+        """
+        :return: Dictionary with the values of the current step for the columns given by _trace_columns().
+        """
+        raise NotImplementedError("Recording is not supported by this simulator")
+
+    def _record(self, action, restart=False):
+        if self._recorder is None:
+            return
+        if restart:
+            self._recorder.start_trace()
+        self._recorder.append(actions=action, **self._trace_step())
+
 
 class SparseSimulator(Simulator):
     """
@@ -101,37 +152,50 @@ class SparseSimulator(Simulator):
     def __init__(self, model, seed=None):
         super().__init__(seed)
         self._model = model
-        if self._model.is_exact:
-            self._engine = stormpy.core._DiscreteTimeSparseModelSimulatorExact(model)
-        else:
-            self._engine = stormpy.core._DiscreteTimeSparseModelSimulatorDouble(model)
+        self._engine = self._create_engine(model)
         if seed is not None:
             self._engine.set_seed(seed)
         self._state_valuations = None
+        self._batch_rng = random.Random(seed)
+        # Random generator for choosing actions in recorded random steps
+        self._rng = random.Random(seed)
+        # Index of action names, built on the first lookup of an action name
+        self._action_index = None
         self.set_full_observability(self._model.model_type != stormpy.storage.ModelType.POMDP)
 
+    def _get_action_index(self):
+        """
+        :return: Index of the action names of the model, built once on the first call.
+        """
+        if self._action_index is None:
+            if not self._model.has_choice_labeling():
+                raise RuntimeError("Global names action mode requires model with choice labeling")
+            self._action_index = stormpy.core._ChoiceNameIndex(self._model)
+        return self._action_index
+
+    @staticmethod
+    def _create_engine(model):
+        if model.is_exact:
+            return stormpy.core._DiscreteTimeSparseModelSimulatorExact(model)
+        return stormpy.core._DiscreteTimeSparseModelSimulatorDouble(model)
+
     def set_seed(self, value):
         self._engine.set_seed(value)
+        self._rng.seed(value)
+        self._batch_rng.seed(value)
 
     def available_actions(self):
         if self._action_mode == SimulatorActionMode.INDEX_LEVEL:
             return range(self.nr_available_actions())
         else:
             assert self._action_mode == SimulatorActionMode.GLOBAL_NAMES, "Unknown type of simulator action mode"
-            if not self._model.has_choice_labeling():
-                raise RuntimeError("Global names action mode requires model with choice labeling")
-            av_actions = []
-            current_state = self._engine.get_current_state()
-            for action_offset in range(self.nr_available_actions()):
-                choice_label = self._model.choice_labeling.get_labels_of_choice(self._model.get_choice_index(current_state, action_offset))
-                if len(choice_label) == 0:
-                    av_actions.append(f"_act_{action_offset}")
-                elif len(choice_label) == 1:
-                    av_actions.append(list(choice_label)[0])
-                else:
-                    assert False, "Unknown type of choice label, support not implemented"
-
-            return av_actions
+            return self._get_action_index().get_names(self._engine.get_current_state())[self._first_action_offset():]
+
+    def _first_action_offset(self):
+        """
+        :return: Offset of the choice corresponding to the first action in the current state.
+        """
+        return 0
 
     def nr_available_actions(self):
         if not self._model.is_nondeterministic_model:
@@ -170,8 +234,16 @@ class SparseSimulator(Simulator):
         return self._model.labeling.get_labels_of_state(self._engine.get_current_state())
 
     def random_step(self):
-        check = self._engine.random_step()
+        nr_actions = self.nr_available_actions()
+        if self._recorder is not None and nr_actions > 1:
+            # The native random step does not report its choice, so the action is chosen here such that it can be recorded
+            action = self._rng.randrange(nr_actions)
+            check = self._engine.step(action)
+        else:
+            action = 0 if nr_actions == 1 else -1
+            check = self._engine.random_step()
         assert check
+        self._record(action)
         return self._report_result()
 
     def step(self, action=None):
@@ -179,34 +251,45 @@ class SparseSimulator(Simulator):
         if action is None:
             if self._model.is_nondeterministic_model and self.nr_available_actions() > 1:
                 raise RuntimeError("Must specify an action in nondeterministic models.")
-            check = self._engine.step(0)
-            assert check
+            action_index = 0
         elif type(action) == int and self._action_mode == SimulatorActionMode.INDEX_LEVEL:
             if action >= self.nr_available_actions():
                 raise RuntimeError(f"Only {self.nr_available_actions()} actions available")
-            check = self._engine.step(action)
-            assert check
+            action_index = action
         elif self._action_mode == SimulatorActionMode.GLOBAL_NAMES:
-            action_index = None
-            av_actions = self.available_actions()
-            for offset, label in enumerate(av_actions):
-                if action == label:
-                    action_index = offset
-                    break
-            if action_index is None:
+            action_index = self._get_action_index().get_offset(self._engine.get_current_state(), action)
+            if action_index is None or action_index < self._first_action_offset():
                 raise ValueError(f"Could not find action: {action}")
-            check = self._engine.step(action_index)
-            assert check
+            action_index -= self._first_action_offset()
         else:
             raise ValueError(f"Unrecognized type of action {action}")
+        check = self._engine.step(action_index)
+        assert check
+        self._record(action_index)
         return self._report_result()
 
     def restart(self, state = None):
         if state is not None:
             raise RuntimeError("Not implemented")
         self._engine.reset_to_initial_state()
+        self._record(-1, restart=True)
         return self._report_result()
 
+    def _trace_columns(self):
+        import numpy as np
+        label_names = sorted(self._model.labeling.get_labels())
+        # Label masks of all states, bit i (in word i // 64) is set if the state has the i-th label
+        self._label_masks = np.zeros((self._model.nr_states, max(1, (len(label_names) + 63) // 64)), dtype=np.uint64)
+        for bit, label in enumerate(label_names):
+            states = self._model.labeling.get_states(label).to_numpy()
+            self._label_masks[states, bit // 64] |= np.uint64(1 << (bit % 64))
+        columns = {"states": ("i8", ()), "rewards": ("f8", (len(self.get_reward_names()),)), "labels": ("u8", (self._label_masks.shape[1],))}
+        return columns, {"simulator": "sparse", "label_names": label_names, "reward_names": self.get_reward_names()}
+
+    def _trace_step(self):
+        state = self._engine.get_current_state()
+        return {"states": state, "rewards": self._report_rewards(), "labels": self._label_masks[state]}
+
     def is_done(self):
         return self._model.is_sink_state(self._engine.get_current_state())
 
@@ -220,6 +303,178 @@ class SparseSimulator(Simulator):
     def get_reward_names(self):
         return list(self._model.reward_models.keys())
 
+    def simulate_batch(self, n_paths, max_steps, scheduler=None, target=None, record_paths=True, avoid=None, seed=None):
+        """
+        Simulate many independent paths from the initial state natively.
+        The state of the simulator itself is not changed.
+        A path stops when it reaches a target state, an avoid state, a sink state, or after max_steps steps.
+        Without a scheduler, actions are selected uniformly at random.
+
+        :param n_paths: Number of paths.
+        :param max_steps: Maximal number of steps per path.
+        :param scheduler: Memoryless deterministic scheduler to resolve nondeterminism (optional).
+        :param target: Label or BitVector of target states (optional).
+        :param record_paths: If True, all visited states are returned. Otherwise, only the final states are returned.
+        :param avoid: Label or BitVector of states in which paths stop without reaching the target (optional).
+        :param seed: Seed for this batch. If None, the seed is drawn from a generator initialized with the seed of the simulator.
+        :return: Tuple of NumPy arrays (states, rewards, hits).
+            States has shape (n_paths, max_steps + 1) and is padded with -1 after a path stopped, or shape (n_paths,) if record_paths is False.
+            Rewards has shape (n_paths, nr_reward_models) with the accumulated rewards in the order of get_reward_names().
+            Hits is a boolean array indicating whether each path reached the target.
+        """
+        if self._model.is_exact:
+            raise NotImplementedError("Batch simulation is only supported for models with double values")
+        target = self._get_states(target)
+        avoid = self._get_states(avoid)
+        if seed is None:
+            seed = self._batch_rng.getrandbits(64)
+        return stormpy.core._DiscreteTimeSparseModelSimulatorDouble._simulate_batch(self._model, n_paths, max_steps, scheduler, target, avoid, seed, record_paths)
+
+    def _get_states(self, states):
+        if isinstance(states, str):
+            if not self._model.labeling.contains_label(states):
+                raise ValueError(f"Unknown label {states}")
+            return self._model.labeling.get_states(states)
+        return states
+
+
+class ContinuousTimeSparseSimulator(SparseSimulator):
+    """
+    Simulator on top of sparse continuous-time models, i.e., CTMCs and MAs.
+    In Markovian states, the sojourn time is sampled from the exit rate. Probabilistic states are left without delay.
+    Following the maximal progress assumption, the Markovian choice of a Markovian state with probabilistic choices is not available.
+    State rewards are accumulated proportionally to the sojourn time.
+    """
+
+    def __init__(self, model, seed=None):
+        if model.is_discrete_time_model:
+            raise ValueError("Continuous-time simulation requires a CTMC or an MA")
+        super().__init__(model, seed)
+
+    @staticmethod
+    def _create_engine(model):
+        if model.is_exact:
+            raise NotImplementedError("Continuous-time simulation is only supported for models with double values")
+        return stormpy.core._ContinuousTimeSparseModelSimulatorDouble(model)
+
+    def _first_action_offset(self):
+        return self._engine.get_first_enabled_choice()
+
+    def nr_available_actions(self):
+        return self._engine.get_nr_available_actions()
+
+    def get_current_time(self):
+        """
+        :return: Time elapsed since the initial state.
+        """
+        return self._engine.get_current_time()
+
+    def _trace_columns(self):
+        columns, metadata = super()._trace_columns()
+        columns["times"] = ("f8", ())
+        return columns, metadata
+
+    def _trace_step(self):
+        values = super()._trace_step()
+        values["times"] = self._engine.get_current_time()
+        return values
+
+    def get_last_sojourn_time(self):
+        """
+        :return: Time spent in the state which was left by the last step.
+        """
+        return self._engine.get_last_sojourn_time()
+
+    def simulate_batch(self, n_paths, time_bound=float("inf"), max_steps=10000, scheduler=None, target=None, avoid=None, seed=None):
+        """
+        Simulate many independent time-bounded paths from the initial state natively.
+        The state of the simulator itself is not changed.
+        A path stops when it reaches a target state, an avoid state, a sink state, after max_steps steps, or when the time bound is exceeded.
+        Without a scheduler, enabled choices are selected uniformly at random.
+
+        :param n_paths: Number of paths.
+        :param time_bound: Time bound for each path.
+        :param max_steps: Maximal number of steps per path.
+        :param scheduler: Memoryless deterministic scheduler to resolve nondeterminism (optional).
+        :param target: Label or BitVector of target states (optional).
+        :param avoid: Label or BitVector of states in which paths stop without reaching the target (optional).
+        :param seed: Seed for this batch. If None, the seed is drawn from a generator initialized with the seed of the simulator.
+        :return: Tuple of NumPy arrays (states, times, rewards, hits).
+            States contains the final state of each path.
+            Times contains the time at which each path stopped, i.e., the time of reaching the target for paths hitting it.
+            Rewards has shape (n_paths, nr_reward_models) with the rewards accumulated until the path stopped, in the order of get_reward_names().
+            Hits is a boolean array indicating whether each path reached the target within the time bound.
+        """
+        target = self._get_states(target)
+        avoid = self._get_states(avoid)
+        if seed is None:
+            seed = self._batch_rng.getrandbits(64)
+        return stormpy.core._ContinuousTimeSparseModelSimulatorDouble._simulate_batch(self._model, n_paths, time_bound, max_steps, scheduler, target, avoid, seed)
+
+
+class VectorizedSimulator:
+    """
+    Simulator for many instances of a sparse model which are advanced together natively.
+    Intended as vectorized environment for reinforcement learning.
+    """
+
+    def __init__(self, model, n_envs, seed=None, max_steps=None):
+        """
+        :param model: Sparse model (with double values).
+        :param n_envs: Number of instances.
+        :param seed: A seed for reproducibility. If None (default), the seed is internally generated.
+        :param max_steps: Maximal number of steps of an episode (optional). Instances are reset after this number of steps.
+        """
+        if not model.is_sparse_model or model.is_exact or model.supports_parameters:
+            raise NotImplementedError("Vectorized simulation is only supported for sparse models with double values")
+        self._model = model
+        if seed is None:
+            seed = random.getrandbits(64)
+        self._engine = stormpy.core._VectorizedSparseModelSimulatorDouble(model, n_envs, seed, max_steps if max_steps is not None else 0)
+
+    @property
+    def n_envs(self):
+        return self._engine.nr_instances
+
+    def get_label_names(self):
+        """
+        :return: Names of the labels in the order of the bits in the label masks.
+        """
+        return self._engine.label_names
+
+    def get_reward_names(self):
+        """
+        :return: Names of the reward models in the order of the columns of the rewards.
+        """
+        return self._engine.reward_names
+
+    def nr_available_actions(self):
+        """
+        :return: NumPy array with the number of available actions for each instance.
+        """
+        return self._engine.get_nr_available_actions()
+
+    def reset(self):
+        """
+        Reset all instances to the initial state.
+
+        :return: NumPy array of observations (state ids, or observation ids for POMDPs).
+        """
+        return self._engine.reset()
+
+    def step(self, actions=None):
+        """
+        Advance all instances by one step.
+        Instances which reach a sink state (or the maximal number of steps) are reset automatically.
+        For those, the returned observation is the observation of the initial state, while rewards and labels refer to the reached state.
+
+        :param actions: NumPy array with the action index for each instance. May be None for deterministic models.
+        :return: Tuple of NumPy arrays (observations, rewards, dones, labels).
+            Rewards have shape (n_envs, nr_reward_models), in the order of get_reward_names().
+            Labels have shape (n_envs, words) of uint64 where bit i (in word i // 64) is set if the reached state has the i-th label of get_label_names().
+        """
+        return self._engine.step(actions)
+
 
 class PrismSimulator(Simulator):
     """
@@ -227,11 +482,17 @@ class PrismSimulator(Simulator):
     Uses the simulator based on the nextstate generator.
     """
 
-    def __init__(self, program, seed=None, options=stormpy.BuilderOptions()):
+    def __init__(self, program, seed=None, options=stormpy.BuilderOptions(), cache_capacity=100000):
+        """
+        :param program: Prism program.
+        :param seed: A seed for reproducibility. If None (default), the seed is internally generated.
+        :param options: BuilderOptions for the next state generator.
+        :param cache_capacity: Maximal number of expanded states kept in the LRU cache. 0 disables the cache.
+        """
         super().__init__(seed)
         self._program = program
         #TODO support exact arithmetic here
-        self._engine = stormpy.core._DiscreteTimePrismProgramSimulatorDouble(program, options)
+        self._engine = stormpy.core._CachingPrismProgramSimulatorDouble(program, options, cache_capacity)
         if seed is not None:
             self._engine.set_seed(seed)
         self.set_full_observability(self._program.model_type != stormpy.storage.PrismModelType.POMDP)
@@ -239,12 +500,35 @@ class PrismSimulator(Simulator):
     def set_seed(self, value):
         self._engine.set_seed(value)
 
+    def set_cache_capacity(self, capacity):
+        """
+        Set the maximal number of expanded states kept in the cache.
+        Least recently used states are evicted if the cache is full.
+
+        :param capacity: Capacity of the cache. 0 disables the cache.
+        """
+        self._engine.cache_capacity = capacity
+
+    def cache_info(self):
+        """
+        Statistics of the cache of expanded states.
+
+        :return: Named tuple with the number of cache hits and misses, the capacity and the current size.
+        """
+        return PrismSimulatorCacheInfo(self._engine.cache_hits, self._engine.cache_misses, self._engine.cache_capacity, self._engine.cache_size)
+
+    def clear_cache(self):
+        """
+        Clear the cache of expanded states and reset the statistics.
+        """
+        self._engine.clear_cache()
+
     def available_actions(self):
         if self._action_mode == SimulatorActionMode.INDEX_LEVEL:
             return range(self.nr_available_actions())
         else:
             assert self._action_mode == SimulatorActionMode.GLOBAL_NAMES, "Unknown type of simulator action mode"
-            return [self._program.get_action_name(i) for i in self._engine.get_action_indices()]
+            return self._engine.get_action_names()
 
     def nr_available_actions(self):
         return self._engine.get_number_of_current_choices()
@@ -273,35 +557,30 @@ class PrismSimulator(Simulator):
         return self._engine.get_current_labels()
 
     def random_step(self):
-        raise NotImplementedError("Random steps are not implemented in this simulator")
-        # check = self._engine.random_step()
-        # assert check
+        action = self._engine.random_step()
+        if action < 0:
+            raise RuntimeError("No action available in the current state")
+        self._record(action)
         return self._report_result()
 
     def step(self, action=None):
         if action is None:
             if not self._program.is_deterministic_model and self.nr_available_actions() > 1:
                 raise RuntimeError("Must specify an action in nondeterministic models.")
-            check = self._engine.step(0)
-            assert check
+            action_index = 0
         elif type(action) == int and self._action_mode == SimulatorActionMode.INDEX_LEVEL:
             if action >= self.nr_available_actions():
                 raise RuntimeError(f"Only {self.nr_available_actions()} actions available")
-            check = self._engine.step(action)
-            assert check
+            action_index = action
         elif self._action_mode == SimulatorActionMode.GLOBAL_NAMES:
-            action_index = None
-            av_actions = self.available_actions()
-            for offset, label in enumerate(av_actions):
-                if action == label:
-                    action_index = offset
-                    break
+            action_index = self._engine.get_action_offset(action)
             if action_index is None:
                 raise ValueError(f"Could not find action: {action}")
-            check = self._engine.step(action_index)
-            assert check
         else:
             raise ValueError(f"Unrecognized type of action {action}")
+        check = self._engine.step(action_index)
+        assert check
+        self._record(action_index)
         return self._report_result()
 
     def restart(self, state = None):
@@ -314,6 +593,7 @@ class PrismSimulator(Simulator):
                 self._engine._reset_to_state_from_valuation(state)
             else:
                 raise ValueError(f"States of type {type(state)} are not supported yet.")
+        self._record(-1, restart=True)
         return self._report_result()
 
     def is_done(self):
@@ -327,6 +607,23 @@ class PrismSimulator(Simulator):
     def get_reward_names(self):
         return self._engine.get_reward_names()
 
+    def _trace_columns(self):
+        label_names = sorted(label.name for label in self._program.labels)
+        self._label_bits = {name: bit for bit, name in enumerate(label_names)}
+        self._label_words = max(1, (len(label_names) + 63) // 64)
+        # States are stored as the buckets of the compressed state
+        state_words = len(self._engine.get_current_state().to_buckets())
+        columns = {"states": ("u8", (state_words,)), "rewards": ("f8", (len(self.get_reward_names()),)), "labels": ("u8", (self._label_words,))}
+        return columns, {"simulator": "prism", "label_names": label_names, "reward_names": self.get_reward_names()}
+
+    def _trace_step(self):
+        import numpy as np
+        labels = np.zeros(self._label_words, dtype=np.uint64)
+        for name in self._engine.get_current_labels():
+            bit = self._label_bits[name]
+            labels[bit // 64] |= np.uint64(1 << (bit % 64))
+        return {"states": self._engine.get_current_state().to_buckets(), "rewards": self._report_rewards(), "labels": labels}
+
 def create_simulator(model, seed = None, options=None, ):
     """
     Factory method for creating a simulator.
@@ -338,7 +635,9 @@ def create_simulator(model, seed = None, options=None, ):
     """
     if isinstance(model, stormpy.storage._ModelBase):
         if model.is_sparse_model:
-            return SparseSimulator(model, seed)
+            if model.is_discrete_time_model:
+                return SparseSimulator(model, seed)
+            return ContinuousTimeSparseSimulator(model, seed)
     elif isinstance(model, stormpy.storage.PrismProgram):
         if options is None:
             options = stormpy.BuilderOptions()
@@ -0,0 +1,667 @@
+"""
+Statistical model checking on top of the simulators.
+Properties are estimated from sampled paths, the number of paths is determined by a stopping rule.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+import random
+
+import stormpy
+import stormpy.simulator
+
+
+def _normal_quantile(p):
+    """
+    Compute the quantile of the standard normal distribution via bisection.
+
+    :param p: Probability in (0, 1).
+    :return: Value z such that P(X <= z) = p for a standard normal variable X.
+    """
+    low, high = -40.0, 40.0
+    for _ in range(200):
+        mid = (low + high) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+def _wilson_interval(successes, trials, confidence):
+    """
+    Compute the Wilson score interval for a binomial proportion.
+
+    :param successes: Number of successes.
+    :param trials: Number of trials.
+    :param confidence: Confidence level, e.g., 0.95.
+    :return: Tuple (lower, upper).
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = _normal_quantile(1 - (1 - confidence) / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    deviation = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - deviation), min(1.0, center + deviation)
+
+
+def _beta_continued_fraction(x, a, b):
+    """
+    Evaluate the continued fraction of the incomplete beta function with the modified Lentz method.
+    """
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    # The number of required iterations grows with the square root of the parameters
+    for m in range(1, 1000 + 10 * int(math.sqrt(max(a, b)))):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            delta = c * d
+            result *= delta
+        if abs(delta - 1.0) < 1e-14:
+            break
+    return result
+
+
+def _beta_cdf(x, a, b):
+    """
+    Compute the cumulative distribution function of the beta distribution (regularized incomplete beta function).
+
+    :param x: Value in [0, 1].
+    :param a: First shape parameter.
+    :param b: Second shape parameter.
+    :return: P(X <= x) for X ~ Beta(a, b).
+    """
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_front) * _beta_continued_fraction(x, a, b) / a
+    return 1.0 - math.exp(log_front) * _beta_continued_fraction(1 - x, b, a) / b
+
+
+class SmcResult:
+    """
+    Result of statistical model checking.
+    """
+
+    def __init__(self, estimate, samples, interval=None, holds=None, converged=True):
+        """
+        :param estimate: Estimated value.
+        :param samples: Number of sampled paths.
+        :param interval: Interval which contains the true value with the requested confidence (if available).
+        :param holds: Whether the bound of the property holds (only for hypothesis tests).
+        :param converged: False if sampling was aborted before the stopping rule was satisfied.
+        """
+        self.estimate = estimate
+        self.samples = samples
+        self.interval = interval
+        self.holds = holds
+        self.converged = converged
+
+    def __str__(self):
+        result = f"{self.estimate} ({self.samples} samples"
+        if self.interval is not None:
+            result += f", interval [{self.interval[0]}, {self.interval[1]}]"
+        if self.holds is not None:
+            result += f", bound {'holds' if self.holds else 'does not hold'}"
+        if not self.converged:
+            result += ", not converged"
+        return result + ")"
+
+
+class StoppingRule:
+    """
+    Abstract base class for stopping rules.
+    A stopping rule receives the sampled values and decides when enough samples were taken.
+    """
+    # Whether the rule only supports samples with values 0 or 1
+    bernoulli_only = False
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the rule to the state without samples.
+        """
+        self._samples = 0
+        self._sum = 0.0
+
+    def prepare(self, formula):
+        """
+        Prepare the rule for the given formula.
+
+        :param formula: Formula which is checked.
+        """
+        pass
+
+    def update(self, values):
+        """
+        Process new samples.
+
+        :param values: NumPy array of sampled values.
+        """
+        self._samples += len(values)
+        self._sum += float(values.sum())
+
+    def required_samples(self):
+        """
+        Number of samples which are still required, if known in advance.
+
+        :return: Number of samples or None if the number is not known in advance.
+        """
+        return None
+
+    def is_done(self):
+        """
+        Whether sufficiently many samples were taken.
+
+        :return: True iff sampling can stop.
+        """
+        raise NotImplementedError("Abstract superclass")
+
+    def result(self):
+        """
+        Result for the samples processed so far.
+
+        :return: SmcResult.
+        """
+        raise NotImplementedError("Abstract superclass")
+
+    def _mean(self):
+        return self._sum / self._samples if self._samples > 0 else 0.0
+
+
+class ChernoffHoeffding(StoppingRule):
+    """
+    Fixed number of samples according to the Chernoff-Hoeffding bound.
+    The estimate is within epsilon of the true value with probability at least 1 - delta.
+    """
+
+    def __init__(self, epsilon=0.01, delta=0.05, value_range=1.0):
+        """
+        :param epsilon: Absolute error.
+        :param delta: Probability that the error is exceeded.
+        :param value_range: Width of the interval containing all sampled values (1 for probabilities).
+        """
+        if epsilon <= 0 or not 0 < delta < 1:
+            raise ValueError("Chernoff-Hoeffding requires epsilon > 0 and 0 < delta < 1")
+        self._epsilon = epsilon
+        self._delta = delta
+        self._nr_samples = math.ceil(value_range * value_range * math.log(2 / delta) / (2 * epsilon * epsilon))
+        super().__init__()
+
+    def required_samples(self):
+        return max(0, self._nr_samples - self._samples)
+
+    def is_done(self):
+        return self._samples >= self._nr_samples
+
+    def result(self):
+        mean = self._mean()
+        return SmcResult(mean, self._samples, (mean - self._epsilon, mean + self._epsilon), converged=self.is_done())
+
+
+class SequentialProbabilityRatioTest(StoppingRule):
+    """
+    Wald's sequential probability ratio test for the bound of a probability operator.
+    Tests the hypothesis p >= threshold + indifference against p <= threshold - indifference.
+    """
+    bernoulli_only = True
+
+    def __init__(self, threshold=None, indifference=0.01, alpha=0.05, beta=0.05):
+        """
+        :param threshold: Threshold of the test. If None, the threshold of the formula is used.
+        :param indifference: Half width of the indifference region around the threshold.
+        :param alpha: Probability of wrongly rejecting p >= threshold + indifference.
+        :param beta: Probability of wrongly accepting p >= threshold + indifference.
+        """
+        self._threshold = threshold
+        self._indifference = indifference
+        self._alpha = alpha
+        self._beta = beta
+        self._lower_bound = math.log(beta / (1 - alpha))
+        self._upper_bound = math.log((1 - beta) / alpha)
+        super().__init__()
+
+    def _initialize_hypotheses(self, threshold):
+        p0 = min(threshold + self._indifference, 1 - 1e-12)
+        p1 = max(threshold - self._indifference, 1e-12)
+        self._success_increment = math.log(p1 / p0)
+        self._failure_increment = math.log((1 - p1) / (1 - p0))
+
+    def reset(self):
+        super().reset()
+        self._log_ratio = 0.0
+        # The comparison and threshold taken from the formula only apply to the formula given to prepare()
+        self._upper_comparison = True
+        self._formula_threshold = None
+        if self._threshold is not None:
+            self._initialize_hypotheses(self._threshold)
+
+    def prepare(self, formula):
+        self._upper_comparison = True
+        self._formula_threshold = None
+        if formula.has_bound:
+            self._upper_comparison = formula.comparison_type in [stormpy.logic.ComparisonType.GEQ, stormpy.logic.ComparisonType.GREATER]
+            self._formula_threshold = float(formula.threshold)
+        threshold = self._threshold if self._threshold is not None else self._formula_threshold
+        if threshold is None:
+            raise ValueError("SPRT requires a threshold, either given explicitly or as bound of the formula")
+        self._initialize_hypotheses(threshold)
+
+    def update(self, values):
+        import numpy as np
+        # Only consume samples until the first crossing of a bound
+        steps = np.where(values > 0.5, self._success_increment, self._failure_increment)
+        log_ratios = self._log_ratio + np.cumsum(steps)
+        crossed = np.nonzero((log_ratios <= self._lower_bound) | (log_ratios >= self._upper_bound))[0]
+        consumed = crossed[0] + 1 if len(crossed) > 0 else len(values)
+        super().update(values[:consumed])
+        self._log_ratio = float(log_ratios[consumed - 1]) if consumed > 0 else self._log_ratio
+
+    def is_done(self):
+        return self._log_ratio <= self._lower_bound or self._log_ratio >= self._upper_bound
+
+    def result(self):
+        # Accepting the hypothesis p >= threshold + indifference
+        above = self._log_ratio <= self._lower_bound
+        holds = above if self._upper_comparison else not above
+        return SmcResult(self._mean(), self._samples, holds=holds if self.is_done() else None, converged=self.is_done())
+
+
+class BayesianInterval(StoppingRule):
+    """
+    Bayesian interval estimation with a beta prior.
+    Stops as soon as the posterior probability of the interval [estimate - half_width, estimate + half_width] reaches the confidence.
+    """
+    bernoulli_only = True
+
+    def __init__(self, half_width=0.01, confidence=0.95, prior=(1.0, 1.0)):
+        """
+        :param half_width: Half width of the interval.
+        :param confidence: Required posterior probability of the interval.
+        :param prior: Parameters (alpha, beta) of the beta prior. The default is the uniform prior.
+        """
+        self._half_width = half_width
+        self._confidence = confidence
+        self._prior = prior
+        super().__init__()
+
+    def _posterior_interval(self):
+        a = self._prior[0] + self._sum
+        b = self._prior[1] + self._samples - self._sum
+        mean = a / (a + b)
+        lower, upper = mean - self._half_width, mean + self._half_width
+        if lower < 0:
+            lower, upper = 0.0, min(1.0, 2 * self._half_width)
+        elif upper > 1:
+            lower, upper = max(0.0, 1 - 2 * self._half_width), 1.0
+        return mean, lower, upper, _beta_cdf(upper, a, b) - _beta_cdf(lower, a, b)
+
+    def is_done(self):
+        return self._posterior_interval()[3] >= self._confidence
+
+    def result(self):
+        mean, lower, upper, mass = self._posterior_interval()
+        return SmcResult(mean, self._samples, (lower, upper), converged=mass >= self._confidence)
+
+
+class _Objective:
+    """
+    Path objective extracted from a formula.
+    """
+
+    def __init__(self, formula):
+        self.reward_name = None
+        self.is_reward = False
+        self.steps = None
+        self.time_bound = None
+        if formula.is_probability_operator:
+            path = formula.subformula
+            if isinstance(path, stormpy.logic.BoundedUntilFormula):
+                if path.is_multidimensional or path.has_lower_bound or path.is_reward_bounded:
+                    raise NotImplementedError(f"Statistical model checking only supports upper step or time bounds, not {path}")
+                self.left = path.left_subformula
+                self.right = path.right_subformula
+                bound = path.upper_bound_expression
+                # The bound is interpreted as time bound on continuous-time models
+                self.time_bound = bound.evaluate_as_double()
+                if bound.has_integer_type():
+                    self.steps = bound.evaluate_as_int()
+                    if path.is_upper_bound_strict:
+                        self.steps -= 1
+                return
+            if isinstance(path, stormpy.logic.UntilFormula):
+                self.left = path.left_subformula
+                self.right = path.right_subformula
+                return
+            if isinstance(path, stormpy.logic.EventuallyFormula):
+                self.left = None
+                self.right = path.subformula
+                return
+        elif formula.is_reward_operator and isinstance(formula.subformula, stormpy.logic.EventuallyFormula):
+            self.is_reward = True
+            self.reward_name = formula.reward_name if formula.has_reward_name() else None
+            self.left = None
+            self.right = formula.subformula.subformula
+            return
+        raise NotImplementedError(f"Statistical model checking does not support formula {formula}")
+
+
+def _target_and_avoid_states(model, objective):
+    """
+    Compute the target states and the states in which paths stop without reaching the target.
+
+    :return: Tuple of BitVectors (target, avoid), avoid is None if all states may be visited.
+    """
+    target = stormpy.model_checking(model, objective.right).get_truth_values()
+    left = objective.left
+    if left is None or (isinstance(left, stormpy.logic.BooleanLiteralFormula) and str(left) == "true"):
+        return target, None
+    return target, ~(stormpy.model_checking(model, left).get_truth_values() | target)
+
+
+class _SparseSampler:
+    """
+    Samples paths of a sparse model with the native batch simulation.
+    Continuous-time models are sampled with the continuous-time simulator.
+    """
+    parallel = True
+
+    def __init__(self, model, objective, scheduler, max_path_length):
+        self._continuous_time = not model.is_discrete_time_model
+        if self._continuous_time:
+            self._simulator = stormpy.simulator.ContinuousTimeSparseSimulator(model)
+            self._max_steps = max_path_length
+        else:
+            if objective.time_bound is not None and objective.steps is None:
+                raise ValueError("Step bounds of discrete-time models must be integers")
+            self._simulator = stormpy.simulator.SparseSimulator(model)
+            self._max_steps = objective.steps if objective.steps is not None else max_path_length
+        self._objective = objective
+        self._scheduler = scheduler
+        self._target, self._avoid = _target_and_avoid_states(model, objective)
+        if objective.is_reward:
+            names = self._simulator.get_reward_names()
+            if objective.reward_name is None:
+                if len(names) != 1:
+                    raise ValueError("Reward model must be specified if the model does not have a unique reward model")
+                self._reward_index = 0
+            else:
+                self._reward_index = names.index(objective.reward_name)
+
+    def sample(self, nr_samples, seed):
+        import numpy as np
+        if self._continuous_time:
+            time_bound = self._objective.time_bound if self._objective.time_bound is not None else float("inf")
+            _, _, rewards, hits = self._simulator.simulate_batch(nr_samples, time_bound, self._max_steps, scheduler=self._scheduler,
+                                                                 target=self._target, avoid=self._avoid, seed=seed)
+        else:
+            _, rewards, hits = self._simulator.simulate_batch(nr_samples, self._max_steps, scheduler=self._scheduler, target=self._target,
+                                                              record_paths=False, avoid=self._avoid, seed=seed)
+        if self._objective.is_reward:
+            # Rewards of paths not reaching the target are infinite
+            return np.where(hits, rewards[:, self._reward_index], np.inf)
+        return hits.astype(float)
+
+
+class _PrismSampler:
+    """
+    Samples paths of a PRISM program with the on-the-fly simulator.
+    State formulas must be labels of the program.
+    Paths are sampled one step at a time in Python on a single thread, which is considerably slower than the native batch simulation
+    of _SparseSampler. If the model can be built, building it and sampling the sparse model is preferable.
+    """
+    parallel = False
+
+    def __init__(self, program, objective, max_path_length, options):
+        if program.model_type in [stormpy.storage.PrismModelType.CTMC, stormpy.storage.PrismModelType.MA]:
+            raise NotImplementedError("Statistical model checking of continuous-time PRISM programs requires building the model")
+        if objective.is_reward:
+            raise NotImplementedError("Statistical model checking of PRISM programs only supports probabilities")
+        for formula in [objective.left, objective.right]:
+            if formula is not None and not isinstance(formula, (stormpy.logic.AtomicLabelFormula, stormpy.logic.BooleanLiteralFormula)):
+                raise NotImplementedError(f"Statistical model checking of PRISM programs only supports labels, not {formula}")
+        self._simulator = stormpy.simulator.create_simulator(program, options=options)
+        self._objective = objective
+        self._max_steps = objective.steps if objective.steps is not None else max_path_length
+
+    @staticmethod
+    def _holds(formula, labels):
+        if isinstance(formula, stormpy.logic.BooleanLiteralFormula):
+            return str(formula) == "true"
+        return formula.label in labels
+
+    def _sample_path(self):
+        _, _, labels = self._simulator.restart()
+        for step in range(self._max_steps + 1):
+            if self._holds(self._objective.right, labels):
+                return 1.0
+            if step == self._max_steps or self._simulator.is_done():
+                return 0.0
+            if self._objective.left is not None and not self._holds(self._objective.left, labels):
+                return 0.0
+            _, _, labels = self._simulator.random_step()
+        return 0.0
+
+    def sample(self, nr_samples, seed):
+        import numpy as np
+        self._simulator.set_seed(seed)
+        return np.array([self._sample_path() for _ in range(nr_samples)])
+
+
+def estimate(model, property, stopping_rule=None, scheduler=None, max_path_length=10000, batch_size=10000, threads=0, max_samples=None,
+             seed=None, options=None):
+    """
+    Estimate a property by statistical model checking.
+    Supported are (step-bounded) reachability and until probabilities as well as expected reachability rewards.
+    On continuous-time sparse models (CTMCs and MAs), bounds are time bounds.
+    Nondeterminism is resolved by the scheduler or uniformly at random.
+
+    Sparse models are sampled natively in batches, which run in parallel on multiple threads.
+    PRISM programs are sampled path by path in Python with the on-the-fly simulator on a single thread and only support labels as state formulas.
+    As this is considerably slower, building the model first is preferable whenever possible.
+
+    :param model: Sparse model or PRISM program.
+    :param property: Property or formula.
+    :param stopping_rule: Stopping rule, by default Chernoff-Hoeffding with epsilon 0.01 and delta 0.05.
+    :param scheduler: Memoryless deterministic scheduler for nondeterministic sparse models (optional).
+    :param max_path_length: Maximal length of paths for unbounded properties. Longer paths are counted as not reaching the target.
+    :param batch_size: Number of paths simulated per batch.
+    :param threads: Number of threads. If 0, the number of CPUs is used.
+    :param max_samples: Maximal number of samples. If reached, the result is not converged.
+    :param seed: Seed for reproducibility (given the same number of threads and batch size).
+    :param options: BuilderOptions for the simulator of PRISM programs.
+    :return: SmcResult.
+    """
+    formula = property.raw_formula if isinstance(property, stormpy.Property) else property
+    objective = _Objective(formula)
+    if stopping_rule is None:
+        if objective.is_reward:
+            raise ValueError("Expected rewards require a stopping rule, e.g., ChernoffHoeffding with the range of the rewards")
+        stopping_rule = ChernoffHoeffding()
+    if stopping_rule.bernoulli_only and objective.is_reward:
+        raise ValueError(f"Stopping rule {type(stopping_rule).__name__} only supports probabilities")
+
+    if isinstance(model, stormpy.storage.PrismProgram):
+        sampler = _PrismSampler(model, objective, max_path_length, options if options is not None else stormpy.BuilderOptions())
+    elif isinstance(model, stormpy.storage._ModelBase) and model.is_sparse_model:
+        sampler = _SparseSampler(model, objective, scheduler, max_path_length)
+    else:
+        raise NotImplementedError("Statistical model checking is only supported for sparse models and PRISM programs")
+
+    stopping_rule.reset()
+    stopping_rule.prepare(formula)
+    rng = random.Random(seed)
+    if threads == 0:
+        threads = os.cpu_count() or 1
+    if not sampler.parallel:
+        threads = 1
+
+    submitted = 0
+    outstanding = 0
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        while True:
+            # Keep all threads busy with batches
+            while len(pending) < threads:
+                size = batch_size
+                remaining = stopping_rule.required_samples()
+                if remaining is not None:
+                    size = min(size, remaining - outstanding)
+                if max_samples is not None:
+                    size = min(size, max_samples - submitted)
+                if size <= 0:
+                    break
+                pending.append((size, executor.submit(sampler.sample, size, rng.getrandbits(64))))
+                submitted += size
+                outstanding += size
+            if not pending:
+                break
+            # Process batches in submission order for reproducibility
+            size, future = pending.popleft()
+            outstanding -= size
+            stopping_rule.update(future.result())
+            if stopping_rule.is_done():
+                break
+        for _, future in pending:
+            future.cancel()
+    return stopping_rule.result()
+
+
+class Restart:
+    """
+    RESTART importance splitting.
+    Each path is split into a number of copies when it crosses a threshold upwards.
+    Copies created at a threshold are discarded when they fall below it again.
+    """
+    supports_step_bounds = True
+
+    def __init__(self, splits=2, paths=1000, batch_size=100):
+        """
+        :param splits: Splitting factor for all thresholds, or a list with one splitting factor per threshold.
+        :param paths: Number of main paths.
+        :param batch_size: Number of main paths simulated per batch.
+        """
+        self._splits = splits
+        self._paths = paths
+        self._batch_size = batch_size
+
+    def _tasks(self, thresholds, target, avoid, scheduler, max_steps):
+        splits = self._splits if isinstance(self._splits, (list, tuple)) else [self._splits] * len(thresholds)
+        for start in range(0, self._paths, self._batch_size):
+            size = min(self._batch_size, self._paths - start)
+            yield lambda model, importance, seed, size=size: stormpy.core._simulate_restart(model, importance, thresholds, splits, target, avoid, scheduler,
+                                                                                              size, max_steps, seed)
+
+
+class FixedEffort:
+    """
+    Fixed effort importance splitting.
+    In each level, a fixed number of paths is started from the states in which paths entered the level.
+    The estimate is the product of the fractions of paths reaching the next level.
+    """
+    # Paths restart in each level, so step bounds cannot be tracked
+    supports_step_bounds = False
+
+    def __init__(self, effort=1000, runs=10):
+        """
+        :param effort: Number of paths per level.
+        :param runs: Number of independent runs. The runs are used to compute the confidence interval.
+        """
+        self._effort = effort
+        self._runs = runs
+
+    def _tasks(self, thresholds, target, avoid, scheduler, max_steps):
+        for _ in range(self._runs):
+            yield lambda model, importance, seed: [stormpy.core._simulate_fixed_effort(model, importance, thresholds, target, avoid, scheduler, self._effort,
+                                                                                        max_steps, seed)[0]]
+
+
+def _importance_vector(model, importance, program):
+    """
+    Get the importance of all states.
+
+    :param importance: Array-like with one value per state, Expression or string.
+    :param program: PRISM program whose variables may occur in a string.
+    :return: NumPy array of importance values.
+    """
+    import numpy as np
+    if isinstance(importance, str):
+        if program is None:
+            raise ValueError("Importance given as string requires the PRISM program")
+        parser = stormpy.ExpressionParser(program.expression_manager)
+        parser.set_identifier_mapping({variable.name: variable.get_expression() for variable in program.variables})
+        importance = parser.parse(importance)
+    if isinstance(importance, stormpy.Expression):
+        return stormpy.core._evaluate_importance(model, importance)
+    importance = np.asarray(importance, dtype=float)
+    if importance.shape != (model.nr_states,):
+        raise ValueError(f"Importance must contain one value per state, got shape {importance.shape}")
+    return importance
+
+
+def estimate_rare_event(model, property, importance, thresholds, method=None, scheduler=None, max_path_length=10000, program=None, confidence=0.95,
+                        threads=0, seed=None):
+    """
+    Estimate a small reachability probability by importance splitting.
+    Paths are split when they reach states of higher importance, such that targets which are rarely reached by plain simulation are reached often.
+    Supported are (step-bounded) reachability and until probabilities on discrete-time sparse models.
+
+    :param model: Sparse discrete-time model.
+    :param property: Property or formula.
+    :param importance: Importance of the states, given as array with one value per state or as expression over the state variables.
+        Expressions require a model with state valuations. Strings are parsed with the variables of the given program.
+    :param thresholds: Strictly increasing importance values which define the levels.
+    :param method: Restart (default) or FixedEffort.
+    :param scheduler: Memoryless deterministic scheduler for nondeterministic models (optional).
+    :param max_path_length: Maximal length of paths for unbounded properties. Longer paths are counted as not reaching the target.
+    :param program: PRISM program to parse importance expressions given as strings (optional).
+    :param confidence: Confidence level of the interval.
+    :param threads: Number of threads. If 0, the number of CPUs is used.
+    :param seed: Seed for reproducibility.
+    :return: SmcResult, the interval is based on the normal approximation over main paths (Restart) or runs (FixedEffort).
+    """
+    import numpy as np
+    if not isinstance(model, stormpy.storage._ModelBase) or not model.is_sparse_model or not model.is_discrete_time_model or model.is_exact:
+        raise NotImplementedError("Importance splitting is only supported for sparse discrete-time models with double values")
+    formula = property.raw_formula if isinstance(property, stormpy.Property) else property
+    objective = _Objective(formula)
+    if objective.is_reward:
+        raise NotImplementedError("Importance splitting only supports probabilities")
+    if method is None:
+        method = Restart()
+    max_steps = max_path_length
+    if objective.steps is not None:
+        if not method.supports_step_bounds:
+            raise NotImplementedError(f"{type(method).__name__} does not support step bounds")
+        max_steps = objective.steps
+    importance = _importance_vector(model, importance, program)
+    target, avoid = _target_and_avoid_states(model, objective)
+
+    rng = random.Random(seed)
+    if threads == 0:
+        threads = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(task, model, importance, rng.getrandbits(64)) for task in method._tasks(list(thresholds), target, avoid, scheduler, max_steps)]
+        samples = np.concatenate([np.asarray(future.result(), dtype=float) for future in futures])
+
+    mean = float(samples.mean())
+    interval = None
+    if len(samples) > 1:
+        half_width = _normal_quantile(1 - (1 - confidence) / 2) * float(samples.std(ddof=1)) / math.sqrt(len(samples))
+        interval = (max(0.0, mean - half_width), min(1.0, mean + half_width))
+    return SmcResult(mean, len(samples), interval)
@@ -1,3 +1,8 @@
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 import stormpy.utility
 from . import storage
 from .storage import *
@@ -46,17 +51,88 @@ def _build_sparse_matrix(builder_class, array, row_group_indices=[]):
     else:
         builder = builder_class(rows=num_row, columns=num_col)
 
-    row_group_index = 0
-    for r in range(num_row):
-        # check whether to start a custom row group
-        if row_group_index < len_group_indices and r == row_group_indices[row_group_index]:
-            builder.new_row_group(r)
-            row_group_index += 1
-        # insert values of the current row
-        for c in range(num_col):
-            if array[r, c] != 0:
-                builder.add_next_value(r, c, array[r, c])
+    # nonzero() returns the entries ordered row by row and column by column
+    rows, columns = (array != 0).nonzero()
+    values = array[rows, columns]
+    if builder_class is not storage.SparseMatrixBuilder:
+        values = list(values)
+    builder.add_entries(rows, columns, values, row_group_indices=row_group_indices)
+    return builder.build()
+
+
+def build_sparse_matrix_from_coo(rows, columns, values, nr_rows=None, nr_columns=None, row_group_indices=[]):
+    """
+    Build a sparse matrix from arrays in coordinate (COO) format.
+    Entry i is set at row rows[i] and column columns[i] to value values[i]. The entries can be given in any order.
+    Each pair of row and column may only occur once, duplicate entries raise an error.
+
+    :param numpy array rows: The rows of the entries.
+    :param numpy array columns: The columns of the entries.
+    :param numpy array values: The values of the entries.
+    :param int nr_rows: Number of rows. If None, the largest row of an entry determines the number of rows.
+    :param int nr_columns: Number of columns. If None, the largest column of an entry determines the number of columns.
+    :param List[int] row_group_indices: List containing the starting row of each row group in ascending order.
+    :return: Sparse matrix.
+    """
+    return _build_sparse_matrix_from_coo(storage.SparseMatrixBuilder, rows, columns, values, nr_rows=nr_rows, nr_columns=nr_columns,
+                                         row_group_indices=row_group_indices)
+
+
+def build_parametric_sparse_matrix_from_coo(rows, columns, values, nr_rows=None, nr_columns=None, row_group_indices=[]):
+    """
+    Build a parametric sparse matrix from arrays in coordinate (COO) format.
+    Entry i is set at row rows[i] and column columns[i] to value values[i]. The entries can be given in any order.
+    Each pair of row and column may only occur once, duplicate entries raise an error.
+
+    :param numpy array rows: The rows of the entries.
+    :param numpy array columns: The columns of the entries.
+    :param List[FactorizedRationalFunction] values: The values of the entries.
+    :param int nr_rows: Number of rows. If None, the largest row of an entry determines the number of rows.
+    :param int nr_columns: Number of columns. If None, the largest column of an entry determines the number of columns.
+    :param List[int] row_group_indices: List containing the starting row of each row group in ascending order.
+    :return: Parametric sparse matrix.
+    """
+    return _build_sparse_matrix_from_coo(storage.ParametricSparseMatrixBuilder, rows, columns, values, nr_rows=nr_rows, nr_columns=nr_columns,
+                                         row_group_indices=row_group_indices)
+
+
+def _build_sparse_matrix_from_coo(builder_class, rows, columns, values, nr_rows=None, nr_columns=None, row_group_indices=[]):
+    """
+    General method to build a sparse matrix from arrays in coordinate (COO) format.
+    The entries are sorted with NumPy and then added with a single call to the builder.
+
+    :param class builder_class: The class type used to create the matrix builder.
+    :param numpy array rows: The rows of the entries.
+    :param numpy array columns: The columns of the entries.
+    :param values: The values of the entries. For other builders than SparseMatrixBuilder, the values can be any sequence.
+    :param int nr_rows: Number of rows. If None, the largest row of an entry determines the number of rows.
+    :param int nr_columns: Number of columns. If None, the largest column of an entry determines the number of columns.
+    :param List[int] row_group_indices: List containing the starting row of each row group in ascending order.
+    :return: Sparse matrix.
+    """
+    import numpy as np
+
+    rows = np.asarray(rows, dtype=np.uint64)
+    columns = np.asarray(columns, dtype=np.uint64)
+    order = np.lexsort((columns, rows))
+    rows = rows[order]
+    columns = columns[order]
+    if builder_class is storage.SparseMatrixBuilder:
+        values = np.asarray(values, dtype=np.float64)[order]
+    else:
+        values = [values[i] for i in order]
+
+    if nr_rows is None:
+        nr_rows = int(rows[-1]) + 1 if len(rows) > 0 else 0
+    if nr_columns is None:
+        nr_columns = int(columns.max()) + 1 if len(columns) > 0 else 0
 
+    len_group_indices = len(row_group_indices)
+    if len_group_indices > 0:
+        builder = builder_class(rows=nr_rows, columns=nr_columns, entries=len(rows), has_custom_row_grouping=True, row_groups=len_group_indices)
+    else:
+        builder = builder_class(rows=nr_rows, columns=nr_columns, entries=len(rows))
+    builder.add_entries(rows, columns, values, row_group_indices=row_group_indices)
     return builder.build()
 
 
@@ -74,3 +150,126 @@ def get_maximal_end_components(model):
         return stormpy.MaximalEndComponentDecomposition_interval(model)
     else:
         return stormpy.MaximalEndComponentDecomposition_double(model)
+
+
+class SharedSparseModel:
+    """
+    Sparse model (with double values) in shared memory.
+    The model is encoded once into a shared memory segment. Pickling the handle only transfers the name of the segment,
+    so worker processes can attach to the single read-only copy instead of receiving the full model.
+    Workers can either rebuild the model from the segment with :meth:`attach` or directly use the CSR arrays of the
+    transition matrix without copying via :meth:`arrays`.
+    """
+
+    _HEADER = "=8s6Q"
+
+    def __init__(self, name, size, owner=False):
+        """
+        Use :meth:`create` to create a shared model.
+
+        :param str name: Name of the shared memory segment.
+        :param int size: Size of the encoded model in bytes.
+        :param bool owner: Whether this handle created the segment.
+        """
+        from multiprocessing import resource_tracker, shared_memory
+
+        self._shm = shared_memory.SharedMemory(name=name)
+        if not owner:
+            # Only the creating process is responsible for removing the segment
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._size = size
+        self._owner = owner
+
+    @classmethod
+    def create(cls, model):
+        """
+        Encode a model into a new shared memory segment.
+
+        :param model: Sparse model with double values.
+        :return: Handle to the shared model.
+        """
+        from multiprocessing import shared_memory
+
+        data = storage._serialize_sparse_model(model)
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        handle = cls.__new__(cls)
+        handle._shm = shm
+        handle._size = len(data)
+        handle._owner = True
+        return handle
+
+    def __reduce__(self):
+        return SharedSparseModel, (self.name, self._size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def size(self):
+        return self._size
+
+    def attach(self):
+        """
+        Build the model from the shared segment.
+
+        :return: Sparse model.
+        """
+        return storage._deserialize_sparse_model(self._shm.buf[: self._size])
+
+    def arrays(self):
+        """
+        Get read-only NumPy views on the CSR arrays of the transition matrix in the shared segment.
+        The entries of row r are at positions row_starts[r] to row_starts[r+1] and the rows of state s are
+        row_group_indices[s] to row_group_indices[s+1].
+
+        :return: Dictionary with arrays 'row_group_indices', 'row_starts', 'columns' and 'values'.
+        """
+        import struct
+        import numpy as np
+
+        _, _, _, nr_states, nr_rows, _, nr_entries = struct.unpack_from(self._HEADER, self._shm.buf, 0)
+        offset = struct.calcsize(self._HEADER)
+        result = dict()
+        for key, dtype, count in [
+            ("row_group_indices", np.uint64, nr_states + 1),
+            ("row_starts", np.uint64, nr_rows + 1),
+            ("columns", np.uint64, nr_entries),
+            ("values", np.float64, nr_entries),
+        ]:
+            array = np.frombuffer(self._shm.buf, dtype=dtype, count=count, offset=offset)
+            array.flags.writeable = False
+            result[key] = array
+            offset += count * 8
+        return result
+
+    def close(self):
+        """
+        Close the access to the segment in this process. Arrays obtained by :meth:`arrays` must be released before.
+        """
+        self._shm.close()
+
+    def unlink(self):
+        """
+        Remove the segment. Should only be called once, by the creating process.
+        """
+        self._shm.unlink()
+
+
+def share_sparse_model(model):
+    """
+    Put a sparse model into shared memory such that multiple processes can access it without copying it.
+
+    :param model: Sparse model with double values.
+    :return: Handle to the shared model, see :class:`SharedSparseModel`.
+    """
+    return SharedSparseModel.create(model)
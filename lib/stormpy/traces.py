@@ -0,0 +1,304 @@
+"""
+Compact binary storage of simulation traces.
+
+Traces are stored column-wise in chunks of steps. Each column has a fixed data type and a fixed shape per step.
+Uncompressed chunks are 8-byte aligned, such that the reader can return read-only NumPy views on a memory map of the file.
+Compressed chunks (zlib) are decompressed on access.
+
+File layout: header (magic and version), chunks, trace start offsets, JSON index, offset of the index and magic.
+"""
+import json
+import mmap
+import struct
+import zlib
+
+_MAGIC = b"STRMTRCE"
+_VERSION = 1
+_HEADER = struct.Struct("<8sI4x")
+_TRAILER = struct.Struct("<Q8s")
+
+
+def _align(offset):
+    return (offset + 7) // 8 * 8
+
+
+class TraceWriter:
+    """
+    Writer for traces in the binary trace format.
+    Steps are buffered and written chunk-wise.
+    """
+
+    def __init__(self, path, columns, chunk_size=65536, compression=None, metadata=None):
+        """
+        :param path: Path of the file.
+        :param columns: Dictionary from column name to a tuple (dtype, shape) describing the data of a single step.
+        :param chunk_size: Number of steps per chunk.
+        :param compression: None or "zlib".
+        :param metadata: JSON-serializable dictionary stored in the file (optional).
+        """
+        import numpy as np
+        if compression not in [None, "zlib"]:
+            raise ValueError(f"Unknown compression {compression}")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        self._columns = {name: (np.dtype(dtype), tuple(shape)) for name, (dtype, shape) in columns.items()}
+        self._chunk_size = chunk_size
+        self._compression = compression
+        self._metadata = metadata if metadata is not None else dict()
+        self._buffers = {name: np.zeros((chunk_size,) + shape, dtype=dtype) for name, (dtype, shape) in self._columns.items()}
+        self._buffered = 0
+        self._steps = 0
+        self._trace_starts = []
+        self._chunks = []
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._file is None
+
+    @property
+    def nr_traces(self):
+        return len(self._trace_starts)
+
+    @property
+    def nr_steps(self):
+        return self._steps
+
+    def start_trace(self):
+        """
+        Start a new trace. Subsequent steps belong to this trace.
+        """
+        self._trace_starts.append(self._steps)
+
+    def append(self, **values):
+        """
+        Append a step to the current trace.
+
+        :param values: Value for each column.
+        """
+        if not self._trace_starts:
+            raise RuntimeError("No trace was started")
+        for name, buffer in self._buffers.items():
+            buffer[self._buffered] = values[name]
+        self._buffered += 1
+        self._steps += 1
+        if self._buffered == self._chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffered == 0:
+            return
+        chunk = {"steps": self._buffered, "columns": dict()}
+        for name, buffer in self._buffers.items():
+            data = buffer[:self._buffered].tobytes()
+            size = len(data)
+            if self._compression == "zlib":
+                data = zlib.compress(data)
+            offset = self._write_aligned(data)
+            chunk["columns"][name] = [offset, len(data), size]
+        self._chunks.append(chunk)
+        self._buffered = 0
+
+    def _write_aligned(self, data):
+        offset = self._file.tell()
+        aligned = _align(offset)
+        self._file.write(b"\0" * (aligned - offset))
+        self._file.write(data)
+        return aligned
+
+    def close(self):
+        """
+        Write the remaining steps and the index, and close the file.
+        """
+        if self._file is None:
+            return
+        import numpy as np
+        self._flush()
+        starts = np.array(self._trace_starts, dtype=np.int64).tobytes()
+        starts_offset = self._write_aligned(starts)
+        index = {
+            "version": _VERSION,
+            "columns": {name: [dtype.str, list(shape)] for name, (dtype, shape) in self._columns.items()},
+            "compression": self._compression,
+            "steps": self._steps,
+            "traces": [starts_offset, len(self._trace_starts)],
+            "chunks": self._chunks,
+            "metadata": self._metadata,
+        }
+        index_offset = self._write_aligned(json.dumps(index).encode("utf-8"))
+        self._file.write(_TRAILER.pack(index_offset, _MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class TraceReader:
+    """
+    Reader for files in the binary trace format.
+    Data is returned as read-only NumPy arrays, which are views on the memory-mapped file if the file is not compressed.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Path of the file.
+        """
+        import numpy as np
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _HEADER.unpack_from(self._mmap, 0)
+        index_offset, end_magic = _TRAILER.unpack_from(self._mmap, len(self._mmap) - _TRAILER.size)
+        if magic != _MAGIC or end_magic != _MAGIC:
+            raise ValueError(f"{path} is not a complete trace file")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported trace file version {version}")
+        index = json.loads(bytes(self._mmap[index_offset:len(self._mmap) - _TRAILER.size]).decode("utf-8"))
+        self._columns = {name: (np.dtype(dtype), tuple(shape)) for name, (dtype, shape) in index["columns"].items()}
+        self._compression = index["compression"]
+        self._nr_steps = index["steps"]
+        self._chunks = index["chunks"]
+        self._metadata = index["metadata"]
+        starts_offset, nr_traces = index["traces"]
+        self._trace_starts = np.frombuffer(self._mmap, dtype=np.int64, count=nr_traces, offset=starts_offset)
+        self._chunk_starts = np.cumsum([0] + [chunk["steps"] for chunk in self._chunks])
+        self._cached_chunk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Close the memory map. Views returned earlier keep the memory map open until they are released.
+        """
+        self._trace_starts = None
+        self._cached_chunk = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    @property
+    def columns(self):
+        """
+        Dictionary from column name to (dtype, shape) of a single step.
+        """
+        return dict(self._columns)
+
+    @property
+    def metadata(self):
+        return self._metadata
+
+    @property
+    def nr_steps(self):
+        return self._nr_steps
+
+    @property
+    def nr_chunks(self):
+        return len(self._chunks)
+
+    def __len__(self):
+        return len(self._trace_starts)
+
+    def __getitem__(self, trace):
+        return self.trace(trace)
+
+    def __iter__(self):
+        for trace in range(len(self)):
+            yield self.trace(trace)
+
+    def chunk(self, index):
+        """
+        Get the steps of a chunk.
+
+        :param index: Index of the chunk.
+        :return: Dictionary from column name to NumPy array.
+        """
+        import numpy as np
+        if self._cached_chunk is not None and self._cached_chunk[0] == index:
+            return self._cached_chunk[1]
+        chunk = self._chunks[index]
+        result = dict()
+        for name, (offset, length, size) in chunk["columns"].items():
+            dtype, shape = self._columns[name]
+            if self._compression == "zlib":
+                data = np.frombuffer(zlib.decompress(self._mmap[offset:offset + length]), dtype=dtype)
+            else:
+                data = np.frombuffer(self._mmap, dtype=dtype, count=size // dtype.itemsize, offset=offset)
+            result[name] = data.reshape((chunk["steps"],) + shape)
+        self._cached_chunk = (index, result)
+        return result
+
+    def chunks(self):
+        """
+        Iterate over the chunks of the file.
+
+        :return: Iterator over dictionaries from column name to NumPy array.
+        """
+        for index in range(len(self._chunks)):
+            yield self.chunk(index)
+
+    def steps(self, start, end):
+        """
+        Get a range of steps across all traces.
+        The result is a view if the range is contained in a single uncompressed chunk and a copy otherwise.
+
+        :param start: First step.
+        :param end: Step after the last step.
+        :return: Dictionary from column name to NumPy array.
+        """
+        import numpy as np
+        if not 0 <= start <= end <= self._nr_steps:
+            raise IndexError(f"Steps [{start}, {end}) out of range")
+        first = int(np.searchsorted(self._chunk_starts, start, side="right")) - 1
+        parts = []
+        while start < end:
+            chunk_start = int(self._chunk_starts[first])
+            chunk_end = min(end, int(self._chunk_starts[first + 1]))
+            data = self.chunk(first)
+            parts.append({name: values[start - chunk_start:chunk_end - chunk_start] for name, values in data.items()})
+            start = chunk_end
+            first += 1
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return {name: np.zeros((0,) + shape, dtype=dtype) for name, (dtype, shape) in self._columns.items()}
+        return {name: np.concatenate([part[name] for part in parts]) for name in self._columns}
+
+    def trace(self, trace):
+        """
+        Get the steps of a trace.
+
+        :param trace: Index of the trace.
+        :return: Dictionary from column name to NumPy array.
+        """
+        if not 0 <= trace < len(self):
+            raise IndexError(f"Trace {trace} out of range")
+        start = int(self._trace_starts[trace])
+        end = int(self._trace_starts[trace + 1]) if trace + 1 < len(self) else self._nr_steps
+        return self.steps(start, end)
+
+    def trace_lengths(self):
+        """
+        :return: NumPy array with the number of steps of each trace.
+        """
+        import numpy as np
+        return np.diff(self._trace_starts, append=self._nr_steps)
+
+
+def decode_labels(mask, label_names):
+    """
+    Decode a label mask of a single step.
+
+    :param mask: Array of 64-bit words, bit i (in word i // 64) is set if the i-th label holds.
+    :param label_names: Names of the labels.
+    :return: Set of label names.
+    """
+    return {name for bit, name in enumerate(label_names) if (int(mask[bit // 64]) >> (bit % 64)) & 1}
@@ -1,3 +1,8 @@
+# Load and initialize Storm before the native module
+from .. import _load
+
+_load()
+
 from . import utility
 from .utility import *
 
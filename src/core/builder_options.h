@@ -0,0 +1,33 @@
+#pragma once
+
+#include "storm/builder/BuilderOptions.h"
+
+#include <cstdint>
+
+/*!
+ * Order in which states are explored when building a partial model.
+ */
+enum class ExplorationHeuristic { Bfs, Dfs, Probability };
+
+/*!
+ * Builder options extended by options which are only supported by stormpy.
+ */
+class StormpyBuilderOptions : public storm::builder::BuilderOptions {
+public:
+    using storm::builder::BuilderOptions::BuilderOptions;
+
+    StormpyBuilderOptions(storm::builder::BuilderOptions const& options) : storm::builder::BuilderOptions(options) {
+    }
+
+    bool hasExplorationBudget() const {
+        return explorationStateLimit > 0 || explorationMemoryLimit > 0 || explorationTimeLimit > 0;
+    }
+
+    // Number of threads for explicit state space exploration (0: number of hardware threads)
+    uint64_t explorationThreads = 1;
+    // Budgets for the exploration, 0 if not limited
+    uint64_t explorationStateLimit = 0;
+    uint64_t explorationMemoryLimit = 0;
+    double explorationTimeLimit = 0;
+    ExplorationHeuristic explorationHeuristic = ExplorationHeuristic::Bfs;
+};
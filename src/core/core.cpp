@@ -1,6 +1,7 @@
 #include <pybind11/functional.h>
 
 #include "core.h"
+#include "exploration.h"
 #include "storm/utility/initialize.h"
 #include "storm/utility/SignalHandler.h"
 #include "storm/io/DirectEncodingExporter.h"
@@ -12,6 +13,7 @@
 #include "storm/generator/NextStateGenerator.h"
 #include "storm-parsers/api/storm-parsers.h"
 #include "storm-counterexamples/settings/modules/CounterexampleGeneratorSettings.h"
+#include "storm/exceptions/InvalidArgumentException.h"
 
 void define_core(py::module& m) {
     // Init
@@ -77,20 +79,43 @@ void define_parse(py::module& m) {
 
 // Thin wrapper for model building using sparse representation
 template<typename ValueType>
-std::shared_ptr<storm::models::sparse::Model<ValueType>> buildSparseModel(storm::storage::SymbolicModelDescription const& modelDescription, std::vector<std::shared_ptr<storm::logic::Formula const>> const& formulas) {
+std::shared_ptr<storm::models::ModelBase> buildSparseModelWithOptions(storm::storage::SymbolicModelDescription const& modelDescription, StormpyBuilderOptions const& options, std::shared_ptr<BuildProgress> const& progress) {
+    BuildProgressScope scope(progress);
+    if constexpr (std::is_same_v<ValueType, double>) {
+        if (options.hasExplorationBudget()) {
+            return scope.done(buildPartialSparseModel<ValueType>(modelDescription, options, scope.get()));
+        }
+        if (options.explorationThreads != 1 || progress) {
+            return scope.done(buildSparseModelParallel<ValueType>(modelDescription, options, options.explorationThreads, scope.get()));
+        }
+    }
+    return scope.done(storm::api::buildSparseModel<ValueType>(modelDescription, options));
+}
+
+template<typename ValueType>
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildSparseModel(storm::storage::SymbolicModelDescription const& modelDescription, std::vector<std::shared_ptr<storm::logic::Formula const>> const& formulas, std::shared_ptr<BuildProgress> const& progress) {
+    BuildProgressScope scope(progress);
+    if constexpr (std::is_same_v<ValueType, double>) {
+        if (progress) {
+            // Explore the state space in stormpy to report the progress, the model is identical to the model built by Storm
+            storm::builder::BuilderOptions options = formulas.empty() ? storm::builder::BuilderOptions(true, true) : storm::builder::BuilderOptions(formulas, modelDescription);
+            return scope.done(buildSparseModelParallel<ValueType>(modelDescription, options, 1, scope.get()));
+        }
+    }
     if (formulas.empty()) {
         // Build all labels and rewards
         storm::builder::BuilderOptions options(true, true);
-        return storm::api::buildSparseModel<ValueType>(modelDescription, options);
+        return scope.done(storm::api::buildSparseModel<ValueType>(modelDescription, options));
     } else {
         // Only build labels necessary for formulas
-        return storm::api::buildSparseModel<ValueType>(modelDescription, formulas);
+        return scope.done(storm::api::buildSparseModel<ValueType>(modelDescription, formulas));
     }
 }
 
 template<typename ValueType>
-std::shared_ptr<storm::models::ModelBase> buildSparseModelWithOptions(storm::storage::SymbolicModelDescription const& modelDescription, storm::builder::BuilderOptions const& options) {
-    return storm::api::buildSparseModel<ValueType>(modelDescription, options);
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildWithExplicitModelBuilder(storm::builder::ExplicitModelBuilder<ValueType>& builder, std::shared_ptr<BuildProgress> const& progress) {
+    BuildProgressScope scope(progress);
+    return scope.done(builder.build());
 }
 
 template<typename ValueType>
@@ -117,31 +142,31 @@ void define_build(py::module& m) {
             .def_readwrite("build_choice_labels", &storm::parser::DirectEncodingParserOptions::buildChoiceLabeling, "Build with choice labels");
 
     // Build model
-    m.def("_build_sparse_model_from_symbolic_description", &buildSparseModel<double>, "Build the model in sparse representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>());
-    m.def("_build_sparse_exact_model_from_symbolic_description", &buildSparseModel<storm::RationalNumber>, "Build the model in sparse representation with exact number representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>());
-    m.def("_build_sparse_parametric_model_from_symbolic_description", &buildSparseModel<storm::RationalFunction>, "Build the parametric model in sparse representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>());
-    m.def("build_sparse_model_with_options", &buildSparseModelWithOptions<double>, "Build the model in sparse representation", py::arg("model_description"), py::arg("options"));
-    m.def("build_sparse_exact_model_with_options", &buildSparseModelWithOptions<storm::RationalNumber>, "Build the model in sparse representation with exact number representation", py::arg("model_description"), py::arg("options"));
-    m.def("build_sparse_parametric_model_with_options", &buildSparseModelWithOptions<storm::RationalFunction>, "Build the model in sparse representation", py::arg("model_description"), py::arg("options"));
+    m.def("_build_sparse_model_from_symbolic_description", &buildSparseModel<double>, "Build the model in sparse representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>(), py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>());
+    m.def("_build_sparse_exact_model_from_symbolic_description", &buildSparseModel<storm::RationalNumber>, "Build the model in sparse representation with exact number representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>(), py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>());
+    m.def("_build_sparse_parametric_model_from_symbolic_description", &buildSparseModel<storm::RationalFunction>, "Build the parametric model in sparse representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>(), py::arg("progress") = nullptr);
+    m.def("build_sparse_model_with_options", &buildSparseModelWithOptions<double>, "Build the model in sparse representation", py::arg("model_description"), py::arg("options"), py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>());
+    m.def("build_sparse_exact_model_with_options", &buildSparseModelWithOptions<storm::RationalNumber>, "Build the model in sparse representation with exact number representation", py::arg("model_description"), py::arg("options"), py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>());
+    m.def("build_sparse_parametric_model_with_options", &buildSparseModelWithOptions<storm::RationalFunction>, "Build the model in sparse representation", py::arg("model_description"), py::arg("options"), py::arg("progress") = nullptr);
     m.def("_build_symbolic_model_from_symbolic_description", &buildSymbolicModel<storm::dd::DdType::Sylvan, double>, "Build the model in symbolic representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>());
     m.def("_build_symbolic_parametric_model_from_symbolic_description", &buildSymbolicModel<storm::dd::DdType::Sylvan, storm::RationalFunction>, "Build the parametric model in symbolic representation", py::arg("model_description"), py::arg("formulas") = std::vector<std::shared_ptr<storm::logic::Formula const>>());
-    m.def("_build_sparse_model_from_drn", &storm::api::buildExplicitDRNModel<double>, "Build the model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions());
-    m.def("_build_sparse_exact_model_from_drn", &storm::api::buildExplicitDRNModel<storm::RationalNumber>, "Build the model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions());
+    m.def("_build_sparse_model_from_drn", &storm::api::buildExplicitDRNModel<double>, "Build the model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions(), py::call_guard<py::gil_scoped_release>());
+    m.def("_build_sparse_exact_model_from_drn", &storm::api::buildExplicitDRNModel<storm::RationalNumber>, "Build the model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions(), py::call_guard<py::gil_scoped_release>());
     m.def("_build_sparse_parametric_model_from_drn", &storm::api::buildExplicitDRNModel<storm::RationalFunction>, "Build the parametric model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions());
-    m.def("_build_sparse_interval_model_from_drn", &storm::api::buildExplicitDRNModel<storm::Interval>, "Build the interval model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions());
-    m.def("build_sparse_model_from_explicit", &storm::api::buildExplicitModel<double>, "Build the model model from explicit input", py::arg("transition_file"), py::arg("labeling_file"), py::arg("state_reward_file") = "", py::arg("transition_reward_file") = "", py::arg("choice_labeling_file") = "");
+    m.def("_build_sparse_interval_model_from_drn", &storm::api::buildExplicitDRNModel<storm::Interval>, "Build the interval model from DRN", py::arg("file"), py::arg("options") = storm::parser::DirectEncodingParserOptions(), py::call_guard<py::gil_scoped_release>());
+    m.def("build_sparse_model_from_explicit", &storm::api::buildExplicitModel<double>, "Build the model model from explicit input", py::arg("transition_file"), py::arg("labeling_file"), py::arg("state_reward_file") = "", py::arg("transition_reward_file") = "", py::arg("choice_labeling_file") = "", py::call_guard<py::gil_scoped_release>());
 
     m.def("make_sparse_model_builder", &storm::api::makeExplicitModelBuilder<double>, "Construct a builder instance", py::arg("model_description"), py::arg("options"), py::arg("action_mask") = nullptr);
     m.def("make_sparse_model_builder_exact", &storm::api::makeExplicitModelBuilder<storm::RationalNumber>, "Construct a builder instance", py::arg("model_description"), py::arg("options"), py::arg("action_mask") = nullptr);
     m.def("make_sparse_model_builder_parametric", &storm::api::makeExplicitModelBuilder<storm::RationalFunction>, "Construct a builder instance", py::arg("model_description"), py::arg("options"), py::arg("action_mask") = nullptr);
 
     py::class_<storm::builder::ExplicitModelBuilder<double>>(m, "ExplicitModelBuilder", "Model builder for sparse models")
-        .def("build", &storm::builder::ExplicitModelBuilder<double>::build, "Build the model",  py::call_guard<py::gil_scoped_release>())
+        .def("build", &buildWithExplicitModelBuilder<double>, "Build the model", py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>())
         .def("export_lookup", &storm::builder::ExplicitModelBuilder<double>::exportExplicitStateLookup, "Export a lookup model")
     ;
 
     py::class_<storm::builder::ExplicitModelBuilder<storm::RationalFunction>>(m, "ExplicitParametricModelBuilder", "Model builder for sparse models")
-        .def("build", &storm::builder::ExplicitModelBuilder<storm::RationalFunction>::build, "Build the model", py::call_guard<py::gil_scoped_release>())
+        .def("build", &buildWithExplicitModelBuilder<storm::RationalFunction>, "Build the model", py::arg("progress") = nullptr, py::call_guard<py::gil_scoped_release>())
         .def("export_lookup", &storm::builder::ExplicitModelBuilder<storm::RationalFunction>::exportExplicitStateLookup, "Export a lookup model")
     ;
 
@@ -151,10 +176,26 @@ void define_build(py::module& m) {
 
     ;
 
-    py::class_<storm::builder::BuilderOptions>(m, "BuilderOptions", "Options for building process")
-            .def(py::init<std::vector<std::shared_ptr<storm::logic::Formula const>> const&>(), "Initialise with formulae to preserve", py::arg("formulae"))
-            .def(py::init<bool, bool>(), "Initialise without formulae", py::arg("build_all_reward_models")=true, py::arg("build_all_labels")=true)
-            .def_property_readonly("preserved_label_names", &storm::builder::BuilderOptions::getLabelNames, "Labels preserved")
+    py::class_<storm::builder::BuilderOptions> builderOptionsBase(m, "_BuilderOptionsBase", "Options for building process supported by Storm");
+    builderOptionsBase.def_property_readonly("preserved_label_names", &storm::builder::BuilderOptions::getLabelNames, "Labels preserved")
+            .def_property_readonly("preserved_reward_model_names", &storm::builder::BuilderOptions::getRewardModelNames, "Reward models preserved")
+            .def_property_readonly("preserved_expression_labels", [](storm::builder::BuilderOptions const& options) {
+                    std::vector<std::string> result;
+                    for (auto const& expression : options.getExpressionLabels()) {
+                        result.push_back(expression.toString());
+                    }
+                    return result;
+                }, "Expressions preserved as labels")
+            .def_property_readonly("has_terminal_states", &storm::builder::BuilderOptions::hasTerminalStates, "Are terminal states (where exploration stops) set?")
+            .def_property_readonly("build_state_valuations", &storm::builder::BuilderOptions::isBuildStateValuationsSet, "Are state valuations built?")
+            .def_property_readonly("build_observation_valuations", &storm::builder::BuilderOptions::isBuildObservationValuationsSet, "Are observation valuations built?")
+            .def_property_readonly("build_with_choice_origins", &storm::builder::BuilderOptions::isBuildChoiceOriginsSet, "Are choice origins built?")
+            .def_property_readonly("add_out_of_bounds_state", &storm::builder::BuilderOptions::isAddOutOfBoundsStateSet, "Is an out of bounds state added?")
+            .def_property_readonly("add_overlapping_guards_label", &storm::builder::BuilderOptions::isAddOverlappingGuardLabelSet, "Are states with overlapping guards labeled?")
+            .def_property_readonly("build_choice_labels", &storm::builder::BuilderOptions::isBuildChoiceLabelsSet, "Are choice labels built?")
+            .def_property_readonly("exploration_checks", &storm::builder::BuilderOptions::isExplorationChecksSet, "Are extra checks performed during exploration?")
+            .def_property_readonly("build_all_labels", &storm::builder::BuilderOptions::isBuildAllLabelsSet, "Are all state labels built?")
+            .def_property_readonly("build_all_reward_models", &storm::builder::BuilderOptions::isBuildAllRewardModelsSet, "Are all reward models built?")
             .def("set_build_state_valuations", &storm::builder::BuilderOptions::setBuildStateValuations, "Build state valuations", py::arg("new_value")=true)
             .def("set_build_observation_valuations", &storm::builder::BuilderOptions::setBuildObservationValuations, "Build observation valuations", py::arg("new_value")=true)
             .def("set_build_with_choice_origins", &storm::builder::BuilderOptions::setBuildChoiceOrigins, "Build choice origins", py::arg("new_value")=true)
@@ -165,6 +206,46 @@ void define_build(py::module& m) {
             .def("set_build_all_labels" , &storm::builder::BuilderOptions::setBuildAllLabels, "Build with all state labels", py::arg("new_value")=true)
             .def("set_build_all_reward_models", &storm::builder::BuilderOptions::setBuildAllRewardModels, "Build with all reward models", py::arg("new_value")=true);
 
+    py::enum_<ExplorationHeuristic>(m, "ExplorationHeuristic", "Order in which states are explored when building a partial model")
+            .value("BFS", ExplorationHeuristic::Bfs, "Breadth-first search")
+            .value("DFS", ExplorationHeuristic::Dfs, "Depth-first search")
+            .value("PROBABILITY", ExplorationHeuristic::Probability, "States with the highest probability of a path from an initial state first");
+
+    py::class_<StormpyBuilderOptions, storm::builder::BuilderOptions>(m, "BuilderOptions", "Options for building process")
+            .def(py::init<std::vector<std::shared_ptr<storm::logic::Formula const>> const&>(), "Initialise with formulae to preserve", py::arg("formulae"))
+            .def(py::init<bool, bool>(), "Initialise without formulae", py::arg("build_all_reward_models")=true, py::arg("build_all_labels")=true)
+            .def_property_readonly("exploration_threads", [](StormpyBuilderOptions const& options) {return options.explorationThreads;}, "Number of threads for explicit state space exploration")
+            .def("set_exploration_threads", [](StormpyBuilderOptions& options, uint64_t threads) {options.explorationThreads = threads;}, R"dox(
+                Explore the state space with multiple threads when building sparse models with double values.
+                The resulting model is identical to the model built sequentially.
+                Options which are not supported by the parallel exploration (terminal states, choice origins, observation valuations, out of bounds state)
+                and model types other than DTMCs, CTMCs, MDPs and MAs lead to a sequential exploration.
+
+                :param int threads: Number of threads, 0 for the number of hardware threads, 1 for sequential exploration.
+                )dox", py::arg("threads"))
+            .def_property_readonly("exploration_state_limit", [](StormpyBuilderOptions const& options) {return options.explorationStateLimit;}, "Maximal number of states, 0 if not limited")
+            .def_property_readonly("exploration_memory_limit", [](StormpyBuilderOptions const& options) {return options.explorationMemoryLimit;}, "Maximal estimated memory in bytes for the exploration, 0 if not limited")
+            .def_property_readonly("exploration_time_limit", [](StormpyBuilderOptions const& options) {return options.explorationTimeLimit;}, "Maximal time in seconds for the exploration, 0 if not limited")
+            .def_property_readonly("exploration_heuristic", [](StormpyBuilderOptions const& options) {return options.explorationHeuristic;}, "Order in which states are explored if a budget is set")
+            .def_property_readonly("has_exploration_budget", &StormpyBuilderOptions::hasExplorationBudget, "Is the exploration limited by a budget?")
+            .def("set_exploration_budget", [](StormpyBuilderOptions& options, uint64_t states, uint64_t memory, double time) {
+                    STORM_LOG_THROW(time >= 0, storm::exceptions::InvalidArgumentException, "The time limit must not be negative.");
+                    options.explorationStateLimit = states;
+                    options.explorationMemoryLimit = memory;
+                    options.explorationTimeLimit = time;
+                }, R"dox(
+                Limit the exploration of the state space when building sparse models with double values.
+                If a budget is exhausted, the model built so far is returned. Discovered states which are not explored are absorbing
+                and labeled with "unexplored". Hence, the probability to reach a target yields a lower bound and the probability to reach the target
+                or an unexplored state yields an upper bound on the probability in the full model.
+                Exploration budgets are not supported together with terminal states, choice origins, observation valuations or an out of bounds state.
+
+                :param int states: Maximal number of explored states, 0 if not limited.
+                :param int memory: Maximal estimated memory in bytes for the explored states and transitions, 0 if not limited.
+                :param float time: Maximal time in seconds for the exploration, 0 if not limited.
+                )dox", py::arg("states")=0, py::arg("memory")=0, py::arg("time")=0)
+            .def("set_exploration_heuristic", [](StormpyBuilderOptions& options, ExplorationHeuristic heuristic) {options.explorationHeuristic = heuristic;}, "Set the order in which states are explored if a budget is set", py::arg("heuristic"));
+
     py::class_<storm::generator::ActionMask<double>, std::shared_ptr<storm::generator::ActionMask<double>>> actionmask(m, "ActionMaskDouble");
     py::class_<storm::generator::StateValuationFunctionMask<double>, std::shared_ptr<storm::generator::StateValuationFunctionMask<double>>> actfuncmask(m, "StateValuationFunctionActionMaskDouble", actionmask);
     actfuncmask.def(py::init<std::function<bool (storm::expressions::SimpleValuation const&, uint64_t)>>(), py::arg("f"));
@@ -0,0 +1,611 @@
+#include "exploration.h"
+
+#include "storm/api/builder.h"
+#include "storm/builder/ExplorationOrder.h"
+#include "storm/generator/JaniNextStateGenerator.h"
+#include "storm/generator/PrismNextStateGenerator.h"
+#include "storm/models/sparse/StandardRewardModel.h"
+#include "storm/settings/SettingsManager.h"
+#include "storm/settings/modules/BuildSettings.h"
+#include "storm/storage/BitVectorHashMap.h"
+#include "storm/storage/SparseMatrix.h"
+#include "storm/storage/sparse/ModelComponents.h"
+#include "storm/storage/sparse/StateStorage.h"
+#include "storm/utility/builder.h"
+#include "storm/utility/constants.h"
+#include "storm/exceptions/NotSupportedException.h"
+#include "storm/exceptions/WrongFormatException.h"
+
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <deque>
+#include <exception>
+#include <map>
+#include <optional>
+#include <queue>
+#include <thread>
+
+namespace {
+
+typedef uint32_t StateType;
+typedef storm::generator::CompressedState CompressedState;
+
+// States which are not yet known during the expansion of a state get temporary ids with this bit set
+StateType const TEMPORARY_ID = StateType(1) << 31;
+
+template<typename ValueType>
+std::shared_ptr<storm::generator::NextStateGenerator<ValueType, StateType>> makeGenerator(storm::storage::SymbolicModelDescription const& modelDescription,
+                                                                                          storm::builder::BuilderOptions const& options) {
+    if (modelDescription.isPrismProgram()) {
+        return std::make_shared<storm::generator::PrismNextStateGenerator<ValueType, StateType>>(modelDescription.asPrismProgram(), options);
+    } else {
+        return std::make_shared<storm::generator::JaniNextStateGenerator<ValueType, StateType>>(modelDescription.asJaniModel(), options);
+    }
+}
+
+storm::models::ModelType toModelType(storm::generator::ModelType modelType) {
+    switch (modelType) {
+        case storm::generator::ModelType::DTMC:
+            return storm::models::ModelType::Dtmc;
+        case storm::generator::ModelType::CTMC:
+            return storm::models::ModelType::Ctmc;
+        case storm::generator::ModelType::MDP:
+            return storm::models::ModelType::Mdp;
+        case storm::generator::ModelType::MA:
+            return storm::models::ModelType::MarkovAutomaton;
+        default:
+            STORM_LOG_THROW(false, storm::exceptions::NotSupportedException, "Model type is not supported.");
+    }
+}
+
+template<typename ValueType>
+struct ExpandedState {
+    storm::generator::StateBehavior<ValueType, StateType> behavior;
+    // Successors which were unknown during the expansion, in the order in which they were found by the generator.
+    // They are referenced by TEMPORARY_ID | index in the behavior.
+    std::vector<CompressedState> newStates;
+};
+
+/*!
+ * Explores the state space in batches of states. The states of a batch are expanded in parallel, each thread with its own next state generator.
+ * During the expansion, the state storage is only read. Afterwards, the expanded states are merged sequentially in the order of their ids.
+ * New states get their ids during the merge in the order in which they were found by the generator.
+ * As the sequential builder explores states in breadth-first order, i.e., in the order of their ids, this yields the same ids and matrix.
+ */
+template<typename ValueType>
+class ParallelExplorer {
+public:
+    ParallelExplorer(storm::storage::SymbolicModelDescription const& modelDescription, storm::builder::BuilderOptions const& options, uint64_t nrThreads,
+                     BuildProgress* progress)
+        : options(options), progress(progress) {
+        for (uint64_t i = 0; i < nrThreads; ++i) {
+            generators.push_back(makeGenerator<ValueType>(modelDescription, options));
+        }
+        stateStorage = std::make_unique<storm::storage::sparse::StateStorage<StateType>>(generators.front()->getStateSize());
+    }
+
+    storm::generator::ModelType getModelType() const {
+        return generators.front()->getModelType();
+    }
+
+    std::shared_ptr<storm::models::sparse::Model<ValueType>> build() {
+        auto& generator = *generators.front();
+        bool deterministic = generator.isDeterministicModel();
+        bool markovAutomaton = generator.getModelType() == storm::generator::ModelType::MA;
+        bool fixDeadlocks = !storm::settings::getModule<storm::settings::modules::BuildSettings>().isDontFixDeadlocksSet();
+
+        std::vector<storm::builder::RewardModelInformation> rewardModels;
+        for (uint64_t i = 0; i < generator.getNumberOfRewardModels(); ++i) {
+            rewardModels.push_back(generator.getRewardModelInformation(i));
+        }
+        std::vector<std::vector<ValueType>> stateRewards(rewardModels.size());
+        std::vector<std::vector<ValueType>> stateActionRewards(rewardModels.size());
+        std::map<std::string, std::vector<uint64_t>> choiceLabels;
+        std::vector<uint64_t> markovianStates;
+
+        stateStorage->initialStateIndices = generator.getInitialStates([this](CompressedState const& state) -> StateType {
+            return findOrAdd(state);
+        });
+        STORM_LOG_THROW(!stateStorage->initialStateIndices.empty(), storm::exceptions::WrongFormatException, "The model does not have an initial state.");
+
+        storm::storage::SparseMatrixBuilder<ValueType> transitionMatrixBuilder(0, 0, 0, false, !deterministic, 0);
+        uint64_t currentRow = 0;
+        uint64_t currentState = 0;
+        uint64_t nrTransitions = 0;
+        uint64_t batchSize = generators.size() * 1024;
+        std::vector<ExpandedState<ValueType>> expanded;
+        std::vector<std::pair<StateType, ValueType>> entries;
+        while (!pending.empty()) {
+            uint64_t batchEnd = std::min<uint64_t>(batchSize, pending.size());
+            expanded.clear();
+            expanded.resize(batchEnd);
+            expandBatch(expanded);
+
+            for (uint64_t index = 0; index < batchEnd; ++index, ++currentState) {
+                auto& expansion = expanded[index];
+                std::vector<StateType> finalIds;
+                finalIds.reserve(expansion.newStates.size());
+                for (auto const& state : expansion.newStates) {
+                    finalIds.push_back(findOrAdd(state));
+                }
+                auto const& behavior = expansion.behavior;
+
+                if (behavior.empty()) {
+                    if (behavior.wasExpanded()) {
+                        stateStorage->deadlockStateIndices.push_back(currentState);
+                    }
+                    STORM_LOG_THROW(fixDeadlocks || !behavior.wasExpanded(), storm::exceptions::WrongFormatException,
+                                    "Error while creating sparse matrix from probabilistic program: found deadlock state ("
+                                        << generator.stateToString(pending[index]) << "). For fixing these, please provide the appropriate option.");
+                    if (!deterministic) {
+                        transitionMatrixBuilder.newRowGroup(currentRow);
+                    }
+                    transitionMatrixBuilder.addNextValue(currentRow, currentState, storm::utility::one<ValueType>());
+                    for (uint64_t i = 0; i < rewardModels.size(); ++i) {
+                        if (rewardModels[i].hasStateRewards()) {
+                            stateRewards[i].push_back(storm::utility::zero<ValueType>());
+                        }
+                        if (rewardModels[i].hasStateActionRewards()) {
+                            stateActionRewards[i].push_back(storm::utility::zero<ValueType>());
+                        }
+                    }
+                    // Deadlock states are Markovian to avoid Zeno behavior
+                    if (markovAutomaton) {
+                        markovianStates.push_back(currentState);
+                    }
+                    ++currentRow;
+                    continue;
+                }
+
+                auto stateRewardIt = behavior.getStateRewards().begin();
+                for (uint64_t i = 0; i < rewardModels.size(); ++i, ++stateRewardIt) {
+                    if (rewardModels[i].hasStateRewards()) {
+                        stateRewards[i].push_back(*stateRewardIt);
+                    }
+                }
+                if (!deterministic) {
+                    transitionMatrixBuilder.newRowGroup(currentRow);
+                }
+                bool firstChoice = true;
+                for (auto const& choice : behavior) {
+                    if (options.isBuildChoiceLabelsSet() && choice.hasLabels()) {
+                        for (auto const& label : choice.getLabels()) {
+                            choiceLabels[label].push_back(currentRow);
+                        }
+                    }
+                    if (markovAutomaton && firstChoice && choice.isMarkovian()) {
+                        markovianStates.push_back(currentState);
+                    }
+                    entries.clear();
+                    for (auto const& [successor, value] : choice) {
+                        entries.emplace_back((successor & TEMPORARY_ID) ? finalIds[successor & ~TEMPORARY_ID] : successor, value);
+                    }
+                    std::sort(entries.begin(), entries.end(), [](auto const& a, auto const& b) { return a.first < b.first; });
+                    for (auto const& [column, value] : entries) {
+                        transitionMatrixBuilder.addNextValue(currentRow, column, value);
+                    }
+                    nrTransitions += entries.size();
+                    auto choiceRewardIt = choice.getRewards().begin();
+                    for (uint64_t i = 0; i < rewardModels.size(); ++i, ++choiceRewardIt) {
+                        if (rewardModels[i].hasStateActionRewards()) {
+                            stateActionRewards[i].push_back(*choiceRewardIt);
+                        }
+                    }
+                    ++currentRow;
+                    firstChoice = false;
+                }
+            }
+            pending.erase(pending.begin(), pending.begin() + batchEnd);
+            if (progress) {
+                progress->update(stateStorage->stateToId.size(), currentState, nrTransitions);
+            }
+        }
+
+        uint64_t nrStates = stateStorage->stateToId.size();
+        stateStorage->numberOfStates = nrStates;
+        auto labeling = generator.label(*stateStorage, stateStorage->initialStateIndices, stateStorage->deadlockStateIndices);
+        storm::storage::sparse::ModelComponents<ValueType> components(transitionMatrixBuilder.build(currentRow, nrStates, deterministic ? 0 : nrStates),
+                                                                      std::move(labeling));
+        components.rateTransitions = !generator.isDiscreteTimeModel();
+        for (uint64_t i = 0; i < rewardModels.size(); ++i) {
+            std::optional<std::vector<ValueType>> optionalStateRewards, optionalStateActionRewards;
+            if (rewardModels[i].hasStateRewards()) {
+                optionalStateRewards = std::move(stateRewards[i]);
+            }
+            if (rewardModels[i].hasStateActionRewards()) {
+                optionalStateActionRewards = std::move(stateActionRewards[i]);
+            }
+            components.rewardModels.emplace(rewardModels[i].getName(), storm::models::sparse::StandardRewardModel<ValueType>(
+                                                                          std::move(optionalStateRewards), std::move(optionalStateActionRewards)));
+        }
+        if (options.isBuildChoiceLabelsSet()) {
+            storm::models::sparse::ChoiceLabeling choiceLabeling(currentRow);
+            for (auto const& [label, rows] : choiceLabels) {
+                choiceLabeling.addLabel(label, storm::storage::BitVector(currentRow, rows));
+            }
+            components.choiceLabeling = std::move(choiceLabeling);
+        }
+        if (markovAutomaton) {
+            components.markovianStates = storm::storage::BitVector(nrStates, markovianStates);
+        }
+        if (options.isBuildStateValuationsSet()) {
+            auto valuationsBuilder = generator.initializeStateValuationsBuilder();
+            for (auto const& stateAndId : stateStorage->stateToId) {
+                generator.load(stateAndId.first);
+                generator.addStateValuation(stateAndId.second, valuationsBuilder);
+            }
+            components.stateValuations = valuationsBuilder.build();
+        }
+        return storm::utility::builder::buildModelFromComponents(toModelType(generator.getModelType()), std::move(components));
+    }
+
+private:
+    StateType findOrAdd(CompressedState const& state) {
+        StateType newId = stateStorage->stateToId.size();
+        STORM_LOG_THROW(newId < TEMPORARY_ID, storm::exceptions::NotSupportedException, "Too many states for the parallel exploration.");
+        StateType id = stateStorage->stateToId.findOrAdd(state, newId);
+        if (id == newId) {
+            pending.push_back(state);
+        }
+        return id;
+    }
+
+    void expandBatch(std::vector<ExpandedState<ValueType>>& expanded) {
+        std::atomic<uint64_t> next(0);
+        uint64_t nrThreads = std::min<uint64_t>(generators.size(), expanded.size());
+        std::vector<std::exception_ptr> errors(nrThreads);
+        auto work = [&](uint64_t worker) {
+            try {
+                auto& generator = *generators[worker];
+                for (uint64_t index = next++; index < expanded.size(); index = next++) {
+                    auto& expansion = expanded[index];
+                    generator.load(pending[index]);
+                    // The state storage is not modified during the expansion and can be read concurrently
+                    expansion.behavior = generator.expand([this, &expansion](CompressedState const& successor) -> StateType {
+                        if (stateStorage->stateToId.contains(successor)) {
+                            return stateStorage->stateToId.getValue(successor);
+                        }
+                        auto it = std::find(expansion.newStates.begin(), expansion.newStates.end(), successor);
+                        if (it == expansion.newStates.end()) {
+                            expansion.newStates.push_back(successor);
+                            it = expansion.newStates.end() - 1;
+                        }
+                        return TEMPORARY_ID | static_cast<StateType>(it - expansion.newStates.begin());
+                    });
+                }
+            } catch (...) {
+                errors[worker] = std::current_exception();
+            }
+        };
+        std::vector<std::thread> workers;
+        for (uint64_t worker = 1; worker < nrThreads; ++worker) {
+            workers.emplace_back(work, worker);
+        }
+        work(0);
+        for (auto& thread : workers) {
+            thread.join();
+        }
+        for (auto const& error : errors) {
+            if (error) {
+                std::rethrow_exception(error);
+            }
+        }
+    }
+
+    storm::builder::BuilderOptions options;
+    BuildProgress* progress;
+    std::vector<std::shared_ptr<storm::generator::NextStateGenerator<ValueType, StateType>>> generators;
+    std::unique_ptr<storm::storage::sparse::StateStorage<StateType>> stateStorage;
+    // Discovered states which are not yet expanded, in the order of their ids
+    std::deque<CompressedState> pending;
+};
+
+
+/*!
+ * Explores the state space until a budget (number of states, estimated memory or time) is exhausted.
+ * States are expanded in the order given by the heuristic. The probability heuristic expands the state with the highest probability of a path
+ * from an initial state found so far.
+ * Discovered states which are not expanded when the budget is exhausted are made absorbing and labeled with "unexplored".
+ */
+template<typename ValueType>
+class PartialExplorer {
+public:
+    PartialExplorer(storm::storage::SymbolicModelDescription const& modelDescription, StormpyBuilderOptions const& options, BuildProgress* progress)
+        : options(options), progress(progress), generator(makeGenerator<ValueType>(modelDescription, options)), stateStorage(generator->getStateSize()) {
+    }
+
+    storm::generator::ModelType getModelType() const {
+        return generator->getModelType();
+    }
+
+    std::shared_ptr<storm::models::sparse::Model<ValueType>> build() {
+        auto startTime = std::chrono::steady_clock::now();
+        bool deterministic = generator->isDeterministicModel();
+        bool markovAutomaton = generator->getModelType() == storm::generator::ModelType::MA;
+        bool fixDeadlocks = !storm::settings::getModule<storm::settings::modules::BuildSettings>().isDontFixDeadlocksSet();
+        // Estimated memory per state (compressed state, id, behavior) and per transition
+        uint64_t bytesPerState = (generator->getStateSize() + 63) / 64 * 8 + sizeof(StateType) + sizeof(storm::generator::StateBehavior<ValueType, StateType>);
+        uint64_t bytesPerTransition = sizeof(StateType) + sizeof(ValueType) + sizeof(storm::storage::MatrixEntry<uint64_t, ValueType>);
+        uint64_t nrTransitions = 0;
+        uint64_t nrExplored = 0;
+
+        stateStorage.initialStateIndices = generator->getInitialStates([this](CompressedState const& state) -> StateType {
+            return findOrAdd(state, storm::utility::one<ValueType>());
+        });
+        STORM_LOG_THROW(!stateStorage.initialStateIndices.empty(), storm::exceptions::WrongFormatException, "The model does not have an initial state.");
+
+        while (true) {
+            uint64_t nrStates = stateStorage.stateToId.size();
+            if ((options.explorationStateLimit > 0 && nrStates >= options.explorationStateLimit) ||
+                (options.explorationMemoryLimit > 0 && nrStates * bytesPerState + nrTransitions * bytesPerTransition >= options.explorationMemoryLimit) ||
+                (options.explorationTimeLimit > 0 &&
+                 std::chrono::duration<double>(std::chrono::steady_clock::now() - startTime).count() >= options.explorationTimeLimit)) {
+                break;
+            }
+            auto next = popFrontier();
+            if (!next) {
+                break;
+            }
+            StateType state = next.value();
+            generator->load(states[state]);
+            auto behavior = generator->expand([this](CompressedState const& successor) -> StateType {
+                return findOrAdd(successor, storm::utility::zero<ValueType>());
+            });
+            expanded[state] = true;
+            ++nrExplored;
+            for (auto const& choice : behavior) {
+                nrTransitions += choice.size();
+                if (options.explorationHeuristic == ExplorationHeuristic::Probability) {
+                    ValueType total = choice.getTotalMass();
+                    for (auto const& [successor, value] : choice) {
+                        updateReachProbability(successor, reachProbabilities[state] * value / total);
+                    }
+                }
+            }
+            behaviors[state] = std::move(behavior);
+            if (progress) {
+                progress->update(stateStorage.stateToId.size(), nrExplored, nrTransitions);
+            }
+        }
+
+        // Assemble the model in the order of the state ids
+        uint64_t nrStates = stateStorage.stateToId.size();
+        stateStorage.numberOfStates = nrStates;
+        std::vector<storm::builder::RewardModelInformation> rewardModels;
+        for (uint64_t i = 0; i < generator->getNumberOfRewardModels(); ++i) {
+            rewardModels.push_back(generator->getRewardModelInformation(i));
+        }
+        std::vector<std::vector<ValueType>> stateRewards(rewardModels.size());
+        std::vector<std::vector<ValueType>> stateActionRewards(rewardModels.size());
+        std::map<std::string, std::vector<uint64_t>> choiceLabels;
+        std::vector<uint64_t> markovianStates;
+        storm::storage::BitVector unexplored(nrStates);
+        storm::storage::SparseMatrixBuilder<ValueType> transitionMatrixBuilder(0, 0, 0, false, !deterministic, 0);
+        uint64_t currentRow = 0;
+        for (StateType state = 0; state < nrStates; ++state) {
+            auto const& behavior = behaviors[state];
+            if (!expanded[state] || behavior.empty()) {
+                if (!expanded[state]) {
+                    unexplored.set(state);
+                } else if (behavior.wasExpanded()) {
+                    stateStorage.deadlockStateIndices.push_back(state);
+                    STORM_LOG_THROW(fixDeadlocks, storm::exceptions::WrongFormatException,
+                                    "Error while creating sparse matrix from probabilistic program: found deadlock state ("
+                                        << generator->stateToString(states[state]) << "). For fixing these, please provide the appropriate option.");
+                }
+                if (!deterministic) {
+                    transitionMatrixBuilder.newRowGroup(currentRow);
+                }
+                transitionMatrixBuilder.addNextValue(currentRow, state, storm::utility::one<ValueType>());
+                for (uint64_t i = 0; i < rewardModels.size(); ++i) {
+                    if (rewardModels[i].hasStateRewards()) {
+                        stateRewards[i].push_back(storm::utility::zero<ValueType>());
+                    }
+                    if (rewardModels[i].hasStateActionRewards()) {
+                        stateActionRewards[i].push_back(storm::utility::zero<ValueType>());
+                    }
+                }
+                if (markovAutomaton) {
+                    markovianStates.push_back(state);
+                }
+                ++currentRow;
+                continue;
+            }
+
+            auto stateRewardIt = behavior.getStateRewards().begin();
+            for (uint64_t i = 0; i < rewardModels.size(); ++i, ++stateRewardIt) {
+                if (rewardModels[i].hasStateRewards()) {
+                    stateRewards[i].push_back(*stateRewardIt);
+                }
+            }
+            if (!deterministic) {
+                transitionMatrixBuilder.newRowGroup(currentRow);
+            }
+            bool firstChoice = true;
+            for (auto const& choice : behavior) {
+                if (options.isBuildChoiceLabelsSet() && choice.hasLabels()) {
+                    for (auto const& label : choice.getLabels()) {
+                        choiceLabels[label].push_back(currentRow);
+                    }
+                }
+                if (markovAutomaton && firstChoice && choice.isMarkovian()) {
+                    markovianStates.push_back(state);
+                }
+                for (auto const& [successor, value] : choice) {
+                    transitionMatrixBuilder.addNextValue(currentRow, successor, value);
+                }
+                auto choiceRewardIt = choice.getRewards().begin();
+                for (uint64_t i = 0; i < rewardModels.size(); ++i, ++choiceRewardIt) {
+                    if (rewardModels[i].hasStateActionRewards()) {
+                        stateActionRewards[i].push_back(*choiceRewardIt);
+                    }
+                }
+                ++currentRow;
+                firstChoice = false;
+            }
+        }
+        // Release the behaviors before building the model
+        behaviors = {};
+
+        auto labeling = generator->label(stateStorage, stateStorage.initialStateIndices, stateStorage.deadlockStateIndices);
+        if (options.hasExplorationBudget()) {
+            labeling.addLabel("unexplored", std::move(unexplored));
+        }
+        storm::storage::sparse::ModelComponents<ValueType> components(transitionMatrixBuilder.build(currentRow, nrStates, deterministic ? 0 : nrStates),
+                                                                      std::move(labeling));
+        components.rateTransitions = !generator->isDiscreteTimeModel();
+        for (uint64_t i = 0; i < rewardModels.size(); ++i) {
+            std::optional<std::vector<ValueType>> optionalStateRewards, optionalStateActionRewards;
+            if (rewardModels[i].hasStateRewards()) {
+                optionalStateRewards = std::move(stateRewards[i]);
+            }
+            if (rewardModels[i].hasStateActionRewards()) {
+                optionalStateActionRewards = std::move(stateActionRewards[i]);
+            }
+            components.rewardModels.emplace(rewardModels[i].getName(), storm::models::sparse::StandardRewardModel<ValueType>(
+                                                                          std::move(optionalStateRewards), std::move(optionalStateActionRewards)));
+        }
+        if (options.isBuildChoiceLabelsSet()) {
+            storm::models::sparse::ChoiceLabeling choiceLabeling(currentRow);
+            for (auto const& [label, rows] : choiceLabels) {
+                choiceLabeling.addLabel(label, storm::storage::BitVector(currentRow, rows));
+            }
+            components.choiceLabeling = std::move(choiceLabeling);
+        }
+        if (markovAutomaton) {
+            components.markovianStates = storm::storage::BitVector(nrStates, markovianStates);
+        }
+        if (options.isBuildStateValuationsSet()) {
+            auto valuationsBuilder = generator->initializeStateValuationsBuilder();
+            for (StateType state = 0; state < nrStates; ++state) {
+                generator->load(states[state]);
+                generator->addStateValuation(state, valuationsBuilder);
+            }
+            components.stateValuations = valuationsBuilder.build();
+        }
+        return storm::utility::builder::buildModelFromComponents(toModelType(generator->getModelType()), std::move(components));
+    }
+
+private:
+    StateType findOrAdd(CompressedState const& state, ValueType reachProbability) {
+        StateType newId = stateStorage.stateToId.size();
+        StateType id = stateStorage.stateToId.findOrAdd(state, newId);
+        if (id == newId) {
+            states.push_back(state);
+            behaviors.emplace_back();
+            expanded.push_back(false);
+            reachProbabilities.push_back(reachProbability);
+            if (options.explorationHeuristic == ExplorationHeuristic::Probability) {
+                // Successors are added with probability 0, the probability is updated after the expansion
+                if (!storm::utility::isZero(reachProbability)) {
+                    queue.emplace(reachProbability, id);
+                }
+            } else {
+                frontier.push_back(id);
+            }
+        }
+        return id;
+    }
+
+    void updateReachProbability(StateType state, ValueType probability) {
+        if (!expanded[state] && probability > reachProbabilities[state]) {
+            reachProbabilities[state] = probability;
+            queue.emplace(probability, state);
+        }
+    }
+
+    std::optional<StateType> popFrontier() {
+        switch (options.explorationHeuristic) {
+            case ExplorationHeuristic::Bfs:
+                if (!frontier.empty()) {
+                    StateType state = frontier.front();
+                    frontier.pop_front();
+                    return state;
+                }
+                break;
+            case ExplorationHeuristic::Dfs:
+                if (!frontier.empty()) {
+                    StateType state = frontier.back();
+                    frontier.pop_back();
+                    return state;
+                }
+                break;
+            case ExplorationHeuristic::Probability:
+                // Entries are not removed when the probability of a state increases, outdated entries are skipped
+                while (!queue.empty()) {
+                    auto [probability, state] = queue.top();
+                    queue.pop();
+                    if (!expanded[state] && probability == reachProbabilities[state]) {
+                        return state;
+                    }
+                }
+                break;
+        }
+        return std::nullopt;
+    }
+
+    StormpyBuilderOptions options;
+    BuildProgress* progress;
+    std::shared_ptr<storm::generator::NextStateGenerator<ValueType, StateType>> generator;
+    storm::storage::sparse::StateStorage<StateType> stateStorage;
+    // Information on the discovered states, indexed by their ids
+    std::vector<CompressedState> states;
+    std::vector<storm::generator::StateBehavior<ValueType, StateType>> behaviors;
+    std::vector<bool> expanded;
+    std::vector<ValueType> reachProbabilities;
+    std::deque<StateType> frontier;
+    std::priority_queue<std::pair<ValueType, StateType>> queue;
+};
+
+}  // namespace
+
+bool isSupportedByExploration(storm::builder::BuilderOptions const& options) {
+    return !options.hasTerminalStates() && !options.isBuildChoiceOriginsSet() && !options.isBuildObservationValuationsSet() &&
+           !options.isAddOutOfBoundsStateSet() &&
+           storm::settings::getModule<storm::settings::modules::BuildSettings>().getExplorationOrder() == storm::builder::ExplorationOrder::Bfs;
+}
+
+template<typename ValueType>
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildSparseModelParallel(storm::storage::SymbolicModelDescription const& modelDescription,
+                                                                                  storm::builder::BuilderOptions const& options, uint64_t nrThreads,
+                                                                                  BuildProgress* progress) {
+    if (nrThreads == 0) {
+        nrThreads = std::max<uint64_t>(1, std::thread::hardware_concurrency());
+    }
+    // With a single thread, the exploration is only used to report the progress
+    if ((nrThreads > 1 || progress) && isSupportedByExploration(options)) {
+        ParallelExplorer<ValueType> explorer(modelDescription, options, nrThreads, progress);
+        auto modelType = explorer.getModelType();
+        if (modelType == storm::generator::ModelType::DTMC || modelType == storm::generator::ModelType::CTMC || modelType == storm::generator::ModelType::MDP ||
+            modelType == storm::generator::ModelType::MA) {
+            return explorer.build();
+        }
+    }
+    return storm::api::buildSparseModel<ValueType>(modelDescription, options);
+}
+
+template<typename ValueType>
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildPartialSparseModel(storm::storage::SymbolicModelDescription const& modelDescription,
+                                                                                 StormpyBuilderOptions const& options, BuildProgress* progress) {
+    if (!options.hasExplorationBudget() && !isSupportedByExploration(options)) {
+        return storm::api::buildSparseModel<ValueType>(modelDescription, options);
+    }
+    STORM_LOG_THROW(!options.hasTerminalStates() && !options.isBuildChoiceOriginsSet() && !options.isBuildObservationValuationsSet() && !options.isAddOutOfBoundsStateSet(),
+                    storm::exceptions::NotSupportedException,
+                    "Exploration budgets are not supported together with terminal states, choice origins, observation valuations or an out of bounds state.");
+    PartialExplorer<ValueType> explorer(modelDescription, options, progress);
+    auto modelType = explorer.getModelType();
+    if (modelType != storm::generator::ModelType::DTMC && modelType != storm::generator::ModelType::CTMC && modelType != storm::generator::ModelType::MDP &&
+        modelType != storm::generator::ModelType::MA) {
+        STORM_LOG_THROW(!options.hasExplorationBudget(), storm::exceptions::NotSupportedException,
+                        "Exploration budgets are only supported for DTMCs, CTMCs, MDPs and MAs.");
+        return storm::api::buildSparseModel<ValueType>(modelDescription, options);
+    }
+    return explorer.build();
+}
+
+template std::shared_ptr<storm::models::sparse::Model<double>> buildPartialSparseModel<double>(storm::storage::SymbolicModelDescription const&,
+                                                                                               StormpyBuilderOptions const&, BuildProgress*);
+template std::shared_ptr<storm::models::sparse::Model<double>> buildSparseModelParallel<double>(storm::storage::SymbolicModelDescription const&,
+                                                                                                storm::builder::BuilderOptions const&, uint64_t, BuildProgress*);
@@ -0,0 +1,35 @@
+#pragma once
+
+#include "common.h"
+
+#include "builder_options.h"
+#include "progress.h"
+#include "storm/models/sparse/Model.h"
+#include "storm/storage/SymbolicModelDescription.h"
+
+/*!
+ * Are the options supported by the explicit state space exploration in stormpy?
+ * Otherwise, the explicit model builder of Storm has to be used.
+ */
+bool isSupportedByExploration(storm::builder::BuilderOptions const& options);
+
+/*!
+ * Build a sparse model by exploring the state space with multiple threads.
+ * The resulting model (including the state ids) is identical to the model built by the sequential explicit model builder.
+ * If a progress is given, the state space is also explored by stormpy for a single thread, such that the progress reports the number of states
+ * and transitions during the build and the build can be cancelled.
+ * Options not supported by the parallel exploration lead to the sequential model builder being used.
+ */
+template<typename ValueType>
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildSparseModelParallel(storm::storage::SymbolicModelDescription const& modelDescription,
+                                                                                  storm::builder::BuilderOptions const& options, uint64_t nrThreads,
+                                                                                  BuildProgress* progress = nullptr);
+
+/*!
+ * Build a sparse model by exploring the state space until the exploration budget of the options is exhausted.
+ * Discovered states which are not explored are absorbing and labeled with "unexplored".
+ * Without a budget, the complete model is built. Then, options and model types which are not supported lead to the sequential model builder being used.
+ */
+template<typename ValueType>
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildPartialSparseModel(storm::storage::SymbolicModelDescription const& modelDescription,
+                                                                                 StormpyBuilderOptions const& options, BuildProgress* progress = nullptr);
@@ -6,10 +6,18 @@
 #include "storm/models/symbolic/StandardRewardModel.h"
 #include "storm/modelchecker/results/CheckResult.h"
 #include "storm/modelchecker/hints/ExplicitModelCheckerHint.h"
+#include "storm/modelchecker/propositional/SparsePropositionalModelChecker.h"
+#include "storm/modelchecker/results/ExplicitQualitativeCheckResult.h"
 #include "storm/modelchecker/csl/helper/SparseCtmcCslHelper.h"
 #include "storm/modelchecker/multiobjective/multiObjectiveModelChecking.h"
 #include "storm/environment/Environment.h"
 #include "storm/utility/graph.h"
+#include "storm/utility/vector.h"
+#include "storm/logic/Formulas.h"
+#include "storm/logic/FragmentSpecification.h"
+#include "storm/solver/OptimizationDirection.h"
+
+#include "src/ndarray.h"
 
 template<typename ValueType>
 using CheckTask = storm::modelchecker::CheckTask<storm::logic::Formula, ValueType>;
@@ -79,6 +87,106 @@ std::pair<storm::storage::BitVector, storm::storage::BitVector> computeProb01max
     return storm::utility::graph::performProb01Max(model, phiStates, psiStates);
 }
 
+// Qualitative precomputations for probabilities of unbounded until formulas, identified by the constraint states, the target states and the optimization direction (if any)
+template<typename ValueType>
+using QualitativeHints = std::map<std::tuple<storm::storage::BitVector, storm::storage::BitVector, int>, std::shared_ptr<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>>;
+
+template<typename SparseModelType>
+storm::storage::BitVector checkPropositionalFormula(storm::Environment const& env, SparseModelType const& model, storm::logic::Formula const& formula) {
+    storm::modelchecker::SparsePropositionalModelChecker<SparseModelType> checker(model);
+    return checker.check(env, CheckTask<typename SparseModelType::ValueType>(formula))->asExplicitQualitativeCheckResult().getTruthValuesVector();
+}
+
+// Get a hint with the states with probability 0 and 1 for the given task.
+// The hint is computed once for all tasks with the same constraint and target states and the same optimization direction.
+// Returns nullptr if the task is not a probability operator over an unbounded until formula with propositional subformulas on a DTMC or MDP.
+template<typename ValueType>
+std::shared_ptr<storm::modelchecker::ExplicitModelCheckerHint<ValueType>> getQualitativeHint(storm::Environment const& env, storm::models::sparse::Model<ValueType> const& model, CheckTask<ValueType> const& task, QualitativeHints<ValueType>& hints) {
+    bool isDtmc = model.isOfType(storm::models::ModelType::Dtmc);
+    bool isMdp = model.isOfType(storm::models::ModelType::Mdp);
+    if (!task.getFormula().isProbabilityOperatorFormula() || !(isDtmc || isMdp) || (isMdp && !task.isOptimizationDirectionSet())) {
+        return nullptr;
+    }
+    storm::logic::Formula const& pathFormula = task.getFormula().asProbabilityOperatorFormula().getSubformula();
+    std::shared_ptr<storm::logic::Formula const> constraint;
+    std::shared_ptr<storm::logic::Formula const> target;
+    if (pathFormula.isUntilFormula()) {
+        constraint = pathFormula.asUntilFormula().getLeftSubformula().asSharedPointer();
+        target = pathFormula.asUntilFormula().getRightSubformula().asSharedPointer();
+    } else if (pathFormula.isEventuallyFormula()) {
+        constraint = std::make_shared<storm::logic::BooleanLiteralFormula>(true);
+        target = pathFormula.asEventuallyFormula().getSubformula().asSharedPointer();
+    } else {
+        return nullptr;
+    }
+    if (!constraint->isInFragment(storm::logic::propositional()) || !target->isInFragment(storm::logic::propositional())) {
+        return nullptr;
+    }
+
+    storm::storage::BitVector constraintStates, targetStates;
+    int direction = 0;
+    if (isDtmc) {
+        auto const& dtmc = *model.template as<storm::models::sparse::Dtmc<ValueType>>();
+        constraintStates = checkPropositionalFormula(env, dtmc, *constraint);
+        targetStates = checkPropositionalFormula(env, dtmc, *target);
+    } else {
+        auto const& mdp = *model.template as<storm::models::sparse::Mdp<ValueType>>();
+        constraintStates = checkPropositionalFormula(env, mdp, *constraint);
+        targetStates = checkPropositionalFormula(env, mdp, *target);
+        direction = storm::solver::minimize(task.getOptimizationDirection()) ? 1 : 2;
+    }
+    auto key = std::make_tuple(constraintStates, targetStates, direction);
+    auto it = hints.find(key);
+    if (it != hints.end()) {
+        return it->second;
+    }
+
+    std::pair<storm::storage::BitVector, storm::storage::BitVector> prob01;
+    if (isDtmc) {
+        prob01 = computeProb01(*model.template as<storm::models::sparse::Dtmc<ValueType>>(), constraintStates, targetStates);
+    } else if (direction == 1) {
+        prob01 = computeProb01min(*model.template as<storm::models::sparse::Mdp<ValueType>>(), constraintStates, targetStates);
+    } else {
+        prob01 = computeProb01max(*model.template as<storm::models::sparse::Mdp<ValueType>>(), constraintStates, targetStates);
+    }
+    // The model checker only computes the values of the maybe states and takes the values of all other states from the result hint
+    std::vector<ValueType> values(model.getNumberOfStates(), storm::utility::zero<ValueType>());
+    storm::utility::vector::setVectorValues(values, prob01.second, storm::utility::one<ValueType>());
+    auto hint = std::make_shared<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>();
+    hint->setResultHint(std::move(values));
+    hint->setMaybeStates(~(prob01.first | prob01.second));
+    hint->setComputeOnlyMaybeStates(true);
+    hints.emplace(std::move(key), hint);
+    return hint;
+}
+
+// Check multiple formulas on the same model with a single call.
+// Formulas occurring multiple times are only checked once, further occurrences get a copy of the result.
+// Probabilities of unbounded until formulas with the same constraint and target states share the computation of the states with probability 0 and 1.
+template<typename ValueType>
+std::vector<std::shared_ptr<storm::modelchecker::CheckResult>> modelCheckingSparseEngineMultiple(std::shared_ptr<storm::models::sparse::Model<ValueType>> model, std::vector<std::shared_ptr<storm::logic::Formula const>> const& formulas, bool onlyInitialStates, storm::Environment const& env) {
+    std::vector<std::shared_ptr<storm::modelchecker::CheckResult>> results;
+    std::map<std::string, std::shared_ptr<storm::modelchecker::CheckResult>> checkedFormulas;
+    QualitativeHints<ValueType> qualitativeHints;
+    for (auto const& formula : formulas) {
+        std::string formulaString = formula->toString();
+        auto it = checkedFormulas.find(formulaString);
+        if (it == checkedFormulas.end()) {
+            CheckTask<ValueType> task(*formula, onlyInitialStates);
+            auto hint = getQualitativeHint(env, *model, task, qualitativeHints);
+            if (hint) {
+                task.setHint(hint);
+            }
+            std::shared_ptr<storm::modelchecker::CheckResult> result = storm::api::verifyWithSparseEngine<ValueType>(env, model, task);
+            checkedFormulas.emplace(formulaString, result);
+            results.push_back(result);
+        } else {
+            results.push_back(it->second->clone());
+        }
+    }
+    return results;
+}
+
 template<typename ValueType>
 std::shared_ptr<storm::modelchecker::CheckResult> getExpectedNumberOfVisits(storm::Environment const& env, std::shared_ptr<storm::models::sparse::Model<ValueType>> const& model) {
     return storm::api::computeExpectedVisitingTimesWithSparseEngine(env, model);
@@ -133,31 +241,55 @@ void define_modelchecking(py::module& m) {
     m.def("_get_reachable_states_exact", &getReachableStates<storm::RationalNumber>, py::arg("model"), py::arg("initial_states"), py::arg("constraint_states"), py::arg("target_states"), py::arg("maximal_steps") = boost::none, py::arg("choice_filter") = boost::none);
     m.def("_get_reachable_states_rf", &getReachableStates<storm::RationalFunction>, py::arg("model"), py::arg("initial_states"), py::arg("constraint_states"), py::arg("target_states"), py::arg("maximal_steps") = boost::none, py::arg("choice_filter") = boost::none);
 
-    m.def("_compute_expected_number_of_visits_double", &getExpectedNumberOfVisits<double>, py::arg("env"), py::arg("model"));
-    m.def("_compute_expected_number_of_visits_exact", &getExpectedNumberOfVisits<storm::RationalNumber>,  py::arg("env"), py::arg("model"));
+    m.def("_compute_expected_number_of_visits_double", &getExpectedNumberOfVisits<double>, py::arg("env"), py::arg("model"), py::call_guard<py::gil_scoped_release>());
+    m.def("_compute_expected_number_of_visits_exact", &getExpectedNumberOfVisits<storm::RationalNumber>,  py::arg("env"), py::arg("model"), py::call_guard<py::gil_scoped_release>());
 
-    m.def("_compute_steady_state_distribution_double", &getSteadyStateDistribution<double>, py::arg("env"), py::arg("model"));
-    m.def("_compute_steady_state_distribution_exact", &getSteadyStateDistribution<storm::RationalNumber>,  py::arg("env"), py::arg("model"));
+    m.def("_compute_steady_state_distribution_double", &getSteadyStateDistribution<double>, py::arg("env"), py::arg("model"), py::call_guard<py::gil_scoped_release>());
+    m.def("_compute_steady_state_distribution_exact", &getSteadyStateDistribution<storm::RationalNumber>,  py::arg("env"), py::arg("model"), py::call_guard<py::gil_scoped_release>());
 
     // Model checking
-    m.def("_model_checking_fully_observable", &modelCheckingFullyObservableSparseEngine<double>, py::arg("model"), py::arg("task"), py::arg("environment")  = storm::Environment());
-    m.def("_exact_model_checking_fully_observable", &modelCheckingFullyObservableSparseEngine<storm::RationalNumber>, py::arg("model"), py::arg("task"), py::arg("environment")  = storm::Environment());
-    m.def("_model_checking_sparse_engine", &modelCheckingSparseEngine<double>, "Perform model checking using the sparse engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
-    m.def("_exact_model_checking_sparse_engine",  &modelCheckingSparseEngine<storm::RationalNumber>, "Perform model checking using the sparse engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
+    m.def("_model_checking_fully_observable", &modelCheckingFullyObservableSparseEngine<double>, py::arg("model"), py::arg("task"), py::arg("environment")  = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_exact_model_checking_fully_observable", &modelCheckingFullyObservableSparseEngine<storm::RationalNumber>, py::arg("model"), py::arg("task"), py::arg("environment")  = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_model_checking_sparse_engine", &modelCheckingSparseEngine<double>, "Perform model checking using the sparse engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_model_checking_sparse_engine_multiple", &modelCheckingSparseEngineMultiple<double>, "Perform model checking of multiple formulas using the sparse engine", py::arg("model"), py::arg("formulas"), py::arg("only_initial_states") = false, py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_exact_model_checking_sparse_engine_multiple", &modelCheckingSparseEngineMultiple<storm::RationalNumber>, "Perform model checking of multiple formulas using the sparse engine", py::arg("model"), py::arg("formulas"), py::arg("only_initial_states") = false, py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_parametric_model_checking_sparse_engine_multiple", &modelCheckingSparseEngineMultiple<storm::RationalFunction>, "Perform parametric model checking of multiple formulas using the sparse engine", py::arg("model"), py::arg("formulas"), py::arg("only_initial_states") = false, py::arg("environment") = storm::Environment());
+    m.def("_exact_model_checking_sparse_engine",  &modelCheckingSparseEngine<storm::RationalNumber>, "Perform model checking using the sparse engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
     m.def("_parametric_model_checking_sparse_engine", &modelCheckingSparseEngine<storm::RationalFunction>, "Perform parametric model checking using the sparse engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
     m.def("_model_checking_dd_engine", &modelCheckingDdEngine<storm::dd::DdType::Sylvan, double>, "Perform model checking using the dd engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
     m.def("_parametric_model_checking_dd_engine", &modelCheckingDdEngine<storm::dd::DdType::Sylvan, storm::RationalFunction>, "Perform parametric model checking using the dd engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
     m.def("_model_checking_hybrid_engine", &modelCheckingHybridEngine<storm::dd::DdType::Sylvan, double>, "Perform model checking using the hybrid engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
     m.def("_parametric_model_checking_hybrid_engine", &modelCheckingHybridEngine<storm::dd::DdType::Sylvan, storm::RationalFunction>, "Perform parametric model checking using the hybrid engine", py::arg("model"), py::arg("task"), py::arg("environment") = storm::Environment());
-    m.def("check_interval_mdp", &checkIntervalMdp, "Check interval MDP");
-    m.def("compute_all_until_probabilities", &computeAllUntilProbabilities, "Compute forward until probabilities");
-    m.def("compute_transient_probabilities", &computeTransientProbabilities, "Compute transient probabilities");
+    m.def("check_interval_mdp", &checkIntervalMdp, "Check interval MDP", py::call_guard<py::gil_scoped_release>());
+    m.def("compute_all_until_probabilities", &computeAllUntilProbabilities, "Compute forward until probabilities", py::call_guard<py::gil_scoped_release>());
+    m.def("compute_transient_probabilities", [](storm::Environment const& env, std::shared_ptr<storm::models::sparse::Ctmc<double>> ctmc, storm::storage::BitVector const& phiStates, storm::storage::BitVector const& psiStates, double timeBound, bool asNumpy) -> py::object {
+            std::vector<double> result;
+            {
+                py::gil_scoped_release release;
+                result = computeTransientProbabilities(env, ctmc, phiStates, psiStates, timeBound);
+            }
+            if (asNumpy) {
+                return moveToArray(std::move(result));
+            }
+            return py::cast(result);
+        }, R"dox(
+
+          Compute transient probabilities.
+
+          :param Environment env: Model checking environment
+          :param SparseCtmc ctmc: The CTMC
+          :param BitVector phi_states: The phi states
+          :param BitVector psi_states: The psi states
+          :param double time_bound: The time bound
+          :param bool as_numpy: If True, the probabilities are returned as NumPy array without copying them, otherwise as list
+          :return: Transient probabilities for all states
+          )dox", py::arg("env"), py::arg("ctmc"), py::arg("phi_states"), py::arg("psi_states"), py::arg("time_bound"), py::arg("as_numpy") = false);
     m.def("_compute_prob01states_double", &computeProb01<double>, "Compute prob-0-1 states", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
     m.def("_compute_prob01states_rationalfunc", &computeProb01<storm::RationalFunction>, "Compute prob-0-1 states", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
     m.def("_compute_prob01states_min_double", &computeProb01min<double>, "Compute prob-0-1 states (min)", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
     m.def("_compute_prob01states_max_double", &computeProb01max<double>, "Compute prob-0-1 states (max)", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
     m.def("_compute_prob01states_min_rationalfunc", &computeProb01min<storm::RationalFunction>, "Compute prob-0-1 states (min)", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
     m.def("_compute_prob01states_max_rationalfunc", &computeProb01max<storm::RationalFunction>, "Compute prob-0-1 states (max)", py::arg("model"), py::arg("phi_states"), py::arg("psi_states"));
-    m.def("_multi_objective_model_checking_double", &multiObjectiveModelChecking<double>, "Run multi-objective model checking",  py::arg("model"), py::arg("formula"), py::arg("environment") = storm::Environment());
-    m.def("_multi_objective_model_checking_exact", &multiObjectiveModelChecking<storm::RationalNumber>, "Run multi-objective model checking", py::arg("model"), py::arg("formula"), py::arg("environment") = storm::Environment());
+    m.def("_multi_objective_model_checking_double", &multiObjectiveModelChecking<double>, "Run multi-objective model checking",  py::arg("model"), py::arg("formula"), py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
+    m.def("_multi_objective_model_checking_exact", &multiObjectiveModelChecking<storm::RationalNumber>, "Run multi-objective model checking", py::arg("model"), py::arg("formula"), py::arg("environment") = storm::Environment(), py::call_guard<py::gil_scoped_release>());
 }
@@ -0,0 +1,39 @@
+#include "progress.h"
+
+#include <sstream>
+
+void define_build_progress(py::module& m) {
+    py::class_<BuildProgress, std::shared_ptr<BuildProgress>>(m, "BuildProgress", R"dox(
+        Progress of building a model, which can be passed to the model builders.
+        The progress can be polled from other threads during the build as the builders (except for parametric models) release the GIL.
+        If a callback is given, it is called with the progress when the build starts, in the given interval during the build and once after the build.
+        During the build, the callback is called from a separate thread and after updates of the counters by the builder (if the interval has passed
+        since the last call), the GIL is only held during the call. If the callback returns False or raises an exception, the build is cancelled.
+
+        The progress does not change the built model. Sparse models with double values built from PRISM programs or JANI models by :func:`build_model`
+        or :func:`build_sparse_model_with_options` are explored by stormpy if a progress is given and the options are supported by the exploration.
+        The exploration yields the same model as the builder of Storm, reports the number of states and transitions during the build and can be cancelled
+        during the build. All other builders, e.g., the builder of Storm for unsupported options or other value types, only report the elapsed time
+        and the memory during the build and the size of the model afterwards. Cancelling them raises an error once the build is finished.
+        )dox")
+        .def(py::init<py::object, double>(), "Create progress", py::arg("callback") = py::none(), py::arg("interval") = 1.0)
+        .def_property_readonly("states", &BuildProgress::getNumberOfStates, "Number of discovered states")
+        .def_property_readonly("explored_states", &BuildProgress::getNumberOfExploredStates, "Number of explored states")
+        .def_property_readonly("transitions", &BuildProgress::getNumberOfTransitions, "Number of transitions of the explored states")
+        .def_property_readonly("frontier_size", &BuildProgress::getFrontierSize, "Number of discovered states which are not yet explored")
+        .def_property_readonly("elapsed", &BuildProgress::getElapsedTime, "Elapsed time of the current or last build in seconds")
+        .def_property_readonly("states_per_second", &BuildProgress::getStatesPerSecond, "Number of explored states per second")
+        .def_property_readonly("resident_memory", [](BuildProgress const&) { return residentMemory(); }, "Current resident memory of the process in bytes, 0 if not available")
+        .def_property_readonly("running", &BuildProgress::isRunning, "Is a build running?")
+        .def_property_readonly("finished", &BuildProgress::isFinished, "Did the last build finish successfully?")
+        .def_property_readonly("cancelled", &BuildProgress::isCancelled, "Was the last build cancelled?")
+        .def("cancel", &BuildProgress::cancel, "Cancel the running build")
+        .def("__str__", [](BuildProgress const& progress) {
+                std::stringstream stream;
+                stream << progress.getNumberOfExploredStates() << " states explored, " << progress.getFrontierSize() << " states in frontier, "
+                       << progress.getNumberOfTransitions() << " transitions, " << progress.getElapsedTime() << "s, "
+                       << progress.getStatesPerSecond() << " states/s, " << residentMemory() / (1024 * 1024) << "MB";
+                return stream.str();
+            })
+    ;
+}
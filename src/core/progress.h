@@ -0,0 +1,289 @@
+#pragma once
+
+#include "src/common.h"
+
+#include "storm/models/ModelBase.h"
+#include "storm/utility/macros.h"
+#include "storm/exceptions/AbortException.h"
+#include "storm/exceptions/InvalidArgumentException.h"
+#include "storm/exceptions/InvalidOperationException.h"
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <fstream>
+#include <mutex>
+#include <thread>
+
+#if defined(__APPLE__)
+#include <mach/mach.h>
+#elif defined(__linux__)
+#include <unistd.h>
+#endif
+
+/*!
+ * Resident memory of the process in bytes, 0 if it cannot be determined.
+ */
+inline uint64_t residentMemory() {
+#if defined(__APPLE__)
+    mach_task_basic_info info;
+    mach_msg_type_number_t count = MACH_TASK_BASIC_INFO_COUNT;
+    if (task_info(mach_task_self(), MACH_TASK_BASIC_INFO, reinterpret_cast<task_info_t>(&info), &count) == KERN_SUCCESS) {
+        return info.resident_size;
+    }
+    return 0;
+#elif defined(__linux__)
+    std::ifstream statm("/proc/self/statm");
+    uint64_t size = 0, resident = 0;
+    if (statm >> size >> resident) {
+        return resident * static_cast<uint64_t>(sysconf(_SC_PAGESIZE));
+    }
+    return 0;
+#else
+    return 0;
+#endif
+}
+
+/*!
+ * Progress of building a model.
+ * Builders update the counters while the GIL is released, the counters can be read from any thread.
+ * If a callback is given, it is called with the progress when the build starts, in the given interval by a separate thread which only holds the GIL
+ * during the call, and a last time when the build is finished. Updates of the counters also call the callback if the interval has passed since the last call,
+ * so reports during the build contain the updated counters.
+ * Only the explorations of stormpy (see exploration.h) report the number of states and transitions during the build and can be cancelled during the build.
+ * All other builders only report the elapsed time and memory during the build and the size of the model afterwards.
+ */
+class BuildProgress {
+public:
+    typedef std::chrono::steady_clock Clock;
+
+    BuildProgress(py::object callback, double interval) : callback(std::move(callback)), interval(interval) {
+        STORM_LOG_THROW(interval > 0, storm::exceptions::InvalidArgumentException, "The interval must be positive.");
+    }
+
+    ~BuildProgress() {
+        stopReporter();
+    }
+
+    BuildProgress(BuildProgress const&) = delete;
+    BuildProgress& operator=(BuildProgress const&) = delete;
+
+    /*!
+     * Start a build. Resets the counters and starts the reporting thread.
+     */
+    void start() {
+        STORM_LOG_THROW(!running, storm::exceptions::InvalidOperationException, "The progress is already used by another build.");
+        stopReporter();
+        states = 0;
+        exploredStates = 0;
+        transitions = 0;
+        cancelled = false;
+        finished = false;
+        startTime = Clock::now().time_since_epoch().count();
+        running = true;
+        if (!callback.is_none()) {
+            py::gil_scoped_acquire acquire;
+            call();
+            stopRequested = false;
+            reporter = std::thread(&BuildProgress::report, this);
+        }
+    }
+
+    /*!
+     * Update the counters and call the callback if the interval has passed since the last call.
+     * Must be called without holding the GIL. Throws an AbortException if the build was cancelled.
+     */
+    void update(uint64_t newStates, uint64_t newExploredStates, uint64_t newTransitions) {
+        states.store(newStates, std::memory_order_relaxed);
+        exploredStates.store(newExploredStates, std::memory_order_relaxed);
+        transitions.store(newTransitions, std::memory_order_relaxed);
+        if (!callback.is_none() && Clock::now().time_since_epoch().count() - lastCall >= intervalTicks()) {
+            py::gil_scoped_acquire acquire;
+            call();
+        }
+        STORM_LOG_THROW(!cancelled, storm::exceptions::AbortException, "Model building was cancelled.");
+    }
+
+    /*!
+     * Finish a build. Stops the reporting thread after its last report.
+     * @param success Whether the build finished successfully.
+     * @param model Built model whose size is reported, nullptr if not available.
+     */
+    void finish(bool success, storm::models::ModelBase const* model) {
+        if (model) {
+            states = model->getNumberOfStates();
+            exploredStates = model->getNumberOfStates();
+            transitions = model->getNumberOfTransitions();
+        }
+        finished = success;
+        endTime = Clock::now().time_since_epoch().count();
+        running = false;
+        stopReporter();
+    }
+
+    void cancel() {
+        cancelled = true;
+    }
+
+    uint64_t getNumberOfStates() const {
+        return states;
+    }
+
+    uint64_t getNumberOfExploredStates() const {
+        return exploredStates;
+    }
+
+    uint64_t getNumberOfTransitions() const {
+        return transitions;
+    }
+
+    uint64_t getFrontierSize() const {
+        uint64_t explored = exploredStates;
+        uint64_t discovered = states;
+        return discovered > explored ? discovered - explored : 0;
+    }
+
+    /*!
+     * Elapsed time of the current or last build in seconds.
+     */
+    double getElapsedTime() const {
+        Clock::rep end = running ? Clock::now().time_since_epoch().count() : endTime.load();
+        return std::chrono::duration<double>(Clock::duration(end - startTime)).count();
+    }
+
+    double getStatesPerSecond() const {
+        double elapsed = getElapsedTime();
+        return elapsed > 0 ? exploredStates / elapsed : 0;
+    }
+
+    bool isRunning() const {
+        return running;
+    }
+
+    bool isFinished() const {
+        return finished;
+    }
+
+    bool isCancelled() const {
+        return cancelled;
+    }
+
+private:
+    /*!
+     * Call the callback, requires the GIL.
+     */
+    void call() {
+        lastCall = Clock::now().time_since_epoch().count();
+        try {
+            py::object result = callback(py::cast(this, py::return_value_policy::reference));
+            // Returning False cancels the build
+            if (!result.is_none() && !result.cast<bool>()) {
+                cancelled = true;
+            }
+        } catch (py::error_already_set& e) {
+            e.discard_as_unraisable("progress callback");
+            cancelled = true;
+        }
+    }
+
+    Clock::rep intervalTicks() const {
+        return std::chrono::duration_cast<Clock::duration>(std::chrono::duration<double>(interval)).count();
+    }
+
+    void report() {
+        std::unique_lock<std::mutex> lock(mutex);
+        while (true) {
+            bool stop = condition.wait_for(lock, std::chrono::duration<double>(interval), [this] { return stopRequested; });
+            lock.unlock();
+            {
+                py::gil_scoped_acquire acquire;
+                call();
+            }
+            if (stop) {
+                return;
+            }
+            lock.lock();
+        }
+    }
+
+    void stopReporter() {
+        if (reporter.joinable()) {
+            {
+                std::lock_guard<std::mutex> lock(mutex);
+                stopRequested = true;
+            }
+            condition.notify_all();
+            if (PyGILState_Check()) {
+                // The reporting thread needs the GIL for its last report
+                py::gil_scoped_release release;
+                reporter.join();
+            } else {
+                reporter.join();
+            }
+        }
+    }
+
+    py::object callback;
+    double interval;
+    std::atomic<uint64_t> states{0};
+    std::atomic<uint64_t> exploredStates{0};
+    std::atomic<uint64_t> transitions{0};
+    std::atomic<bool> running{false};
+    std::atomic<bool> finished{false};
+    std::atomic<bool> cancelled{false};
+    std::atomic<Clock::rep> startTime{0};
+    std::atomic<Clock::rep> endTime{0};
+    std::atomic<Clock::rep> lastCall{0};
+    std::thread reporter;
+    std::mutex mutex;
+    std::condition_variable condition;
+    bool stopRequested = false;
+};
+
+/*!
+ * Starts the build progress (if given) on construction and finishes it on destruction, also if the build fails.
+ */
+class BuildProgressScope {
+public:
+    BuildProgressScope(std::shared_ptr<BuildProgress> progress) : progress(std::move(progress)) {
+        if (this->progress) {
+            this->progress->start();
+        }
+    }
+
+    ~BuildProgressScope() {
+        if (progress) {
+            progress->finish(success, model);
+        }
+    }
+
+    BuildProgress* get() const {
+        return progress.get();
+    }
+
+    /*!
+     * Mark the build as successful.
+     * Throws an AbortException if the build was cancelled, also if the builder does not support cancellation.
+     */
+    void done() {
+        STORM_LOG_THROW(!progress || !progress->isCancelled(), storm::exceptions::AbortException, "Model building was cancelled.");
+        success = true;
+    }
+
+    /*!
+     * Mark the build as successful and set the built model whose size is reported when the build is finished.
+     */
+    template<typename ModelType>
+    std::shared_ptr<ModelType> done(std::shared_ptr<ModelType> builtModel) {
+        done();
+        model = builtModel.get();
+        return builtModel;
+    }
+
+private:
+    std::shared_ptr<BuildProgress> progress;
+    bool success = false;
+    storm::models::ModelBase const* model = nullptr;
+};
+
+void define_build_progress(py::module& m);
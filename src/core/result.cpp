@@ -9,6 +9,8 @@
 
 #include "storm/models/symbolic/StandardRewardModel.h"
 
+#include "src/ndarray.h"
+
 template<typename ValueType>
 std::shared_ptr<storm::modelchecker::QualitativeCheckResult> createFilterInitialStatesSparse(std::shared_ptr<storm::models::sparse::Model<ValueType>> model) {
     return std::make_unique<storm::modelchecker::ExplicitQualitativeCheckResult>(model->getInitialStates());
@@ -86,6 +88,9 @@ void define_result(py::module& m) {
             return result[state];
         }, py::arg("state"), "Get result for given state")
         .def("get_values", [](storm::modelchecker::ExplicitQuantitativeCheckResult<double> const& res) {return res.getValueVector();}, "Get model checking result values for all states")
+        .def("to_numpy", [](py::object const& pyResult) {
+            return readOnlyView(pyResult.cast<storm::modelchecker::ExplicitQuantitativeCheckResult<double> const&>().getValueVector(), pyResult);
+        }, "Get model checking result values for all states as read-only NumPy array. The values are not copied and the array keeps the result alive.")
         .def_property_readonly("scheduler", [](storm::modelchecker::ExplicitQuantitativeCheckResult<double> const& res) {return res.getScheduler();}, "get scheduler")
     ;
     py::class_<storm::modelchecker::SymbolicQuantitativeCheckResult<storm::dd::DdType::Sylvan, double>, std::shared_ptr<storm::modelchecker::SymbolicQuantitativeCheckResult<storm::dd::DdType::Sylvan, double>>>(m, "SymbolicQuantitativeCheckResult", "Symbolic quantitative model checking result", quantitativeCheckResult)
@@ -94,6 +99,9 @@ void define_result(py::module& m) {
             ;
     py::class_<storm::modelchecker::HybridQuantitativeCheckResult<storm::dd::DdType::Sylvan, double>, std::shared_ptr<storm::modelchecker::HybridQuantitativeCheckResult<storm::dd::DdType::Sylvan, double>>>(m, "HybridQuantitativeCheckResult", "Hybrid quantitative model checking result", quantitativeCheckResult)
         .def("get_values", &storm::modelchecker::HybridQuantitativeCheckResult<storm::dd::DdType::Sylvan, double>::getExplicitValueVector, "Get model checking result values for all states")
+        .def("to_numpy", [](py::object const& pyResult) {
+            return readOnlyView(pyResult.cast<storm::modelchecker::HybridQuantitativeCheckResult<storm::dd::DdType::Sylvan, double> const&>().getExplicitValueVector(), pyResult);
+        }, "Get model checking result values for all states as read-only NumPy array. The values are not copied and the array keeps the result alive.")
     ;
 
     py::class_<storm::modelchecker::QuantitativeCheckResult<storm::RationalNumber>, std::shared_ptr<storm::modelchecker::QuantitativeCheckResult<storm::RationalNumber>>> exactQuantitativeCheckResult(m, "_ExactQuantitativeCheckResult", "Abstract class for exact quantitative model checking results", checkResult);
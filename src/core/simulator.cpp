@@ -1,12 +1,708 @@
 #include "simulator.h"
+#include "src/ndarray.h"
 
 #include <storm/adapters/JsonAdapter.h>
 #include <storm/simulator/DiscreteTimeSparseModelSimulator.h>
 #include <storm/simulator/PrismProgramSimulator.h>
+#include <storm/models/sparse/StandardRewardModel.h>
+#include <storm/models/sparse/Pomdp.h>
+#include <storm/models/sparse/Ctmc.h>
+#include <storm/models/sparse/MarkovAutomaton.h>
+#include <storm/storage/Scheduler.h>
+#include <storm/generator/CompressedState.h>
+#include <storm/generator/PrismNextStateGenerator.h>
+#include <storm/exceptions/InvalidArgumentException.h>
+#include <storm/exceptions/NotSupportedException.h>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <list>
+#include <numeric>
+#include <optional>
+#include <random>
+#include <set>
+#include <unordered_map>
 
 template <typename ValueType>
 using PLSim = storm::simulator::DiscreteTimePrismProgramSimulator<ValueType>;
 
+/*!
+ * Simulate independent paths on a sparse model.
+ * Paths stop when reaching a target state, an avoid state, a sink state or after the maximal number of steps.
+ * Rewards of a state, its chosen action and the taken transition are collected when leaving the state.
+ *
+ * @return Tuple of visited states (or only the final states), accumulated rewards per reward model and target flags.
+ */
+py::tuple simulateBatch(storm::models::sparse::Model<double> const& model, uint64_t nrPaths, uint64_t maxSteps, storm::storage::Scheduler<double> const* scheduler, storm::storage::BitVector const* targetStates, storm::storage::BitVector const* avoidStates, uint64_t seed, bool recordPaths) {
+    STORM_LOG_THROW(model.getInitialStates().getNumberOfSetBits() == 1, storm::exceptions::NotSupportedException, "Simulation requires a model with a unique initial state.");
+    STORM_LOG_THROW(!targetStates || targetStates->size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of target states does not match number of states.");
+    STORM_LOG_THROW(!avoidStates || avoidStates->size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of avoid states does not match number of states.");
+    if (scheduler) {
+        STORM_LOG_THROW(scheduler->isMemorylessScheduler() && scheduler->isDeterministicScheduler(), storm::exceptions::NotSupportedException, "Simulation only supports memoryless deterministic schedulers.");
+    }
+
+    uint64_t nrRewardModels = model.getRewardModels().size();
+    std::vector<storm::models::sparse::StandardRewardModel<double> const*> rewardModels;
+    for (auto const& rewardModel : model.getRewardModels()) {
+        rewardModels.push_back(&rewardModel.second);
+    }
+    uint64_t pathLength = recordPaths ? maxSteps + 1 : 1;
+    std::vector<int64_t> states(nrPaths * pathLength, -1);
+    std::vector<double> rewards(nrPaths * nrRewardModels, 0.0);
+    std::vector<uint8_t> hits(nrPaths, 0);
+
+    {
+        py::gil_scoped_release release;
+        auto const& matrix = model.getTransitionMatrix();
+        auto const& rowGroupIndices = matrix.getRowGroupIndices();
+        uint64_t initialState = *model.getInitialStates().begin();
+        std::vector<bool> sinkStates(model.getNumberOfStates());
+        for (uint64_t state = 0; state < model.getNumberOfStates(); ++state) {
+            sinkStates[state] = model.isSinkState(state);
+        }
+        std::mt19937_64 generator(seed);
+        std::uniform_real_distribution<double> distribution(0.0, 1.0);
+
+        for (uint64_t path = 0; path < nrPaths; ++path) {
+            uint64_t state = initialState;
+            uint64_t step = 0;
+            states[path * pathLength] = state;
+            while (true) {
+                if (targetStates && targetStates->get(state)) {
+                    hits[path] = 1;
+                    break;
+                }
+                if (step == maxSteps || sinkStates[state] || (avoidStates && avoidStates->get(state))) {
+                    break;
+                }
+                // Select the action
+                uint64_t nrChoices = rowGroupIndices[state + 1] - rowGroupIndices[state];
+                uint64_t choice = 0;
+                if (scheduler) {
+                    auto const& schedulerChoice = scheduler->getChoice(state);
+                    STORM_LOG_THROW(schedulerChoice.isDefined(), storm::exceptions::InvalidArgumentException, "Scheduler does not define a choice for state " << state << ".");
+                    choice = schedulerChoice.getDeterministicChoice();
+                } else if (nrChoices > 1) {
+                    choice = std::min<uint64_t>(nrChoices - 1, static_cast<uint64_t>(distribution(generator) * nrChoices));
+                }
+                uint64_t row = rowGroupIndices[state] + choice;
+
+                // Select the successor
+                double probability = distribution(generator);
+                double sum = 0.0;
+                uint64_t successor = state;
+                for (auto const& entry : matrix.getRow(row)) {
+                    successor = entry.getColumn();
+                    sum += entry.getValue();
+                    if (probability < sum) {
+                        break;
+                    }
+                }
+
+                // Collect rewards
+                for (uint64_t rewardIndex = 0; rewardIndex < nrRewardModels; ++rewardIndex) {
+                    auto const& rewardModel = *rewardModels[rewardIndex];
+                    double reward = 0.0;
+                    if (rewardModel.hasStateRewards()) {
+                        reward += rewardModel.getStateReward(state);
+                    }
+                    if (rewardModel.hasStateActionRewards()) {
+                        reward += rewardModel.getStateActionReward(row);
+                    }
+                    if (rewardModel.hasTransitionRewards()) {
+                        for (auto const& entry : rewardModel.getTransitionRewardMatrix().getRow(row)) {
+                            if (entry.getColumn() == successor) {
+                                reward += entry.getValue();
+                            }
+                        }
+                    }
+                    rewards[path * nrRewardModels + rewardIndex] += reward;
+                }
+
+                state = successor;
+                ++step;
+                states[path * pathLength + (recordPaths ? step : 0)] = state;
+            }
+        }
+    }
+
+    py::array_t<bool> hitArray(static_cast<py::ssize_t>(nrPaths));
+    auto hitData = hitArray.mutable_unchecked<1>();
+    for (uint64_t path = 0; path < nrPaths; ++path) {
+        hitData(path) = hits[path] != 0;
+    }
+    py::array statesArray = recordPaths ? moveToArray(std::move(states), nrPaths, pathLength) : moveToArray(std::move(states));
+    return py::make_tuple(statesArray, moveToArray(std::move(rewards), nrPaths, nrRewardModels), hitArray);
+}
+
+/*!
+ * Simulator for many instances of a sparse model which are advanced together.
+ * Rewards are given as in the sparse model simulator, i.e., rewards of the action and transition plus the state reward of the reached state.
+ * Instances which reach a sink state (or the maximal number of steps) are reset to the initial state automatically.
+ */
+class VectorizedSparseModelSimulator {
+public:
+    typedef py::array_t<int64_t, py::array::c_style | py::array::forcecast> ActionArray;
+
+    VectorizedSparseModelSimulator(storm::models::sparse::Model<double> const& model, uint64_t nrInstances, uint64_t seed, uint64_t maxSteps)
+        : model(model), nrInstances(nrInstances), maxSteps(maxSteps), randomGenerator(seed), states(nrInstances), steps(nrInstances, 0) {
+        STORM_LOG_THROW(model.getInitialStates().getNumberOfSetBits() == 1, storm::exceptions::NotSupportedException, "Simulation requires a model with a unique initial state.");
+        initialState = *model.getInitialStates().begin();
+        uint64_t nrStates = model.getNumberOfStates();
+
+        sinkStates.resize(nrStates);
+        for (uint64_t state = 0; state < nrStates; ++state) {
+            sinkStates[state] = model.isSinkState(state);
+        }
+
+        // Observations
+        observations.resize(nrStates);
+        if (model.getType() == storm::models::ModelType::Pomdp) {
+            auto const& pomdp = dynamic_cast<storm::models::sparse::Pomdp<double> const&>(model);
+            for (uint64_t state = 0; state < nrStates; ++state) {
+                observations[state] = pomdp.getObservation(state);
+            }
+        } else {
+            std::iota(observations.begin(), observations.end(), 0);
+        }
+
+        // Labels as bit masks
+        for (auto const& label : model.getStateLabeling().getLabels()) {
+            labelNames.push_back(label);
+        }
+        std::sort(labelNames.begin(), labelNames.end());
+        nrLabelWords = std::max<uint64_t>(1, (labelNames.size() + 63) / 64);
+        labelMasks.resize(nrStates * nrLabelWords, 0);
+        for (uint64_t labelIndex = 0; labelIndex < labelNames.size(); ++labelIndex) {
+            for (auto state : model.getStateLabeling().getStates(labelNames[labelIndex])) {
+                labelMasks[state * nrLabelWords + labelIndex / 64] |= (1ull << (labelIndex % 64));
+            }
+        }
+
+        for (auto const& rewardModel : model.getRewardModels()) {
+            rewardNames.push_back(rewardModel.first);
+            rewardModels.push_back(&rewardModel.second);
+        }
+        std::fill(states.begin(), states.end(), initialState);
+    }
+
+    py::array_t<int64_t> reset() {
+        std::fill(states.begin(), states.end(), initialState);
+        std::fill(steps.begin(), steps.end(), 0);
+        return currentObservations();
+    }
+
+    py::tuple step(std::optional<ActionArray> const& actions) {
+        auto const& matrix = model.getTransitionMatrix();
+        auto const& rowGroupIndices = matrix.getRowGroupIndices();
+        std::optional<py::detail::unchecked_reference<int64_t, 1>> actionData;
+        if (actions) {
+            STORM_LOG_THROW(actions->ndim() == 1 && static_cast<uint64_t>(actions->shape(0)) == nrInstances, storm::exceptions::InvalidArgumentException, "Expected one action for each of the " << nrInstances << " instances.");
+            actionData = actions->unchecked<1>();
+            // Validate all actions before changing any instance
+            for (uint64_t instance = 0; instance < nrInstances; ++instance) {
+                uint64_t state = states[instance];
+                uint64_t nrChoices = rowGroupIndices[state + 1] - rowGroupIndices[state];
+                int64_t action = (*actionData)(instance);
+                STORM_LOG_THROW(action >= 0 && static_cast<uint64_t>(action) < nrChoices, storm::exceptions::InvalidArgumentException, "Instance " << instance << ": only " << nrChoices << " actions available.");
+            }
+        } else {
+            STORM_LOG_THROW(!model.isNondeterministicModel(), storm::exceptions::InvalidArgumentException, "Actions must be given for nondeterministic models.");
+        }
+
+        uint64_t nrRewardModels = rewardModels.size();
+        std::vector<double> rewards(nrInstances * nrRewardModels, 0.0);
+        std::vector<uint64_t> labels(nrInstances * nrLabelWords);
+        py::array_t<bool> dones(static_cast<py::ssize_t>(nrInstances));
+        auto doneData = dones.mutable_unchecked<1>();
+        {
+            py::gil_scoped_release release;
+            std::uniform_real_distribution<double> distribution(0.0, 1.0);
+            for (uint64_t instance = 0; instance < nrInstances; ++instance) {
+                uint64_t state = states[instance];
+                uint64_t action = actionData ? static_cast<uint64_t>((*actionData)(instance)) : 0;
+                uint64_t row = rowGroupIndices[state] + action;
+
+                double probability = distribution(randomGenerator);
+                double sum = 0.0;
+                uint64_t successor = state;
+                for (auto const& entry : matrix.getRow(row)) {
+                    successor = entry.getColumn();
+                    sum += entry.getValue();
+                    if (probability < sum) {
+                        break;
+                    }
+                }
+
+                for (uint64_t rewardIndex = 0; rewardIndex < nrRewardModels; ++rewardIndex) {
+                    auto const& rewardModel = *rewardModels[rewardIndex];
+                    double reward = 0.0;
+                    if (rewardModel.hasStateActionRewards()) {
+                        reward += rewardModel.getStateActionReward(row);
+                    }
+                    if (rewardModel.hasTransitionRewards()) {
+                        for (auto const& entry : rewardModel.getTransitionRewardMatrix().getRow(row)) {
+                            if (entry.getColumn() == successor) {
+                                reward += entry.getValue();
+                            }
+                        }
+                    }
+                    if (rewardModel.hasStateRewards()) {
+                        reward += rewardModel.getStateReward(successor);
+                    }
+                    rewards[instance * nrRewardModels + rewardIndex] = reward;
+                }
+                std::copy_n(labelMasks.begin() + successor * nrLabelWords, nrLabelWords, labels.begin() + instance * nrLabelWords);
+
+                ++steps[instance];
+                bool done = sinkStates[successor] || (maxSteps > 0 && steps[instance] >= maxSteps);
+                doneData(instance) = done;
+                if (done) {
+                    states[instance] = initialState;
+                    steps[instance] = 0;
+                } else {
+                    states[instance] = successor;
+                }
+            }
+        }
+        return py::make_tuple(currentObservations(), moveToArray(std::move(rewards), nrInstances, nrRewardModels), dones, moveToArray(std::move(labels), nrInstances, nrLabelWords));
+    }
+
+    py::array_t<uint64_t> getNumberOfAvailableActions() const {
+        auto const& rowGroupIndices = model.getTransitionMatrix().getRowGroupIndices();
+        py::array_t<uint64_t> result(static_cast<py::ssize_t>(nrInstances));
+        auto data = result.mutable_unchecked<1>();
+        for (uint64_t instance = 0; instance < nrInstances; ++instance) {
+            data(instance) = rowGroupIndices[states[instance] + 1] - rowGroupIndices[states[instance]];
+        }
+        return result;
+    }
+
+    py::array_t<uint64_t> getCurrentStates() const {
+        return py::array_t<uint64_t>(static_cast<py::ssize_t>(nrInstances), states.data());
+    }
+
+    uint64_t getNumberOfInstances() const {
+        return nrInstances;
+    }
+
+    std::vector<std::string> const& getLabelNames() const {
+        return labelNames;
+    }
+
+    std::vector<std::string> const& getRewardNames() const {
+        return rewardNames;
+    }
+
+private:
+    py::array_t<int64_t> currentObservations() const {
+        py::array_t<int64_t> result(static_cast<py::ssize_t>(nrInstances));
+        auto data = result.mutable_unchecked<1>();
+        for (uint64_t instance = 0; instance < nrInstances; ++instance) {
+            data(instance) = observations[states[instance]];
+        }
+        return result;
+    }
+
+    storm::models::sparse::Model<double> const& model;
+    uint64_t nrInstances;
+    uint64_t maxSteps;
+    std::mt19937_64 randomGenerator;
+    uint64_t initialState;
+    std::vector<uint64_t> states;
+    std::vector<uint64_t> steps;
+    std::vector<bool> sinkStates;
+    std::vector<int64_t> observations;
+    std::vector<std::string> labelNames;
+    uint64_t nrLabelWords;
+    std::vector<uint64_t> labelMasks;
+    std::vector<std::string> rewardNames;
+    std::vector<storm::models::sparse::StandardRewardModel<double> const*> rewardModels;
+};
+
+/*!
+ * Index from (state, action name) to the offset of the choice within the state.
+ * Names are derived from the choice labeling: choices with a single label are named by the label, unlabelled choices are named _act_<offset>.
+ */
+class ChoiceNameIndex {
+public:
+    template<typename ValueType>
+    explicit ChoiceNameIndex(storm::models::sparse::Model<ValueType> const& model) : rowGroupIndices(model.getTransitionMatrix().getRowGroupIndices()) {
+        STORM_LOG_THROW(model.hasChoiceLabeling(), storm::exceptions::InvalidArgumentException, "Action names require a model with choice labeling.");
+        STORM_LOG_THROW(model.getNumberOfStates() < (1ull << 32), storm::exceptions::NotSupportedException, "Action name index only supports models with less than 2^32 states.");
+        auto const& labeling = model.getChoiceLabeling();
+        choiceNames.resize(model.getNumberOfChoices(), UNNAMED);
+        for (auto const& label : labeling.getLabels()) {
+            uint32_t nameId = getOrAddName(label);
+            for (auto choice : labeling.getChoices(label)) {
+                choiceNames[choice] = choiceNames[choice] == UNNAMED ? nameId : AMBIGUOUS;
+            }
+        }
+        for (uint64_t state = 0; state < model.getNumberOfStates(); ++state) {
+            for (uint64_t choice = rowGroupIndices[state]; choice < rowGroupIndices[state + 1]; ++choice) {
+                uint64_t offset = choice - rowGroupIndices[state];
+                if (choiceNames[choice] == UNNAMED) {
+                    choiceNames[choice] = getOrAddName("_act_" + std::to_string(offset));
+                }
+                if (choiceNames[choice] != AMBIGUOUS) {
+                    // The first choice with a name is used
+                    offsets.emplace(key(state, choiceNames[choice]), offset);
+                }
+            }
+        }
+    }
+
+    std::vector<std::string> getNames(uint64_t state) const {
+        STORM_LOG_THROW(state + 1 < rowGroupIndices.size(), storm::exceptions::InvalidArgumentException, "State " << state << " does not exist.");
+        std::vector<std::string> result;
+        for (uint64_t choice = rowGroupIndices[state]; choice < rowGroupIndices[state + 1]; ++choice) {
+            STORM_LOG_THROW(choiceNames[choice] != AMBIGUOUS, storm::exceptions::NotSupportedException, "Choice " << choice << " has multiple labels, action names are not supported.");
+            result.push_back(names[choiceNames[choice]]);
+        }
+        return result;
+    }
+
+    std::optional<uint64_t> getOffset(uint64_t state, std::string const& name) const {
+        auto nameIt = nameIds.find(name);
+        if (nameIt == nameIds.end()) {
+            return std::nullopt;
+        }
+        auto offsetIt = offsets.find(key(state, nameIt->second));
+        if (offsetIt == offsets.end()) {
+            return std::nullopt;
+        }
+        return offsetIt->second;
+    }
+
+private:
+    static constexpr uint32_t UNNAMED = std::numeric_limits<uint32_t>::max();
+    static constexpr uint32_t AMBIGUOUS = std::numeric_limits<uint32_t>::max() - 1;
+
+    static uint64_t key(uint64_t state, uint32_t nameId) {
+        return (state << 32) | nameId;
+    }
+
+    uint32_t getOrAddName(std::string const& name) {
+        auto inserted = nameIds.emplace(name, names.size());
+        if (inserted.second) {
+            names.push_back(name);
+        }
+        return inserted.first->second;
+    }
+
+    std::vector<uint64_t> rowGroupIndices;
+    std::vector<uint32_t> choiceNames;
+    std::vector<std::string> names;
+    std::unordered_map<std::string, uint32_t> nameIds;
+    std::unordered_map<uint64_t, uint64_t> offsets;
+};
+
+/*!
+ * Information on a sparse continuous-time model (CTMC or MA) required for simulation.
+ * In Markovian states, the sojourn time is sampled from the exponential distribution given by the exit rate.
+ * Probabilistic states are left instantaneously.
+ * Following the maximal progress assumption, the Markovian choice of a Markovian state with further probabilistic choices is disabled.
+ * State rewards are accumulated proportionally to the sojourn time, action and transition rewards are collected instantaneously.
+ */
+class ContinuousTimeModelInfo {
+public:
+    explicit ContinuousTimeModelInfo(storm::models::sparse::Model<double> const& model) : model(model), matrix(model.getTransitionMatrix()), rowGroupIndices(model.getTransitionMatrix().getRowGroupIndices()) {
+        STORM_LOG_THROW(model.getInitialStates().getNumberOfSetBits() == 1, storm::exceptions::NotSupportedException, "Simulation requires a model with a unique initial state.");
+        if (model.isOfType(storm::models::ModelType::Ctmc)) {
+            // The transition matrix of a CTMC contains the rates
+            exitRates = dynamic_cast<storm::models::sparse::Ctmc<double> const&>(model).getExitRateVector();
+            markovianStates = storm::storage::BitVector(model.getNumberOfStates(), true);
+            rateMatrix = true;
+        } else {
+            STORM_LOG_THROW(model.isOfType(storm::models::ModelType::MarkovAutomaton), storm::exceptions::NotSupportedException, "Continuous-time simulation requires a CTMC or an MA.");
+            auto const& ma = dynamic_cast<storm::models::sparse::MarkovAutomaton<double> const&>(model);
+            exitRates = ma.getExitRates();
+            markovianStates = ma.getMarkovianStates();
+            rateMatrix = false;
+        }
+        initialState = *model.getInitialStates().begin();
+        sinkStates.resize(model.getNumberOfStates());
+        for (uint64_t state = 0; state < model.getNumberOfStates(); ++state) {
+            sinkStates[state] = model.isSinkState(state);
+        }
+        for (auto const& rewardModel : model.getRewardModels()) {
+            rewardModels.push_back(&rewardModel.second);
+        }
+    }
+
+    storm::models::sparse::Model<double> const& getModel() const {
+        return model;
+    }
+
+    uint64_t getInitialState() const {
+        return initialState;
+    }
+
+    bool isSinkState(uint64_t state) const {
+        return sinkStates[state];
+    }
+
+    uint64_t getNumberOfRewardModels() const {
+        return rewardModels.size();
+    }
+
+    /*!
+     * Get the offset of the first enabled choice of the state, i.e., 1 if the Markovian choice is disabled by probabilistic choices.
+     */
+    uint64_t getFirstEnabledChoice(uint64_t state) const {
+        return (markovianStates.get(state) && rowGroupIndices[state + 1] - rowGroupIndices[state] > 1) ? 1 : 0;
+    }
+
+    uint64_t getNumberOfEnabledChoices(uint64_t state) const {
+        return rowGroupIndices[state + 1] - rowGroupIndices[state] - getFirstEnabledChoice(state);
+    }
+
+    /*!
+     * Get the row of the choice with the given offset, i.e., the number of the choice in the state.
+     */
+    uint64_t getRow(uint64_t state, uint64_t offset) const {
+        return rowGroupIndices[state] + offset;
+    }
+
+    bool isMarkovianChoice(uint64_t state, uint64_t row) const {
+        return markovianStates.get(state) && row == rowGroupIndices[state];
+    }
+
+    template<typename Generator>
+    double sampleSojournTime(uint64_t state, uint64_t row, Generator& generator) const {
+        if (!isMarkovianChoice(state, row)) {
+            return 0.0;
+        }
+        if (exitRates[state] <= 0.0) {
+            return std::numeric_limits<double>::infinity();
+        }
+        return std::exponential_distribution<double>(exitRates[state])(generator);
+    }
+
+    template<typename Generator>
+    uint64_t sampleSuccessor(uint64_t state, uint64_t row, Generator& generator) const {
+        double total = (rateMatrix && isMarkovianChoice(state, row)) ? exitRates[state] : 1.0;
+        double value = std::uniform_real_distribution<double>(0.0, total)(generator);
+        double sum = 0.0;
+        uint64_t successor = state;
+        for (auto const& entry : matrix.getRow(row)) {
+            successor = entry.getColumn();
+            sum += entry.getValue();
+            if (value < sum) {
+                break;
+            }
+        }
+        return successor;
+    }
+
+    /*!
+     * Add the rewards of staying in the state for the given time and taking the transition to the successor.
+     */
+    void collectRewards(uint64_t state, uint64_t row, uint64_t successor, double time, double* rewards) const {
+        for (uint64_t rewardIndex = 0; rewardIndex < rewardModels.size(); ++rewardIndex) {
+            auto const& rewardModel = *rewardModels[rewardIndex];
+            double reward = 0.0;
+            if (rewardModel.hasStateRewards() && time > 0.0 && rewardModel.getStateReward(state) != 0.0) {
+                reward += rewardModel.getStateReward(state) * time;
+            }
+            if (rewardModel.hasStateActionRewards()) {
+                reward += rewardModel.getStateActionReward(row);
+            }
+            if (rewardModel.hasTransitionRewards()) {
+                for (auto const& entry : rewardModel.getTransitionRewardMatrix().getRow(row)) {
+                    if (entry.getColumn() == successor) {
+                        reward += entry.getValue();
+                    }
+                }
+            }
+            rewards[rewardIndex] += reward;
+        }
+    }
+
+    /*!
+     * Add the rewards of staying in the state for the given time without leaving it.
+     */
+    void collectStateRewards(uint64_t state, double time, double* rewards) const {
+        for (uint64_t rewardIndex = 0; rewardIndex < rewardModels.size(); ++rewardIndex) {
+            if (rewardModels[rewardIndex]->hasStateRewards() && time > 0.0 && rewardModels[rewardIndex]->getStateReward(state) != 0.0) {
+                rewards[rewardIndex] += rewardModels[rewardIndex]->getStateReward(state) * time;
+            }
+        }
+    }
+
+private:
+    storm::models::sparse::Model<double> const& model;
+    storm::storage::SparseMatrix<double> const& matrix;
+    std::vector<uint64_t> const& rowGroupIndices;
+    std::vector<double> exitRates;
+    storm::storage::BitVector markovianStates;
+    bool rateMatrix;
+    uint64_t initialState;
+    std::vector<bool> sinkStates;
+    std::vector<storm::models::sparse::StandardRewardModel<double> const*> rewardModels;
+};
+
+/*!
+ * Simulator for sparse continuous-time models (CTMCs and MAs) which keeps track of the elapsed time.
+ * Actions refer to the enabled choices of the current state, see ContinuousTimeModelInfo.
+ */
+class ContinuousTimeSparseModelSimulator {
+public:
+    explicit ContinuousTimeSparseModelSimulator(storm::models::sparse::Model<double> const& model) : info(model), generator(std::random_device{}()), lastRewards(info.getNumberOfRewardModels(), 0.0) {
+        resetToInitial();
+    }
+
+    void setSeed(uint64_t seed) {
+        generator.seed(seed);
+    }
+
+    bool step(uint64_t action) {
+        STORM_LOG_THROW(action < info.getNumberOfEnabledChoices(currentState), storm::exceptions::InvalidArgumentException, "Action " << action << " is not available in state " << currentState << ".");
+        uint64_t row = info.getRow(currentState, info.getFirstEnabledChoice(currentState) + action);
+        lastSojournTime = info.sampleSojournTime(currentState, row, generator);
+        std::fill(lastRewards.begin(), lastRewards.end(), 0.0);
+        if (std::isinf(lastSojournTime)) {
+            // The state is never left
+            info.collectStateRewards(currentState, lastSojournTime, lastRewards.data());
+        } else {
+            uint64_t successor = info.sampleSuccessor(currentState, row, generator);
+            info.collectRewards(currentState, row, successor, lastSojournTime, lastRewards.data());
+            currentState = successor;
+        }
+        currentTime += lastSojournTime;
+        return true;
+    }
+
+    bool randomStep() {
+        uint64_t nrChoices = info.getNumberOfEnabledChoices(currentState);
+        uint64_t action = nrChoices > 1 ? std::uniform_int_distribution<uint64_t>(0, nrChoices - 1)(generator) : 0;
+        return step(action);
+    }
+
+    void resetToInitial() {
+        currentState = info.getInitialState();
+        currentTime = 0.0;
+        lastSojournTime = 0.0;
+        std::fill(lastRewards.begin(), lastRewards.end(), 0.0);
+    }
+
+    uint64_t getNumberOfAvailableActions() const {
+        return info.getNumberOfEnabledChoices(currentState);
+    }
+
+    uint64_t getFirstEnabledChoice() const {
+        return info.getFirstEnabledChoice(currentState);
+    }
+
+    uint64_t getCurrentState() const {
+        return currentState;
+    }
+
+    double getCurrentTime() const {
+        return currentTime;
+    }
+
+    double getLastSojournTime() const {
+        return lastSojournTime;
+    }
+
+    std::vector<double> const& getLastRewards() const {
+        return lastRewards;
+    }
+
+private:
+    ContinuousTimeModelInfo info;
+    std::mt19937_64 generator;
+    uint64_t currentState;
+    double currentTime;
+    double lastSojournTime;
+    std::vector<double> lastRewards;
+};
+
+/*!
+ * Simulate independent time-bounded paths on a sparse continuous-time model.
+ * Paths stop when reaching a target state, an avoid state, a sink state, after the maximal number of steps or when the time bound is exceeded.
+ * Rewards are accumulated until the path stops, state rewards at most until the time bound.
+ * The scheduler refers to all choices of a state, the Markovian choice of a Markovian state is its first choice.
+ *
+ * @return Tuple of final states, stopping times, accumulated rewards per reward model and target flags.
+ */
+py::tuple simulateContinuousTimeBatch(storm::models::sparse::Model<double> const& model, uint64_t nrPaths, double timeBound, uint64_t maxSteps, storm::storage::Scheduler<double> const* scheduler, storm::storage::BitVector const* targetStates, storm::storage::BitVector const* avoidStates, uint64_t seed) {
+    STORM_LOG_THROW(timeBound >= 0.0, storm::exceptions::InvalidArgumentException, "Time bound must not be negative.");
+    STORM_LOG_THROW(!targetStates || targetStates->size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of target states does not match number of states.");
+    STORM_LOG_THROW(!avoidStates || avoidStates->size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of avoid states does not match number of states.");
+    if (scheduler) {
+        STORM_LOG_THROW(scheduler->isMemorylessScheduler() && scheduler->isDeterministicScheduler(), storm::exceptions::NotSupportedException, "Simulation only supports memoryless deterministic schedulers.");
+    }
+    ContinuousTimeModelInfo info(model);
+    uint64_t nrRewardModels = info.getNumberOfRewardModels();
+    std::vector<int64_t> states(nrPaths);
+    std::vector<double> times(nrPaths);
+    std::vector<double> rewards(nrPaths * nrRewardModels, 0.0);
+    std::vector<uint8_t> hits(nrPaths, 0);
+
+    {
+        py::gil_scoped_release release;
+        std::mt19937_64 generator(seed);
+        for (uint64_t path = 0; path < nrPaths; ++path) {
+            double* pathRewards = rewards.data() + path * nrRewardModels;
+            uint64_t state = info.getInitialState();
+            double time = 0.0;
+            for (uint64_t step = 0;; ++step) {
+                if (targetStates && targetStates->get(state)) {
+                    hits[path] = 1;
+                    break;
+                }
+                if (step == maxSteps || info.isSinkState(state) || (avoidStates && avoidStates->get(state))) {
+                    break;
+                }
+                // Select the choice
+                uint64_t offset;
+                if (scheduler) {
+                    auto const& schedulerChoice = scheduler->getChoice(state);
+                    STORM_LOG_THROW(schedulerChoice.isDefined(), storm::exceptions::InvalidArgumentException, "Scheduler does not define a choice for state " << state << ".");
+                    offset = schedulerChoice.getDeterministicChoice();
+                } else {
+                    uint64_t nrChoices = info.getNumberOfEnabledChoices(state);
+                    offset = info.getFirstEnabledChoice(state) + (nrChoices > 1 ? std::uniform_int_distribution<uint64_t>(0, nrChoices - 1)(generator) : 0);
+                }
+                uint64_t row = info.getRow(state, offset);
+
+                double sojournTime = info.sampleSojournTime(state, row, generator);
+                if (time + sojournTime > timeBound || std::isinf(sojournTime)) {
+                    double end = std::min(time + sojournTime, timeBound);
+                    info.collectStateRewards(state, end - time, pathRewards);
+                    time = end;
+                    break;
+                }
+                uint64_t successor = info.sampleSuccessor(state, row, generator);
+                info.collectRewards(state, row, successor, sojournTime, pathRewards);
+                time += sojournTime;
+                state = successor;
+            }
+            states[path] = state;
+            times[path] = time;
+        }
+    }
+
+    py::array_t<bool> hitArray(static_cast<py::ssize_t>(nrPaths));
+    auto hitData = hitArray.mutable_unchecked<1>();
+    for (uint64_t path = 0; path < nrPaths; ++path) {
+        hitData(path) = hits[path] != 0;
+    }
+    return py::make_tuple(moveToArray(std::move(states)), moveToArray(std::move(times)), moveToArray(std::move(rewards), nrPaths, nrRewardModels), hitArray);
+}
+
+void define_choice_name_index(py::module& m) {
+    py::class_<ChoiceNameIndex>(m, "_ChoiceNameIndex", "Index from state and action name to the offset of the choice")
+        .def(py::init<storm::models::sparse::Model<double> const&>(), py::arg("model"))
+        .def(py::init<storm::models::sparse::Model<storm::RationalNumber> const&>(), py::arg("model"))
+        .def("get_names", &ChoiceNameIndex::getNames, py::arg("state"), "Names of the actions of the choices in the given state")
+        .def("get_offset", &ChoiceNameIndex::getOffset, py::arg("state"), py::arg("name"), "Offset of the (first) choice with the given name in the given state, or None")
+    ;
+}
+
 template<typename ValueType>
 void define_sparse_model_simulator(py::module& m, std::string const& vtSuffix) {
     py::class_<storm::simulator::DiscreteTimeSparseModelSimulator<ValueType>> dtsmsd(m, ("_DiscreteTimeSparseModelSimulator" + vtSuffix).c_str(), "Simulator for sparse discrete-time models in memory (for ValueType)");
@@ -17,8 +713,301 @@ void define_sparse_model_simulator(py::module& m, std::string const& vtSuffix) {
     dtsmsd.def("get_last_reward", &storm::simulator::DiscreteTimeSparseModelSimulator<ValueType>::getLastRewards);
     dtsmsd.def("get_current_state", &storm::simulator::DiscreteTimeSparseModelSimulator<ValueType>::getCurrentState);
     dtsmsd.def("reset_to_initial_state", &storm::simulator::DiscreteTimeSparseModelSimulator<ValueType>::resetToInitial);
+    if constexpr (std::is_same_v<ValueType, double>) {
+        py::class_<VectorizedSparseModelSimulator>(m, "_VectorizedSparseModelSimulatorDouble", "Simulator for many instances of a sparse model")
+            .def(py::init<storm::models::sparse::Model<double> const&, uint64_t, uint64_t, uint64_t>(), py::arg("model"), py::arg("nr_instances"), py::arg("seed"), py::arg("max_steps"), py::keep_alive<1, 2>())
+            .def("reset", &VectorizedSparseModelSimulator::reset, "Reset all instances to the initial state and return the observations")
+            .def("step", &VectorizedSparseModelSimulator::step, py::arg("actions"), "Advance all instances. Returns observations, rewards, done flags and label masks")
+            .def("get_nr_available_actions", &VectorizedSparseModelSimulator::getNumberOfAvailableActions, "Number of available actions for each instance")
+            .def("get_current_states", &VectorizedSparseModelSimulator::getCurrentStates, "Current state of each instance")
+            .def_property_readonly("nr_instances", &VectorizedSparseModelSimulator::getNumberOfInstances)
+            .def_property_readonly("label_names", &VectorizedSparseModelSimulator::getLabelNames, "Labels in the order of the bits in the label masks")
+            .def_property_readonly("reward_names", &VectorizedSparseModelSimulator::getRewardNames, "Reward models in the order of the rewards")
+        ;
+        py::class_<ContinuousTimeSparseModelSimulator>(m, "_ContinuousTimeSparseModelSimulatorDouble", "Simulator for sparse continuous-time models (CTMCs and MAs) in memory")
+            .def(py::init<storm::models::sparse::Model<double> const&>(), py::arg("model"), py::keep_alive<1, 2>())
+            .def("set_seed", &ContinuousTimeSparseModelSimulator::setSeed, py::arg("seed"))
+            .def("step", &ContinuousTimeSparseModelSimulator::step, py::arg("action"), "Do a step with the given enabled choice")
+            .def("random_step", &ContinuousTimeSparseModelSimulator::randomStep, "Do a step with a uniformly chosen enabled choice")
+            .def("get_last_reward", &ContinuousTimeSparseModelSimulator::getLastRewards)
+            .def("get_current_state", &ContinuousTimeSparseModelSimulator::getCurrentState)
+            .def("get_current_time", &ContinuousTimeSparseModelSimulator::getCurrentTime, "Time elapsed since the initial state")
+            .def("get_last_sojourn_time", &ContinuousTimeSparseModelSimulator::getLastSojournTime, "Time spent in the state left by the last step")
+            .def("get_nr_available_actions", &ContinuousTimeSparseModelSimulator::getNumberOfAvailableActions, "Number of enabled choices in the current state")
+            .def("get_first_enabled_choice", &ContinuousTimeSparseModelSimulator::getFirstEnabledChoice, "Offset of the first enabled choice in the current state")
+            .def("reset_to_initial_state", &ContinuousTimeSparseModelSimulator::resetToInitial)
+            .def_static("_simulate_batch", &simulateContinuousTimeBatch, py::arg("model"), py::arg("nr_paths"), py::arg("time_bound"), py::arg("max_steps"), py::arg("scheduler"), py::arg("target_states"), py::arg("avoid_states"), py::arg("seed"), "Simulate a batch of independent time-bounded paths natively")
+        ;
+        dtsmsd.def_static("_simulate_batch", &simulateBatch, py::arg("model"), py::arg("nr_paths"), py::arg("max_steps"), py::arg("scheduler"), py::arg("target_states"), py::arg("avoid_states"), py::arg("seed"), py::arg("record_paths"), "Simulate a batch of independent paths natively");
+    }
 }
 
+/*!
+ * Simulator for PRISM programs which keeps a bounded LRU cache of expanded states.
+ * States are expanded by the next state generator, i.e., the same way as during model building.
+ * The successor distributions of recently visited states are reused instead of expanding the states again.
+ */
+template<typename ValueType>
+class CachingPrismProgramSimulator {
+public:
+    CachingPrismProgramSimulator(storm::prism::Program const& program, storm::builder::BuilderOptions const& options, uint64_t cacheCapacity)
+        : program(program), stateGenerator(program, options), cacheCapacity(cacheCapacity), randomGenerator(std::random_device{}()) {
+        for (uint64_t i = 0; i < stateGenerator.getNumberOfRewardModels(); ++i) {
+            rewardNames.push_back(stateGenerator.getRewardModelInformation(i).getName());
+        }
+        zeroRewards.resize(rewardNames.size(), storm::utility::zero<ValueType>());
+        resetToInitial();
+    }
+
+    void setSeed(uint64_t seed) {
+        randomGenerator.seed(seed);
+    }
+
+    bool step(uint64_t action) {
+        auto const& choices = current->behavior.getChoices();
+        STORM_LOG_THROW(action < choices.size(), storm::exceptions::InvalidArgumentException, "Only " << choices.size() << " actions available.");
+        uint32_t successor = choices[action].sampleFromDistribution(probabilityDistribution(randomGenerator));
+        lastRewards = choices[action].getRewards();
+        if (lastRewards.size() != zeroRewards.size()) {
+            lastRewards = zeroRewards;
+        }
+        // Copy the successor as exploring may evict the current state from the cache
+        currentState = current->successors[successor];
+        explore();
+        return true;
+    }
+
+    /*!
+     * Make a step with a uniformly chosen action.
+     * @return Index of the chosen action among the available choices, -1 if no action is available.
+     */
+    int64_t randomStep() {
+        uint64_t nrChoices = current->behavior.getChoices().size();
+        if (nrChoices == 0) {
+            return -1;
+        }
+        std::uniform_int_distribution<uint64_t> choiceDistribution(0, nrChoices - 1);
+        uint64_t action = choiceDistribution(randomGenerator);
+        step(action);
+        return action;
+    }
+
+    void resetToInitial() {
+        std::vector<storm::generator::CompressedState> initialStates;
+        auto initialIds = stateGenerator.getInitialStates([&initialStates](storm::generator::CompressedState const& state) -> uint32_t {
+            initialStates.push_back(state);
+            return initialStates.size() - 1;
+        });
+        STORM_LOG_THROW(initialIds.size() == 1, storm::exceptions::NotSupportedException, "Simulation requires a program with a unique initial state.");
+        resetToState(initialStates[initialIds.front()]);
+    }
+
+    void resetToState(storm::generator::CompressedState const& state) {
+        lastRewards = zeroRewards;
+        currentState = state;
+        explore();
+    }
+
+    void resetToState(storm::expressions::SimpleValuation const& valuation) {
+        resetToState(storm::generator::packStateFromValuation(valuation, stateGenerator.getVariableInformation(), true));
+    }
+
+    storm::generator::CompressedState const& getCurrentState() const {
+        return currentState;
+    }
+
+    std::vector<uint64_t> getActionIndices() const {
+        std::vector<uint64_t> actionIndices;
+        for (auto const& choice : current->behavior.getChoices()) {
+            actionIndices.push_back(choice.getActionIndex());
+        }
+        return actionIndices;
+    }
+
+    uint64_t getNumberOfCurrentChoices() const {
+        return current->behavior.getChoices().size();
+    }
+
+    std::vector<std::string> getActionNames() const {
+        std::vector<std::string> result;
+        for (auto const& choice : current->behavior.getChoices()) {
+            result.push_back(getActionName(choice.getActionIndex()));
+        }
+        return result;
+    }
+
+    std::optional<uint64_t> getActionOffset(std::string const& name) const {
+        if (current->actionOffsets.empty()) {
+            auto const& choices = current->behavior.getChoices();
+            for (uint64_t offset = 0; offset < choices.size(); ++offset) {
+                // The first choice with a name is used
+                current->actionOffsets.emplace(getActionName(choices[offset].getActionIndex()), offset);
+            }
+        }
+        auto it = current->actionOffsets.find(name);
+        if (it == current->actionOffsets.end()) {
+            return std::nullopt;
+        }
+        return it->second;
+    }
+
+    storm::json<ValueType> const& getStateAsJson() const {
+        if (!current->json) {
+            current->json = stateGenerator.currentStateToJson(false);
+        }
+        return current->json.value();
+    }
+
+    storm::json<ValueType> getObservationAsJson() const {
+        return stateGenerator.currentStateToJson(true);
+    }
+
+    bool isSinkState() const {
+        for (auto const& choice : current->behavior.getChoices()) {
+            for (auto const& entry : choice) {
+                if (current->successors[entry.first] != currentState) {
+                    return false;
+                }
+            }
+        }
+        return true;
+    }
+
+    std::set<std::string> getCurrentStateLabelling() const {
+        std::set<std::string> labels;
+        for (auto const& label : program.getLabels()) {
+            if (stateGenerator.evaluateBooleanExpressionInCurrentState(label.getStatePredicateExpression())) {
+                labels.insert(label.getName());
+            }
+        }
+        return labels;
+    }
+
+    std::vector<ValueType> const& getLastRewards() const {
+        return lastRewards;
+    }
+
+    std::vector<std::string> const& getRewardNames() const {
+        return rewardNames;
+    }
+
+    void setCacheCapacity(uint64_t capacity) {
+        cacheCapacity = capacity;
+        shrinkCache(cacheCapacity);
+    }
+
+    uint64_t getCacheCapacity() const {
+        return cacheCapacity;
+    }
+
+    uint64_t getCacheSize() const {
+        return cache.size();
+    }
+
+    uint64_t getCacheHits() const {
+        return cacheHits;
+    }
+
+    uint64_t getCacheMisses() const {
+        return cacheMisses;
+    }
+
+    void clearCache() {
+        // Keep the current state as it is still referenced
+        uncached = *current;
+        current = &uncached;
+        cache.clear();
+        lruOrder.clear();
+        cacheHits = 0;
+        cacheMisses = 0;
+    }
+
+private:
+    struct Expansion {
+        storm::generator::StateBehavior<ValueType, uint32_t> behavior;
+        // Successor states referenced by the state ids in the behavior
+        std::vector<storm::generator::CompressedState> successors;
+        mutable std::optional<storm::json<ValueType>> json;
+        // Offsets of the choices by action name, computed on demand
+        mutable std::unordered_map<std::string, uint64_t> actionOffsets;
+    };
+
+    std::string const& getActionName(uint64_t actionIndex) const {
+        auto it = actionNames.find(actionIndex);
+        if (it == actionNames.end()) {
+            it = actionNames.emplace(actionIndex, program.getActionName(actionIndex)).first;
+        }
+        return it->second;
+    }
+
+    struct CacheEntry {
+        Expansion expansion;
+        typename std::list<storm::generator::CompressedState>::iterator position;
+    };
+
+    void explore() {
+        stateGenerator.load(currentState);
+        auto cached = cache.find(currentState);
+        if (cached != cache.end()) {
+            ++cacheHits;
+            lruOrder.splice(lruOrder.begin(), lruOrder, cached->second.position);
+            current = &cached->second.expansion;
+        } else {
+            ++cacheMisses;
+            Expansion expansion;
+            expansion.behavior = stateGenerator.expand([&expansion](storm::generator::CompressedState const& state) -> uint32_t {
+                expansion.successors.push_back(state);
+                return expansion.successors.size() - 1;
+            });
+            if (cacheCapacity == 0) {
+                uncached = std::move(expansion);
+                current = &uncached;
+            } else {
+                shrinkCache(cacheCapacity - 1);
+                lruOrder.push_front(currentState);
+                auto inserted = cache.emplace(currentState, CacheEntry{std::move(expansion), lruOrder.begin()}).first;
+                current = &inserted->second.expansion;
+            }
+        }
+        auto const& stateRewards = current->behavior.getStateRewards();
+        for (uint64_t i = 0; i < stateRewards.size() && i < lastRewards.size(); ++i) {
+            lastRewards[i] += stateRewards[i];
+        }
+    }
+
+    void shrinkCache(uint64_t size) {
+        while (cache.size() > size) {
+            if (current == &cache.at(lruOrder.back()).expansion) {
+                uncached = *current;
+                current = &uncached;
+            }
+            cache.erase(lruOrder.back());
+            lruOrder.pop_back();
+        }
+    }
+
+    storm::prism::Program const& program;
+    // The generator keeps the loaded state and is therefore also used in const methods
+    mutable storm::generator::PrismNextStateGenerator<ValueType, uint32_t> stateGenerator;
+    storm::generator::CompressedState currentState;
+    Expansion const* current = nullptr;
+    Expansion uncached;
+
+    uint64_t cacheCapacity;
+    std::unordered_map<storm::generator::CompressedState, CacheEntry> cache;
+    std::list<storm::generator::CompressedState> lruOrder;
+    uint64_t cacheHits = 0;
+    uint64_t cacheMisses = 0;
+
+    mutable std::unordered_map<uint64_t, std::string> actionNames;
+
+    std::mt19937_64 randomGenerator;
+    std::uniform_real_distribution<double> probabilityDistribution{0.0, 1.0};
+    std::vector<std::string> rewardNames;
+    std::vector<ValueType> zeroRewards;
+    std::vector<ValueType> lastRewards;
+};
+
 template<typename ValueType>
 void define_prism_program_simulator(py::module& m, std::string const& vtSuffix) {
     py::class_<storm::simulator::DiscreteTimePrismProgramSimulator<ValueType>> dtpps(m, ("_DiscreteTimePrismProgramSimulator" + vtSuffix).c_str(), "Simulator for prism programs");
@@ -37,6 +1026,32 @@ void define_prism_program_simulator(py::module& m, std::string const& vtSuffix)
     dtpps.def("_reset_to_state_from_valuation", [](PLSim<ValueType>& sim, storm::expressions::SimpleValuation const& state) {sim.resetToState(state);});
     dtpps.def("_reset_to_state_from_compressed_state", [](PLSim<ValueType>& sim, storm::generator::CompressedState const& state) {sim.resetToState(state);});
     dtpps.def("get_reward_names", &storm::simulator::DiscreteTimePrismProgramSimulator<ValueType>::getRewardNames, "Get names of the rewards provided by the simulator");
+
+    typedef CachingPrismProgramSimulator<ValueType> CachingSim;
+    py::class_<CachingSim> cpps(m, ("_CachingPrismProgramSimulator" + vtSuffix).c_str(), "Simulator for prism programs with a bounded cache of expanded states");
+    cpps.def(py::init<storm::prism::Program const&, storm::builder::BuilderOptions const&, uint64_t>(), py::arg("program"), py::arg("options"), py::arg("cache_capacity"), py::keep_alive<1, 2>());
+    cpps.def("set_seed", &CachingSim::setSeed, py::arg("seed"));
+    cpps.def("step", &CachingSim::step, py::arg("action_index"), "Make a step and randomly select the successor. The action is given as an argument, the index reflects the index of the available choices.");
+    cpps.def("random_step", &CachingSim::randomStep, "Make a step with a uniformly chosen action and randomly select the successor. Returns the index of the chosen action, or -1 if no action is available.");
+    cpps.def("get_action_indices", &CachingSim::getActionIndices, "A list of choices that encode the possibilities in the current state.");
+    cpps.def("get_number_of_current_choices", &CachingSim::getNumberOfCurrentChoices);
+    cpps.def("get_action_names", &CachingSim::getActionNames, "Names of the actions of the choices in the current state.");
+    cpps.def("get_action_offset", &CachingSim::getActionOffset, py::arg("name"), "Offset of the (first) choice with the given action name in the current state, or None.");
+    cpps.def("get_current_state", &CachingSim::getCurrentState, "Get current state");
+    cpps.def("get_current_state_as_json", &CachingSim::getStateAsJson);
+    cpps.def("get_current_observation_as_json", &CachingSim::getObservationAsJson);
+    cpps.def("get_current_state_is_sink", &CachingSim::isSinkState);
+    cpps.def("get_current_labels", &CachingSim::getCurrentStateLabelling, "What are the state labels at the current state?");
+    cpps.def("get_last_reward", &CachingSim::getLastRewards);
+    cpps.def("reset_to_initial_state", &CachingSim::resetToInitial, "Reset to the initial state");
+    cpps.def("_reset_to_state_from_valuation", [](CachingSim& sim, storm::expressions::SimpleValuation const& state) {sim.resetToState(state);});
+    cpps.def("_reset_to_state_from_compressed_state", [](CachingSim& sim, storm::generator::CompressedState const& state) {sim.resetToState(state);});
+    cpps.def("get_reward_names", &CachingSim::getRewardNames, "Get names of the rewards provided by the simulator");
+    cpps.def_property("cache_capacity", &CachingSim::getCacheCapacity, &CachingSim::setCacheCapacity, "Maximal number of expanded states in the cache");
+    cpps.def_property_readonly("cache_size", &CachingSim::getCacheSize, "Number of expanded states in the cache");
+    cpps.def_property_readonly("cache_hits", &CachingSim::getCacheHits, "Number of explorations answered by the cache");
+    cpps.def_property_readonly("cache_misses", &CachingSim::getCacheMisses, "Number of explorations which required expanding the state");
+    cpps.def("clear_cache", &CachingSim::clearCache, "Clear the cache and reset the counters");
 }
 
 template void define_sparse_model_simulator<double>(py::module& m, std::string const& vtSuffix);
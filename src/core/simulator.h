@@ -2,6 +2,8 @@
 
 #include "common.h"
 
+void define_choice_name_index(py::module& m);
+
 template<typename ValueType>
 void define_sparse_model_simulator(py::module& m, std::string const& vtSuffix);
 
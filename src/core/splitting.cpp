@@ -0,0 +1,268 @@
+#include "splitting.h"
+#include "src/ndarray.h"
+
+#include <storm/models/sparse/Model.h>
+#include <storm/storage/Scheduler.h>
+#include <storm/storage/expressions/Expression.h>
+#include <storm/storage/expressions/ExpressionManager.h>
+#include <storm/storage/expressions/SimpleValuation.h>
+#include <storm/storage/sparse/StateValuations.h>
+#include <storm/utility/constants.h>
+#include <storm/exceptions/InvalidArgumentException.h>
+#include <storm/exceptions/NotSupportedException.h>
+
+#include <algorithm>
+#include <functional>
+#include <random>
+
+typedef py::array_t<double, py::array::c_style | py::array::forcecast> ImportanceArray;
+
+/*!
+ * Evaluate an expression over the variables of the state valuations for all states of the model.
+ */
+std::vector<double> evaluateImportance(storm::models::sparse::Model<double> const& model, storm::expressions::Expression const& expression) {
+    STORM_LOG_THROW(model.hasStateValuations(), storm::exceptions::InvalidArgumentException, "Evaluating an importance expression requires a model with state valuations.");
+    auto const& stateValuations = model.getStateValuations();
+    auto variables = expression.getVariables();
+    storm::expressions::SimpleValuation valuation(expression.getManager().getSharedPointer());
+    std::vector<double> result(model.getNumberOfStates());
+    for (uint64_t state = 0; state < model.getNumberOfStates(); ++state) {
+        for (auto const& variable : variables) {
+            if (variable.hasBooleanType()) {
+                valuation.setBooleanValue(variable, stateValuations.getBooleanValue(state, variable));
+            } else if (variable.hasIntegerType()) {
+                valuation.setIntegerValue(variable, stateValuations.getIntegerValue(state, variable));
+            } else {
+                valuation.setRationalValue(variable, storm::utility::convertNumber<double>(stateValuations.getRationalValue(state, variable)));
+            }
+        }
+        result[state] = expression.evaluateAsDouble(&valuation);
+    }
+    return result;
+}
+
+/*!
+ * Model, importance levels and stopping conditions for importance splitting on a discrete-time sparse model.
+ * The level of a state is the number of thresholds which are at most its importance.
+ * Paths stop when reaching a target state (success), or an avoid state, a sink state or the maximal number of steps (failure).
+ */
+class SplittingContext {
+public:
+    SplittingContext(storm::models::sparse::Model<double> const& model, ImportanceArray const& importance, std::vector<double> const& thresholds, storm::storage::BitVector const& targetStates, storm::storage::BitVector const* avoidStates, storm::storage::Scheduler<double> const* scheduler, uint64_t maxSteps)
+        : matrix(model.getTransitionMatrix()), rowGroupIndices(model.getTransitionMatrix().getRowGroupIndices()), targetStates(targetStates), avoidStates(avoidStates), scheduler(scheduler), maxSteps(maxSteps), nrLevels(thresholds.size() + 1) {
+        STORM_LOG_THROW(model.isDiscreteTimeModel(), storm::exceptions::NotSupportedException, "Importance splitting requires a discrete-time model.");
+        STORM_LOG_THROW(model.getInitialStates().getNumberOfSetBits() == 1, storm::exceptions::NotSupportedException, "Simulation requires a model with a unique initial state.");
+        STORM_LOG_THROW(importance.ndim() == 1 && static_cast<uint64_t>(importance.shape(0)) == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Importance must contain one value per state.");
+        STORM_LOG_THROW(targetStates.size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of target states does not match number of states.");
+        STORM_LOG_THROW(!avoidStates || avoidStates->size() == model.getNumberOfStates(), storm::exceptions::InvalidArgumentException, "Size of avoid states does not match number of states.");
+        STORM_LOG_THROW(std::adjacent_find(thresholds.begin(), thresholds.end(), std::greater_equal<double>()) == thresholds.end(), storm::exceptions::InvalidArgumentException, "Thresholds must be strictly increasing.");
+        if (scheduler) {
+            STORM_LOG_THROW(scheduler->isMemorylessScheduler() && scheduler->isDeterministicScheduler(), storm::exceptions::NotSupportedException, "Simulation only supports memoryless deterministic schedulers.");
+        }
+        initialState = *model.getInitialStates().begin();
+        auto values = importance.unchecked<1>();
+        levels.resize(model.getNumberOfStates());
+        stopStates.resize(model.getNumberOfStates());
+        for (uint64_t state = 0; state < model.getNumberOfStates(); ++state) {
+            levels[state] = std::upper_bound(thresholds.begin(), thresholds.end(), values(state)) - thresholds.begin();
+            stopStates[state] = model.isSinkState(state) || (avoidStates && avoidStates->get(state));
+        }
+    }
+
+    uint64_t getInitialState() const {
+        return initialState;
+    }
+
+    uint64_t getNumberOfLevels() const {
+        return nrLevels;
+    }
+
+    uint64_t getLevel(uint64_t state) const {
+        return levels[state];
+    }
+
+    bool isTarget(uint64_t state) const {
+        return targetStates.get(state);
+    }
+
+    /*!
+     * Whether a path in the given state fails, i.e., it is in an avoid or sink state or exceeded the maximal number of steps.
+     */
+    bool isFailure(uint64_t state, uint64_t steps) const {
+        return steps >= maxSteps || stopStates[state];
+    }
+
+    template<typename Generator>
+    uint64_t sampleSuccessor(uint64_t state, Generator& generator) const {
+        uint64_t nrChoices = rowGroupIndices[state + 1] - rowGroupIndices[state];
+        uint64_t choice = 0;
+        if (scheduler) {
+            auto const& schedulerChoice = scheduler->getChoice(state);
+            STORM_LOG_THROW(schedulerChoice.isDefined(), storm::exceptions::InvalidArgumentException, "Scheduler does not define a choice for state " << state << ".");
+            choice = schedulerChoice.getDeterministicChoice();
+        } else if (nrChoices > 1) {
+            choice = std::uniform_int_distribution<uint64_t>(0, nrChoices - 1)(generator);
+        }
+        double probability = std::uniform_real_distribution<double>(0.0, 1.0)(generator);
+        double sum = 0.0;
+        uint64_t successor = state;
+        for (auto const& entry : matrix.getRow(rowGroupIndices[state] + choice)) {
+            successor = entry.getColumn();
+            sum += entry.getValue();
+            if (probability < sum) {
+                break;
+            }
+        }
+        return successor;
+    }
+
+private:
+    storm::storage::SparseMatrix<double> const& matrix;
+    std::vector<uint64_t> const& rowGroupIndices;
+    storm::storage::BitVector const& targetStates;
+    storm::storage::BitVector const* avoidStates;
+    storm::storage::Scheduler<double> const* scheduler;
+    uint64_t maxSteps;
+    uint64_t nrLevels;
+    uint64_t initialState;
+    std::vector<uint64_t> levels;
+    std::vector<bool> stopStates;
+};
+
+/*!
+ * Estimate a reachability probability with RESTART.
+ * When a path crosses a threshold upwards, it is split into the given number of copies.
+ * The copies created at a threshold are killed when they fall below it again, the original path continues until it stops.
+ * Reaching the target in level l contributes the inverse of the product of the splitting factors of the thresholds between the initial level and l.
+ * Thresholds up to the initial level are ignored, i.e., the levels below the initial level are treated as the initial level.
+ *
+ * @return Estimate contributed by each main path.
+ */
+py::array_t<double> simulateRestart(storm::models::sparse::Model<double> const& model, ImportanceArray const& importance, std::vector<double> const& thresholds, std::vector<uint64_t> const& splits, storm::storage::BitVector const& targetStates, storm::storage::BitVector const* avoidStates, storm::storage::Scheduler<double> const* scheduler, uint64_t nrPaths, uint64_t maxSteps, uint64_t seed) {
+    SplittingContext context(model, importance, thresholds, targetStates, avoidStates, scheduler, maxSteps);
+    STORM_LOG_THROW(splits.size() == thresholds.size(), storm::exceptions::InvalidArgumentException, "Number of splitting factors must match number of thresholds.");
+    STORM_LOG_THROW(std::all_of(splits.begin(), splits.end(), [](uint64_t split) { return split > 0; }), storm::exceptions::InvalidArgumentException, "Splitting factors must be positive.");
+    std::vector<double> values(nrPaths, 0.0);
+    {
+        py::gil_scoped_release release;
+        uint64_t initialState = context.getInitialState();
+        uint64_t initialLevel = context.getLevel(initialState);
+        auto getLevel = [&context, initialLevel](uint64_t state) { return std::max(context.getLevel(state), initialLevel); };
+        // weights[l] is the weight of a path in level l, a path in the initial level has weight 1
+        std::vector<double> weights(context.getNumberOfLevels(), 1.0);
+        for (uint64_t level = initialLevel + 1; level < weights.size(); ++level) {
+            weights[level] = weights[level - 1] / splits[level - 1];
+        }
+        struct Trial {
+            uint64_t state;
+            uint64_t level;
+            uint64_t bornLevel;
+            uint64_t steps;
+        };
+        std::vector<Trial> trials;
+        std::mt19937_64 generator(seed);
+        for (uint64_t path = 0; path < nrPaths; ++path) {
+            trials.push_back({initialState, initialLevel, initialLevel, 0});
+            while (!trials.empty()) {
+                Trial trial = trials.back();
+                trials.pop_back();
+                while (true) {
+                    if (context.isTarget(trial.state)) {
+                        values[path] += weights[trial.level];
+                        break;
+                    }
+                    if (context.isFailure(trial.state, trial.steps)) {
+                        break;
+                    }
+                    uint64_t successor = context.sampleSuccessor(trial.state, generator);
+                    uint64_t level = getLevel(successor);
+                    ++trial.steps;
+                    if (level < trial.bornLevel) {
+                        // Retrial leaves the level it was created in
+                        break;
+                    }
+                    // Split when crossing thresholds upwards
+                    uint64_t copies = 1;
+                    for (uint64_t crossed = trial.level + 1; crossed <= level; ++crossed) {
+                        for (uint64_t copy = 0; copy < copies * (splits[crossed - 1] - 1); ++copy) {
+                            trials.push_back({successor, level, crossed, trial.steps});
+                        }
+                        copies *= splits[crossed - 1];
+                    }
+                    trial.state = successor;
+                    trial.level = level;
+                }
+            }
+        }
+    }
+    return moveToArray(std::move(values));
+}
+
+/*!
+ * Estimate a reachability probability with fixed effort splitting.
+ * In each level, the given number of paths is started from the states in which the previous level was left.
+ * The start states are used in a round-robin fashion.
+ * A path succeeds when it reaches a higher level (or the target in the last level).
+ *
+ * @return Tuple of the estimate and the conditional probability of each level.
+ */
+py::tuple simulateFixedEffort(storm::models::sparse::Model<double> const& model, ImportanceArray const& importance, std::vector<double> const& thresholds, storm::storage::BitVector const& targetStates, storm::storage::BitVector const* avoidStates, storm::storage::Scheduler<double> const* scheduler, uint64_t effort, uint64_t maxSteps, uint64_t seed) {
+    SplittingContext context(model, importance, thresholds, targetStates, avoidStates, scheduler, maxSteps);
+    STORM_LOG_THROW(effort > 0, storm::exceptions::InvalidArgumentException, "Effort must be positive.");
+    std::vector<double> levelProbabilities(context.getNumberOfLevels(), 0.0);
+    double estimate = 1.0;
+    {
+        py::gil_scoped_release release;
+        std::mt19937_64 generator(seed);
+        std::vector<uint64_t> startStates = {context.getInitialState()};
+        std::vector<uint64_t> entryStates;
+        for (uint64_t level = context.getLevel(context.getInitialState()); level < context.getNumberOfLevels(); ++level) {
+            bool lastLevel = level + 1 == context.getNumberOfLevels();
+            entryStates.clear();
+            for (uint64_t run = 0; run < effort; ++run) {
+                uint64_t state = startStates[run % startStates.size()];
+                for (uint64_t steps = 0;; ++steps) {
+                    if (context.isTarget(state) || (!lastLevel && context.getLevel(state) > level)) {
+                        entryStates.push_back(state);
+                        break;
+                    }
+                    if (context.isFailure(state, steps)) {
+                        break;
+                    }
+                    state = context.sampleSuccessor(state, generator);
+                }
+            }
+            levelProbabilities[level] = static_cast<double>(entryStates.size()) / effort;
+            estimate *= levelProbabilities[level];
+            if (entryStates.empty()) {
+                break;
+            }
+            if (std::all_of(entryStates.begin(), entryStates.end(), [&context](uint64_t state) { return context.isTarget(state); })) {
+                // All paths reached the target
+                std::fill(levelProbabilities.begin() + level + 1, levelProbabilities.end(), 1.0);
+                break;
+            }
+            // Paths which reached the target in an intermediate level stay successful
+            std::swap(startStates, entryStates);
+            // Skip levels which were jumped over by all paths
+            uint64_t minLevel = context.getNumberOfLevels() - 1;
+            for (auto state : startStates) {
+                if (!context.isTarget(state)) {
+                    minLevel = std::min(minLevel, context.getLevel(state));
+                }
+            }
+            for (; level + 1 < minLevel; ++level) {
+                levelProbabilities[level + 1] = 1.0;
+            }
+        }
+    }
+    return py::make_tuple(estimate, moveToArray(std::move(levelProbabilities)));
+}
+
+void define_importance_splitting(py::module& m) {
+    m.def("_evaluate_importance", [](storm::models::sparse::Model<double> const& model, storm::expressions::Expression const& expression) {
+        return moveToArray(evaluateImportance(model, expression));
+    }, py::arg("model"), py::arg("expression"), "Evaluate an expression over the state valuations for all states");
+    m.def("_simulate_restart", &simulateRestart, py::arg("model"), py::arg("importance"), py::arg("thresholds"), py::arg("splits"), py::arg("target_states"), py::arg("avoid_states"), py::arg("scheduler"), py::arg("nr_paths"), py::arg("max_steps"), py::arg("seed"), "Estimate a reachability probability with RESTART importance splitting");
+    m.def("_simulate_fixed_effort", &simulateFixedEffort, py::arg("model"), py::arg("importance"), py::arg("thresholds"), py::arg("target_states"), py::arg("avoid_states"), py::arg("scheduler"), py::arg("effort"), py::arg("max_steps"), py::arg("seed"), "Estimate a reachability probability with fixed effort importance splitting");
+}
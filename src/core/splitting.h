@@ -0,0 +1,5 @@
+#pragma once
+
+#include "common.h"
+
+void define_importance_splitting(py::module& m);
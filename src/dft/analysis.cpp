@@ -3,8 +3,11 @@
 #include "storm-dft/parser/DFTJsonParser.h"
 #include "storm-dft/builder/ExplicitDFTModelBuilder.h"
 #include "storm-dft/storage/DftSymmetries.h"
+#include "src/core/progress.h"
 
 template<typename ValueType> using ExplicitDFTModelBuilder = storm::dft::builder::ExplicitDFTModelBuilder<ValueType>;
+// The polynomial cache of carl is not thread-safe, so the parametric analysis keeps the GIL
+template<typename ValueType> using ReleaseGil = typename std::conditional<std::is_same<ValueType, double>::value, py::call_guard<py::gil_scoped_release>, py::call_guard<>>::type;
 
 // Thin wrapper for DFT analysis
 template<typename ValueType>
@@ -20,11 +23,21 @@ std::vector<ValueType> analyzeDFT(storm::dft::storage::DFT<ValueType> const& dft
 
 // Thin wrapper for building state space from DFT
 template<typename ValueType>
-std::shared_ptr<storm::models::sparse::Model<ValueType>> buildModel(storm::dft::storage::DFT<ValueType> const& dft, storm::dft::storage::DftSymmetries const& symmetries, storm::dft::utility::RelevantEvents const& relevantEvents, bool allowDCForRelevant) {
+std::shared_ptr<storm::models::sparse::Model<ValueType>> buildModel(storm::dft::storage::DFT<ValueType> const& dft, storm::dft::storage::DftSymmetries const& symmetries, storm::dft::utility::RelevantEvents const& relevantEvents, bool allowDCForRelevant, std::shared_ptr<BuildProgress> const& progress) {
+    BuildProgressScope scope(progress);
     dft.setRelevantEvents(relevantEvents, allowDCForRelevant);
     storm::dft::builder::ExplicitDFTModelBuilder<ValueType> builder(dft, symmetries);
     builder.buildModel(0, 0.0);
-    return builder.getModel();
+    return scope.done(builder.getModel());
+}
+
+// Build state space with progress reporting
+template<typename ValueType>
+void buildWithExplicitDFTModelBuilder(ExplicitDFTModelBuilder<ValueType>& builder, size_t iteration, double approximationThreshold, storm::dft::builder::ApproximationHeuristic approximationHeuristic, std::shared_ptr<BuildProgress> const& progress) {
+    BuildProgressScope scope(progress);
+    builder.buildModel(iteration, approximationThreshold, approximationHeuristic);
+    // The size of the model is only known when the model is retrieved
+    scope.done();
 }
 
 // Define python bindings
@@ -50,14 +63,14 @@ void define_analysis_typed(py::module& m, std::string const& vt_suffix) {
 
     py::class_<ExplicitDFTModelBuilder<ValueType>, std::shared_ptr<ExplicitDFTModelBuilder<ValueType>>>(m, ("ExplicitDFTModelBuilder"+vt_suffix).c_str(), "Builder to generate explicit model from DFT")
         .def(py::init<storm::dft::storage::DFT<ValueType> const&, storm::dft::storage::DftSymmetries const&>(), "Constructor", py::arg("dft"), py::arg("symmetries")=storm::dft::storage::DftSymmetries())
-        .def("build", &ExplicitDFTModelBuilder<ValueType>::buildModel, "Build state space of model", py::arg("iteration"), py::arg("approximation_threshold")=0.0, py::arg("approximation_heuristic")=storm::dft::builder::ApproximationHeuristic::DEPTH)
+        .def("build", &buildWithExplicitDFTModelBuilder<ValueType>, "Build state space of model", py::arg("iteration"), py::arg("approximation_threshold")=0.0, py::arg("approximation_heuristic")=storm::dft::builder::ApproximationHeuristic::DEPTH, py::arg("progress")=nullptr, ReleaseGil<ValueType>())
         .def("get_model", &ExplicitDFTModelBuilder<ValueType>::getModel, "Get complete model")
         .def("get_partial_model", &ExplicitDFTModelBuilder<ValueType>::getModelApproximation, "Get partial model", py::arg("lower_bound"), py::arg("expected_time"))
     ;
 
-    m.def(("_analyze_dft"+vt_suffix).c_str(), &analyzeDFT<ValueType>, "Analyze the DFT", py::arg("dft"), py::arg("properties"), py::arg("symred")=true, py::arg("allow_modularisation")=false, py::arg("relevant_events")=storm::dft::utility::RelevantEvents(), py::arg("allow_dc_for_relevant")=false);
+    m.def(("_analyze_dft"+vt_suffix).c_str(), &analyzeDFT<ValueType>, "Analyze the DFT", py::arg("dft"), py::arg("properties"), py::arg("symred")=true, py::arg("allow_modularisation")=false, py::arg("relevant_events")=storm::dft::utility::RelevantEvents(), py::arg("allow_dc_for_relevant")=false, ReleaseGil<ValueType>());
 
-    m.def(("_build_model"+vt_suffix).c_str(), &buildModel<ValueType>, "Build state-space model (CTMC or MA) for DFT", py::arg("dft"), py::arg("symmetries"), py::arg("relevant_events")=storm::dft::utility::RelevantEvents(), py::arg("allow_dc_for_relevant")=false);
+    m.def(("_build_model"+vt_suffix).c_str(), &buildModel<ValueType>, "Build state-space model (CTMC or MA) for DFT", py::arg("dft"), py::arg("symmetries"), py::arg("relevant_events")=storm::dft::utility::RelevantEvents(), py::arg("allow_dc_for_relevant")=false, py::arg("progress")=nullptr, ReleaseGil<ValueType>());
 
     m.def(("_transform_dft"+vt_suffix).c_str(), &storm::dft::api::applyTransformations<ValueType>, "Apply transformations on DFT", py::arg("dft"), py::arg("unique_constant_be"), py::arg("binary_fdeps"), py::arg("exponential_distributions"));
 
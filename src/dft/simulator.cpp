@@ -1,16 +1,110 @@
 #include "simulator.h"
 #include "src/helpers.h"
+#include "src/ndarray.h"
 
 #include "storm-dft/simulator/DFTTraceSimulator.h"
 #include "storm-dft/api/storm-dft.h"
 #include "storm-dft/generator/DftNextStateGenerator.h"
 
+#include <array>
+#include <exception>
+#include <limits>
+#include <random>
+#include <thread>
+
 
 template<typename ValueType> using Simulator = storm::dft::simulator::DFTTraceSimulator<ValueType>;
 typedef storm::dft::storage::DFTStateGenerationInfo DFTStateInfo;
 typedef boost::mt19937 RandomGenerator;
 
 
+/*!
+ * Simulate a complete trace and return the simulation result together with the failure time of the top level element.
+ * The failure time is infinity if the top level element did not fail within the time bound.
+ */
+std::pair<storm::dft::simulator::SimulationResult, double> simulateTraceWithTime(Simulator<double>& simulator, storm::dft::storage::DFT<double> const& dft, double timebound) {
+    simulator.resetToInitial();
+    double time = 0;
+    if (simulator.getCurrentState()->hasFailed(dft.getTopLevelIndex())) {
+        return {storm::dft::simulator::SimulationResult::SUCCESSFUL, time};
+    }
+    while (time <= timebound) {
+        auto [result, stepTime] = simulator.randomStep();
+        if (result != storm::dft::simulator::SimulationResult::SUCCESSFUL) {
+            return {result, std::numeric_limits<double>::infinity()};
+        }
+        time += stepTime;
+        if (simulator.getCurrentState()->hasFailed(dft.getTopLevelIndex())) {
+            if (time <= timebound) {
+                return {storm::dft::simulator::SimulationResult::SUCCESSFUL, time};
+            }
+            break;
+        }
+    }
+    return {storm::dft::simulator::SimulationResult::UNSUCCESSFUL, std::numeric_limits<double>::infinity()};
+}
+
+/*!
+ * Simulate traces in parallel.
+ * Each worker uses its own simulator (and thereby its own DFT state) and an independent random generator derived from the seed.
+ *
+ * @return Tuple of the number of traces which led to a failure within the time bound and the failure times (or None).
+ */
+py::tuple simulateTracesParallel(storm::dft::storage::DFT<double> const& dft, DFTStateInfo const& stateGenerationInfo, double timebound, uint64_t nrTraces, uint64_t threads, uint64_t seed, bool recordTimes) {
+    std::vector<double> failureTimes(recordTimes ? nrTraces : 0);
+    uint64_t failures = 0;
+    {
+        py::gil_scoped_release release;
+        if (threads == 0) {
+            threads = std::max<uint64_t>(1, std::thread::hardware_concurrency());
+        }
+        threads = std::max<uint64_t>(1, std::min(threads, nrTraces));
+        uint64_t chunkSize = (nrTraces + threads - 1) / threads;
+        std::vector<uint64_t> workerFailures(threads, 0);
+        std::vector<std::exception_ptr> errors(threads);
+        std::vector<std::thread> workers;
+        for (uint64_t worker = 0; worker < threads; ++worker) {
+            workers.emplace_back([&, worker]() {
+                try {
+                    // Derive an independent stream for each worker
+                    std::seed_seq sequence{static_cast<uint32_t>(seed), static_cast<uint32_t>(seed >> 32), static_cast<uint32_t>(worker)};
+                    std::array<uint32_t, 1> workerSeed;
+                    sequence.generate(workerSeed.begin(), workerSeed.end());
+                    RandomGenerator generator(workerSeed[0]);
+                    Simulator<double> simulator(dft, stateGenerationInfo, generator);
+                    uint64_t end = std::min(nrTraces, (worker + 1) * chunkSize);
+                    for (uint64_t trace = worker * chunkSize; trace < end; ++trace) {
+                        auto [result, time] = simulateTraceWithTime(simulator, dft, timebound);
+                        if (result == storm::dft::simulator::SimulationResult::SUCCESSFUL) {
+                            ++workerFailures[worker];
+                        }
+                        if (recordTimes) {
+                            failureTimes[trace] = time;
+                        }
+                    }
+                } catch (...) {
+                    errors[worker] = std::current_exception();
+                }
+            });
+        }
+        for (auto& thread : workers) {
+            thread.join();
+        }
+        for (auto const& error : errors) {
+            if (error) {
+                std::rethrow_exception(error);
+            }
+        }
+        for (uint64_t count : workerFailures) {
+            failures += count;
+        }
+    }
+    if (recordTimes) {
+        return py::make_tuple(failures, moveToArray(std::move(failureTimes)));
+    }
+    return py::make_tuple(failures, py::none());
+}
+
 void define_simulator(py::module& m) {
 
     // Simulation result
@@ -34,7 +128,8 @@ template<typename ValueType>
 void define_simulator_typed(py::module& m, std::string const& vt_suffix) {
 
     // Simulator for DFTs
-    py::class_<Simulator<ValueType>, std::shared_ptr<Simulator<ValueType>>>(m, ("DFTSimulator"+vt_suffix).c_str(), "Simulator for DFT traces")
+    py::class_<Simulator<ValueType>, std::shared_ptr<Simulator<ValueType>>> simulator(m, ("DFTSimulator"+vt_suffix).c_str(), "Simulator for DFT traces");
+    simulator
         .def(py::init<storm::dft::storage::DFT<ValueType> const&, DFTStateInfo const&, RandomGenerator&>(), py::keep_alive<1,2>(), py::keep_alive<1, 3>(), py::keep_alive<1,4>(), py::arg("dft"), py::arg("state_generation_info"), py::arg("generator"), "Create Simulator")
         .def("reset", &Simulator<ValueType>::resetToInitial, "Reset to initial state")
         .def("current", &Simulator<ValueType>::getCurrentState, "Get current state")
@@ -42,6 +137,9 @@ void define_simulator_typed(py::module& m, std::string const& vt_suffix) {
         .def("random_step", &Simulator<ValueType>::randomStep, "Perform random simulation step. Returns a tuple of the simulation result and the time which progressed during this step.")
         .def("simulate_trace", &Simulator<ValueType>::simulateCompleteTrace, py::arg("timebound"), "Simulate complete trace for given timebound")
     ;
+    if constexpr (std::is_same_v<ValueType, double>) {
+        simulator.def_static("_simulate_traces_parallel", &simulateTracesParallel, py::arg("dft"), py::arg("state_generation_info"), py::arg("timebound"), py::arg("nr_traces"), py::arg("threads"), py::arg("seed"), py::arg("record_times"), "Simulate traces in parallel. Returns the number of traces which led to a failure and optionally the failure times");
+    }
 }
 
 
@@ -10,6 +10,8 @@
 #include "core/environment.h"
 #include "core/transformation.h"
 #include "core/simulator.h"
+#include "core/splitting.h"
+#include "core/progress.h"
 
 PYBIND11_MODULE(core, m) {
     m.doc() = "core";
@@ -24,6 +26,7 @@ PYBIND11_MODULE(core, m) {
 
     define_property(m);
     define_parse(m);
+    define_build_progress(m);
     define_build(m);
     define_optimality_type(m);
     define_export(m);
@@ -37,8 +40,10 @@ PYBIND11_MODULE(core, m) {
     define_transformation_typed<double>(m, "Double");
     define_transformation_typed<storm::RationalNumber>(m, "Exact");
     define_transformation_typed<storm::RationalFunction>(m, "RatFunc");
+    define_choice_name_index(m);
     define_sparse_model_simulator<double>(m, "Double");
     define_sparse_model_simulator<storm::RationalNumber>(m, "Exact");
     define_prism_program_simulator<double>(m, "Double");
+    define_importance_splitting(m);
 
 }
@@ -16,6 +16,7 @@
 #include "storage/labeling.h"
 #include "storage/expressions.h"
 #include "storage/geometry.h"
+#include "storage/serialization.h"
 
 #include "storm/storage/dd/DdType.h"
 
@@ -36,6 +37,7 @@ PYBIND11_MODULE(storage, m) {
     define_sparse_model<storm::RationalNumber>(m, "Exact");
     define_sparse_model<storm::Interval>(m, "Interval");
     define_sparse_parametric_model(m);
+    define_sparse_model_serialization(m);
     define_statevaluation(m);
     define_simplevaluation(m);
     define_sparse_matrix<double>(m, "");
@@ -0,0 +1,49 @@
+#pragma once
+
+#include "common.h"
+
+#include <pybind11/numpy.h>
+
+#include <cassert>
+
+/**
+ * Create a read-only NumPy view on memory which is owned by the given Python object.
+ * The owner is kept alive as long as the view exists.
+ */
+template<typename T>
+py::array_t<T> readOnlyView(T const* data, py::ssize_t size, py::ssize_t stride, py::handle owner) {
+    py::array_t<T> result({size}, {stride}, size > 0 ? data : nullptr, owner);
+    py::detail::array_proxy(result.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+    return result;
+}
+
+/**
+ * Create a read-only NumPy view on a vector which is owned by the given Python object.
+ */
+template<typename T>
+py::array_t<T> readOnlyView(std::vector<T> const& vector, py::handle owner) {
+    return readOnlyView(vector.data(), static_cast<py::ssize_t>(vector.size()), static_cast<py::ssize_t>(sizeof(T)), owner);
+}
+
+/**
+ * Move a vector into a NumPy array without copying the data.
+ * The array takes ownership of the vector.
+ */
+template<typename T>
+py::array_t<T> moveToArray(std::vector<T>&& vector) {
+    auto owned = new std::vector<T>(std::move(vector));
+    py::capsule owner(owned, [](void* ptr) { delete static_cast<std::vector<T>*>(ptr); });
+    return py::array_t<T>({static_cast<py::ssize_t>(owned->size())}, {static_cast<py::ssize_t>(sizeof(T))}, owned->data(), owner);
+}
+
+/**
+ * Move a vector containing a row-major matrix into a two-dimensional NumPy array without copying the data.
+ * The array takes ownership of the vector.
+ */
+template<typename T>
+py::array_t<T> moveToArray(std::vector<T>&& vector, py::ssize_t rows, py::ssize_t columns) {
+    assert(static_cast<py::ssize_t>(vector.size()) == rows * columns);
+    auto owned = new std::vector<T>(std::move(vector));
+    py::capsule owner(owned, [](void* ptr) { delete static_cast<std::vector<T>*>(ptr); });
+    return py::array_t<T>({rows, columns}, {static_cast<py::ssize_t>(sizeof(T)) * columns, static_cast<py::ssize_t>(sizeof(T))}, owned->data(), owner);
+}
@@ -2,6 +2,7 @@
 #include "storm/models/sparse/Model.h"
 #include "storm-pars/modelchecker/instantiation/SparseDtmcInstantiationModelChecker.h"
 #include "storm-pars/modelchecker/instantiation/SparseCtmcInstantiationModelChecker.h"
+#include "storm-pars/modelchecker/instantiation/SparseMdpInstantiationModelChecker.h"
 #include "storm/models/sparse/StandardRewardModel.h"
 
 
@@ -19,6 +20,18 @@
 #include "storm/utility/vector.h"
 #include "storm/utility/graph.h"
 #include "storm/utility/NumberTraits.h"
+#include "storm/exceptions/InvalidArgumentException.h"
+#include "storm/exceptions/InvalidOperationException.h"
+#include "storm/exceptions/InvalidStateException.h"
+
+#include "src/ndarray.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <exception>
+#include <numeric>
+#include <thread>
 
 template<typename ValueType> using Model = storm::models::sparse::Model<ValueType>;
 template<typename ValueType> using Dtmc = storm::models::sparse::Dtmc<ValueType>;
@@ -28,6 +41,186 @@ template<typename ValueType> using MarkovAutomaton = storm::models::sparse::Mark
 
 using namespace storm::modelchecker;
 
+typedef storm::utility::parametric::Valuation<storm::RationalFunction> Valuation;
+typedef py::array_t<double, py::array::c_style | py::array::forcecast> ValuationArray;
+
+/*!
+ * Order the given rows such that neighbouring points are checked in sequence.
+ * The rows are sorted lexicographically, but the direction alternates for each new value in the previous column (boustrophedon order).
+ * For grid sweeps, consecutive points thereby differ in only one parameter.
+ */
+template<typename ValuationData>
+void sweepOrder(ValuationData const& data, std::vector<uint64_t>::iterator begin, std::vector<uint64_t>::iterator end, py::ssize_t column, bool descending) {
+    if (column >= data.shape(1) || end - begin < 2) {
+        return;
+    }
+    auto before = [&](uint64_t first, uint64_t second) {
+        return descending ? data(first, column) > data(second, column) : data(first, column) < data(second, column);
+    };
+    std::stable_sort(begin, end, before);
+    bool reverse = descending;
+    while (begin != end) {
+        // The group ends at the first row ordered after the first row of the group, so each group contains at least one row
+        uint64_t first = *begin;
+        auto groupEnd = std::find_if(begin, end, [&](uint64_t row) { return before(first, row); });
+        sweepOrder(data, begin, groupEnd, column + 1, reverse);
+        reverse = !reverse;
+        begin = groupEnd;
+    }
+}
+
+/*!
+ * Instantiation checker which can additionally check a batch of instantiations in parallel.
+ * Each worker thread uses its own instantiation checker and thereby its own copy of the instantiated model.
+ * The checkers are created before the workers are started as creating them is not thread-safe.
+ *
+ * With warm starts enabled (default), consecutive checks reuse the previous result (and scheduler) as hints
+ * and batches are checked in sweep order. Without warm starts, each instantiation is checked from scratch.
+ */
+template<typename InstantiationCheckerType, typename SparseModelType>
+class BatchInstantiationChecker : public InstantiationCheckerType {
+public:
+    explicit BatchInstantiationChecker(SparseModelType const& parametricModel) : InstantiationCheckerType(parametricModel), parametricModel(parametricModel) {
+        // Intentionally left empty
+    }
+
+    void specifyFormula(CheckTask<storm::logic::Formula, storm::RationalFunction> const& checkTask) {
+        InstantiationCheckerType::specifyFormula(checkTask);
+        hasChecked = false;
+        // The check task only references the formula, so we keep the formula alive ourselves.
+        formula = checkTask.getFormula().asSharedPointer();
+        parametricCheckTask = std::make_unique<CheckTask<storm::logic::Formula, storm::RationalFunction>>(checkTask.substituteFormula(*formula));
+    }
+
+    void setInstantiationsAreGraphPreserving(bool value) {
+        InstantiationCheckerType::setInstantiationsAreGraphPreserving(value);
+        graphPreserving = value;
+    }
+
+    void setWarmStart(bool value) {
+        warmStart = value;
+    }
+
+    bool isWarmStart() const {
+        return warmStart;
+    }
+
+    /*!
+     * Number of checks which were warm started from the result of a previous check.
+     */
+    uint64_t getNumberOfWarmStarts() const {
+        return warmStarts;
+    }
+
+    std::unique_ptr<CheckResult> checkInstantiation(storm::Environment const& env, Valuation const& valuation) {
+        if (!warmStart && parametricCheckTask) {
+            // Specifying the formula again discards the hints from previous checks.
+            InstantiationCheckerType::specifyFormula(*parametricCheckTask);
+        } else if (warmStart && hasChecked) {
+            ++warmStarts;
+        }
+        auto result = this->check(env, valuation);
+        hasChecked = true;
+        return result;
+    }
+
+    /*!
+     * Check all given instantiations and return the results for the (first) initial state.
+     *
+     * @param parameters Parameters corresponding to the columns of the valuations.
+     * @param valuations Matrix with one instantiation per row.
+     * @param threads Number of worker threads. If 0, the number of hardware threads is used.
+     */
+    py::array_t<double> checkBatch(storm::Environment const& env, std::vector<storm::RationalFunctionVariable> const& parameters, ValuationArray const& valuations, uint64_t threads) {
+        STORM_LOG_THROW(parametricCheckTask, storm::exceptions::InvalidStateException, "Checking requires a formula to be specified.");
+        STORM_LOG_THROW(valuations.ndim() == 2, storm::exceptions::InvalidArgumentException, "Valuations must be given as a two-dimensional array.");
+        auto data = valuations.unchecked<2>();
+        STORM_LOG_THROW(data.shape(1) == static_cast<py::ssize_t>(parameters.size()), storm::exceptions::InvalidArgumentException, "Number of columns " << data.shape(1) << " does not match number of parameters " << parameters.size() << ".");
+
+        uint64_t nrInstantiations = data.shape(0);
+        std::vector<Valuation> instantiations(nrInstantiations);
+        for (uint64_t row = 0; row < nrInstantiations; ++row) {
+            for (uint64_t column = 0; column < parameters.size(); ++column) {
+                STORM_LOG_THROW(std::isfinite(data(row, column)), storm::exceptions::InvalidArgumentException, "Value " << data(row, column) << " of parameter " << parameters[column] << " in row " << row << " is not finite.");
+                instantiations[row][parameters[column]] = storm::utility::convertNumber<storm::RationalFunctionCoefficient>(data(row, column));
+            }
+        }
+
+        if (threads == 0) {
+            threads = std::max<uint64_t>(1, std::thread::hardware_concurrency());
+        }
+        threads = std::max<uint64_t>(1, std::min(threads, nrInstantiations));
+        // The polynomial cache of carl is not thread-safe. Copying the parametric model into the checkers (and destroying them again) modifies the cache,
+        // so the checkers are created and destroyed here, the workers only evaluate the functions for the already converted valuations.
+        std::vector<std::unique_ptr<InstantiationCheckerType>> checkers;
+        for (uint64_t worker = 0; worker < threads; ++worker) {
+            checkers.push_back(std::make_unique<InstantiationCheckerType>(parametricModel));
+            checkers.back()->setInstantiationsAreGraphPreserving(graphPreserving);
+        }
+
+        std::vector<double> results(nrInstantiations);
+        {
+            py::gil_scoped_release release;
+            std::vector<uint64_t> order(nrInstantiations);
+            std::iota(order.begin(), order.end(), 0);
+            if (warmStart) {
+                sweepOrder(data, order.begin(), order.end(), 0, false);
+            }
+            uint64_t chunkSize = (nrInstantiations + threads - 1) / threads;
+            std::vector<std::exception_ptr> errors(threads);
+            std::vector<std::thread> workers;
+            for (uint64_t worker = 0; worker < threads; ++worker) {
+                workers.emplace_back([&, worker]() {
+                    try {
+                        checkRange(*checkers[worker], env, instantiations, order, results, worker * chunkSize, std::min(nrInstantiations, (worker + 1) * chunkSize));
+                    } catch (...) {
+                        errors[worker] = std::current_exception();
+                    }
+                });
+            }
+            for (auto& thread : workers) {
+                thread.join();
+            }
+            for (auto const& error : errors) {
+                if (error) {
+                    std::rethrow_exception(error);
+                }
+            }
+        }
+        return moveToArray(std::move(results));
+    }
+
+private:
+    void checkRange(InstantiationCheckerType& checker, storm::Environment const& env, std::vector<Valuation> const& instantiations, std::vector<uint64_t> const& order, std::vector<double>& results, uint64_t begin, uint64_t end) {
+        if (begin >= end) {
+            return;
+        }
+        uint64_t initialState = *parametricModel.getInitialStates().begin();
+        for (uint64_t position = begin; position < end; ++position) {
+            if (!warmStart || position == begin) {
+                checker.specifyFormula(*parametricCheckTask);
+            } else {
+                ++warmStarts;
+            }
+            uint64_t index = order[position];
+            auto result = checker.check(env, instantiations[index]);
+            STORM_LOG_THROW(result->isExplicitQuantitativeCheckResult(), storm::exceptions::InvalidOperationException, "Batch checking requires a quantitative formula.");
+            results[index] = result->template asExplicitQuantitativeCheckResult<double>()[initialState];
+        }
+    }
+
+    SparseModelType const& parametricModel;
+    std::shared_ptr<storm::logic::Formula const> formula;
+    std::unique_ptr<CheckTask<storm::logic::Formula, storm::RationalFunction>> parametricCheckTask;
+    bool graphPreserving = false;
+    bool warmStart = true;
+    bool hasChecked = false;
+    std::atomic<uint64_t> warmStarts{0};
+};
+
+typedef BatchInstantiationChecker<SparseDtmcInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>, Dtmc<storm::RationalFunction>> PDtmcInstantiationChecker;
+typedef BatchInstantiationChecker<SparseMdpInstantiationModelChecker<Mdp<storm::RationalFunction>, double>, Mdp<storm::RationalFunction>> PMdpInstantiationChecker;
+
 // Model instantiator
 void define_model_instantiator(py::module& m) {
     py::class_<storm::utility::ModelInstantiator<Dtmc<storm::RationalFunction>, Dtmc<double>>>(m, "PDtmcInstantiator", "Instantiate PDTMCs to DTMCs")
@@ -76,10 +269,23 @@ void define_model_instantiation_checker(py::module& m) {
     py::class_<SparseInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>, std::shared_ptr<SparseInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>>> bpdtmcinstchecker(m, "_PDtmcInstantiationCheckerBase", "Instantiate pDTMCs to DTMCs and immediately check (base)");
     bpdtmcinstchecker.def("specify_formula", &SparseInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>::specifyFormula, "check_task"_a);
 
-    py::class_<SparseDtmcInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>, std::shared_ptr<SparseDtmcInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>>> (m, "PDtmcInstantiationChecker", "Instantiate pDTMCs to DTMCs and immediately check", bpdtmcinstchecker)
-        .def(py::init<Dtmc<storm::RationalFunction>>(), "parametric model"_a)
-        .def("check", [](SparseDtmcInstantiationModelChecker<Dtmc<storm::RationalFunction>, double> &sdimc, storm::Environment const& env, storm::utility::parametric::Valuation<storm::RationalFunction> const& val) -> std::shared_ptr<CheckResult> {return sdimc.check(env,val);}, "env"_a, "instantiation"_a)
-        .def("set_graph_preserving", &SparseDtmcInstantiationModelChecker<Dtmc<storm::RationalFunction>, double>::setInstantiationsAreGraphPreserving, "value"_a)
+    py::class_<PDtmcInstantiationChecker, std::shared_ptr<PDtmcInstantiationChecker>> (m, "PDtmcInstantiationChecker", "Instantiate pDTMCs to DTMCs and immediately check", bpdtmcinstchecker)
+        .def(py::init<Dtmc<storm::RationalFunction> const&>(), "parametric model"_a, py::keep_alive<1, 2>())
+        .def("specify_formula", &PDtmcInstantiationChecker::specifyFormula, "check_task"_a)
+        .def("check", [](PDtmcInstantiationChecker &sdimc, storm::Environment const& env, storm::utility::parametric::Valuation<storm::RationalFunction> const& val) -> std::shared_ptr<CheckResult> {return sdimc.checkInstantiation(env,val);}, "env"_a, "instantiation"_a)
+        .def("check_batch", &PDtmcInstantiationChecker::checkBatch, R"dox(
+        Check a batch of instantiations in parallel.
+
+        :param env: Environment
+        :param parameters: Parameters in the order of the columns of the valuations
+        :param valuations: NumPy matrix with one instantiation per row
+        :param threads: Number of worker threads, 0 uses all hardware threads
+        :return: NumPy array with the result in the initial state for each instantiation (in the order of the given valuations)
+        )dox", "env"_a, "parameters"_a, "valuations"_a, "threads"_a = 0)
+        .def("set_graph_preserving", &PDtmcInstantiationChecker::setInstantiationsAreGraphPreserving, "value"_a)
+        .def("set_warm_start", &PDtmcInstantiationChecker::setWarmStart, "Reuse results and schedulers of previous checks as hints and check batches in sweep order", "value"_a)
+        .def_property_readonly("warm_start", &PDtmcInstantiationChecker::isWarmStart, "Whether warm starts are enabled")
+        .def_property_readonly("nr_warm_starts", &PDtmcInstantiationChecker::getNumberOfWarmStarts, "Number of checks which were warm started from the result of a previous check")
     ;
 
     py::class_<SparseInstantiationModelChecker<Dtmc<storm::RationalFunction>, storm::RationalNumber>, std::shared_ptr<SparseInstantiationModelChecker<Dtmc<storm::RationalFunction>, storm::RationalNumber>>> bpdtmcexactinstchecker(m, "_PDtmcExactInstantiationCheckerBase", "Instantiate pDTMCs to exact DTMCs and immediately check (base)");
@@ -95,10 +301,23 @@ void define_model_instantiation_checker(py::module& m) {
     py::class_<SparseInstantiationModelChecker<Mdp<storm::RationalFunction>, double>, std::shared_ptr<SparseInstantiationModelChecker<Mdp<storm::RationalFunction>, double>>> bpmdpinstchecker(m, "_PMdpInstantiationCheckerBase", "Instantiate pMDPs to MDPs and immediately check (base)");
     bpmdpinstchecker.def("specify_formula", &SparseInstantiationModelChecker<Mdp<storm::RationalFunction>, double>::specifyFormula, "check_task"_a);
 
-    py::class_<SparseMdpInstantiationModelChecker<Mdp<storm::RationalFunction>, double>, std::shared_ptr<SparseMdpInstantiationModelChecker<Mdp<storm::RationalFunction>, double>>> (m, "PMdpInstantiationChecker", "Instantiate PMDP to MDPs and immediately check", bpmdpinstchecker)
-        .def(py::init<Mdp<storm::RationalFunction>>(), "parametric model"_a)
-        .def("check", [](SparseMdpInstantiationModelChecker<Mdp<storm::RationalFunction>, double> &sdimc, storm::Environment const& env, storm::utility::parametric::Valuation<storm::RationalFunction> const& val) -> std::shared_ptr<CheckResult> {return sdimc.check(env,val);}, "env"_a, "instantiation"_a)
-        .def("set_graph_preserving", &SparseMdpInstantiationModelChecker<Mdp<storm::RationalFunction>, double>::setInstantiationsAreGraphPreserving, "value"_a)
+    py::class_<PMdpInstantiationChecker, std::shared_ptr<PMdpInstantiationChecker>> (m, "PMdpInstantiationChecker", "Instantiate PMDP to MDPs and immediately check", bpmdpinstchecker)
+        .def(py::init<Mdp<storm::RationalFunction> const&>(), "parametric model"_a, py::keep_alive<1, 2>())
+        .def("specify_formula", &PMdpInstantiationChecker::specifyFormula, "check_task"_a)
+        .def("check", [](PMdpInstantiationChecker &sdimc, storm::Environment const& env, storm::utility::parametric::Valuation<storm::RationalFunction> const& val) -> std::shared_ptr<CheckResult> {return sdimc.checkInstantiation(env,val);}, "env"_a, "instantiation"_a)
+        .def("check_batch", &PMdpInstantiationChecker::checkBatch, R"dox(
+        Check a batch of instantiations in parallel.
+
+        :param env: Environment
+        :param parameters: Parameters in the order of the columns of the valuations
+        :param valuations: NumPy matrix with one instantiation per row
+        :param threads: Number of worker threads, 0 uses all hardware threads
+        :return: NumPy array with the result in the initial state for each instantiation (in the order of the given valuations)
+        )dox", "env"_a, "parameters"_a, "valuations"_a, "threads"_a = 0)
+        .def("set_graph_preserving", &PMdpInstantiationChecker::setInstantiationsAreGraphPreserving, "value"_a)
+        .def("set_warm_start", &PMdpInstantiationChecker::setWarmStart, "Reuse results and schedulers of previous checks as hints and check batches in sweep order", "value"_a)
+        .def_property_readonly("warm_start", &PMdpInstantiationChecker::isWarmStart, "Whether warm starts are enabled")
+        .def_property_readonly("nr_warm_starts", &PMdpInstantiationChecker::getNumberOfWarmStarts, "Number of checks which were warm started from the result of a previous check")
     ;
 
     py::class_<SparseInstantiationModelChecker<Mdp<storm::RationalFunction>, storm::RationalNumber>, std::shared_ptr<SparseInstantiationModelChecker<Mdp<storm::RationalFunction>, storm::RationalNumber>>> bpmdpexactinstchecker(m, "_PMdpExactInstantiationCheckerBase", "Instantiate pMDPs to exact MDPs and immediately check (base)");
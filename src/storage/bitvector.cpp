@@ -1,6 +1,7 @@
 #include "bitvector.h"
 #include "storm/storage/BitVector.h"
 #include "src/helpers.h"
+#include "src/ndarray.h"
 
 void define_bitvector(py::module& m) {
     using BitVector = storm::storage::BitVector;
@@ -34,6 +35,46 @@ void define_bitvector(py::module& m) {
         .def("__iter__",  [](const BitVector &b) { return py::make_iterator(b.begin(), b.end()); },
                               py::keep_alive<0, 1>() /* Essential: keep object alive while iterator exists */)
 
+        .def_static("from_numpy", [](py::array_t<bool, py::array::c_style | py::array::forcecast> const& array) {
+                auto data = array.unchecked<1>();
+                BitVector result(data.shape(0));
+                for (py::ssize_t i = 0; i < data.shape(0); ++i) {
+                    if (data(i)) {
+                        result.set(i);
+                    }
+                }
+                return result;
+            }, py::arg("array"), "Create bit vector from one-dimensional NumPy array (of booleans)")
+        .def("to_numpy", [](BitVector const& b) {
+                py::array_t<bool> result(b.size());
+                std::fill(result.mutable_data(), result.mutable_data() + b.size(), false);
+                auto data = result.mutable_unchecked<1>();
+                for (auto index : b) {
+                    data(index) = true;
+                }
+                return result;
+            }, "Get bit vector as NumPy array of booleans")
+        .def("set_indices", [](BitVector const& b) {
+                py::array_t<uint64_t> result(b.getNumberOfSetBits());
+                auto data = result.mutable_unchecked<1>();
+                py::ssize_t i = 0;
+                for (auto index : b) {
+                    data(i++) = index;
+                }
+                return result;
+            }, "Get indices of all set bits as NumPy array")
+        .def("to_buckets", [](BitVector const& b) {
+                py::array_t<uint64_t> result((b.size() + 63) / 64);
+                auto data = result.mutable_unchecked<1>();
+                for (py::ssize_t bucket = 0; bucket < data.shape(0); ++bucket) {
+                    uint64_t start = bucket * 64;
+                    uint64_t length = std::min<uint64_t>(64, b.size() - start);
+                    // Pad the last bucket such that bits are always aligned at the most significant bit
+                    data(bucket) = b.getAsInt(start, length) << (64 - length);
+                }
+                return result;
+            }, "Get the 64-bit buckets as NumPy array of unsigned integers. Bit i is stored in bucket i/64 at position 63-(i%64), i.e., counted from the most significant bit.")
+
         .def("store_as_string", [](const BitVector& bv) {std::stringstream strs; bv.store(strs); return strs.str();})
         .def_static("load_from_string", &BitVector::load, py::arg("description"))
         .def(py::self == py::self)
@@ -3,7 +3,9 @@
 #include "storm/storage/SparseMatrix.h"
 #include "storm/storage/BitVector.h"
 #include "storm/utility/graph.h"
+#include "storm/exceptions/InvalidArgumentException.h"
 #include "src/helpers.h"
+#include "src/ndarray.h"
 
 template<typename ValueType> using SparseMatrix = storm::storage::SparseMatrix<ValueType>;
 template<typename ValueType> using SparseMatrixBuilder = storm::storage::SparseMatrixBuilder<ValueType>;
@@ -11,6 +13,67 @@ template<typename ValueType> using entry_index = typename storm::storage::Sparse
 template<typename ValueType> using MatrixEntry = storm::storage::MatrixEntry<entry_index<ValueType>, ValueType>;
 using RationalFunction = storm::RationalFunction;
 using row_index = unsigned int;
+using IndexArray = py::array_t<uint64_t, py::array::c_style | py::array::forcecast>;
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+// Add all entries given in coordinate format with one native call.
+// Values can either be a vector or an unchecked NumPy proxy.
+// Duplicate (row, column) pairs are rejected before any entry is added.
+template<typename ValueType, typename Values>
+void addEntries(SparseMatrixBuilder<ValueType>& builder, IndexArray const& rows, IndexArray const& columns, Values const& values, std::vector<uint64_t> const& rowGroupIndices) {
+    auto rowData = rows.unchecked<1>();
+    auto columnData = columns.unchecked<1>();
+    STORM_LOG_THROW(columnData.shape(0) == rowData.shape(0) && static_cast<py::ssize_t>(values.size()) == rowData.shape(0), storm::exceptions::InvalidArgumentException, "Rows, columns and values must have the same length.");
+
+    auto add = [&]() {
+        for (py::ssize_t i = 1; i < rowData.shape(0); ++i) {
+            STORM_LOG_THROW(rowData(i) != rowData(i - 1) || columnData(i) != columnData(i - 1), storm::exceptions::InvalidArgumentException,
+                            "Duplicate entry at row " << rowData(i) << " and column " << columnData(i) << ".");
+        }
+        size_t nextRowGroup = 0;
+        for (py::ssize_t i = 0; i < rowData.shape(0); ++i) {
+            // Start all row groups up to the current row
+            while (nextRowGroup < rowGroupIndices.size() && rowGroupIndices[nextRowGroup] <= rowData(i)) {
+                builder.newRowGroup(rowGroupIndices[nextRowGroup]);
+                ++nextRowGroup;
+            }
+            builder.addNextValue(rowData(i), columnData(i), values[i]);
+        }
+        // Start remaining (empty) row groups
+        for (; nextRowGroup < rowGroupIndices.size(); ++nextRowGroup) {
+            builder.newRowGroup(rowGroupIndices[nextRowGroup]);
+        }
+    };
+    if constexpr (std::is_same_v<ValueType, double>) {
+        py::gil_scoped_release release;
+        add();
+    } else {
+        // Copying rational functions uses the global polynomial cache of carl, which requires the GIL
+        add();
+    }
+}
+
+// CSR representation of a matrix over doubles as NumPy arrays.
+// Columns, values and row groups are read-only views on the matrix memory, only the row pointers are computed.
+py::tuple getCsrArrays(py::object const& pyMatrix) {
+    auto const& matrix = pyMatrix.cast<SparseMatrix<double> const&>();
+    py::ssize_t nrEntries = matrix.end() - matrix.begin();
+
+    py::array_t<entry_index<double>> rowIndications(static_cast<py::ssize_t>(matrix.getRowCount() + 1));
+    auto rowData = rowIndications.mutable_unchecked<1>();
+    for (entry_index<double> row = 0; row < matrix.getRowCount(); ++row) {
+        rowData(row) = matrix.begin(row) - matrix.begin();
+    }
+    rowData(matrix.getRowCount()) = nrEntries;
+
+    // Columns and values are interleaved in the matrix entries, therefore the views are strided
+    MatrixEntry<double> const* entries = nrEntries > 0 ? &*matrix.begin() : nullptr;
+    py::ssize_t stride = sizeof(MatrixEntry<double>);
+    auto columns = readOnlyView(nrEntries > 0 ? &entries->getColumn() : nullptr, nrEntries, stride, pyMatrix);
+    auto values = readOnlyView(nrEntries > 0 ? &entries->getValue() : nullptr, nrEntries, stride, pyMatrix);
+    auto rowGroups = readOnlyView(matrix.getRowGroupIndices(), pyMatrix);
+    return py::make_tuple(rowIndications, columns, values, rowGroups);
+}
 
 void define_sparse_matrix_nt(py::module& m) {
     m.def("_topological_sort_double", [](SparseMatrix<double>& matrix, std::vector<uint64_t> initial) { return storm::utility::graph::getTopologicalSort(matrix, initial); }, "matrix"_a, "initial"_a,  "get topological sort w.r.t. a transition matrix");
@@ -49,6 +112,27 @@ void define_sparse_matrix(py::module& m, std::string const& vtSuffix) {
               :param double value: The value that is to be set at the specified row and column
             )dox", py::arg("row"), py::arg("column"), py::arg("value"))
 
+            .def("add_entries", [](SparseMatrixBuilder<ValueType>& builder, IndexArray const& rows, IndexArray const& columns, std::conditional_t<std::is_same_v<ValueType, double>, DoubleArray, std::vector<ValueType>> const& values, std::vector<uint64_t> const& rowGroupIndices) {
+                if constexpr (std::is_same_v<ValueType, double>) {
+                    addEntries(builder, rows, columns, values.template unchecked<1>(), rowGroupIndices);
+                } else {
+                    addEntries(builder, rows, columns, values, rowGroupIndices);
+                }
+            }, R"dox(
+
+              Adds all given entries to the matrix with a single call. Entry i is set at row rows[i] and column columns[i]
+              to value values[i].
+
+              Note: as for add_next_value(), the entries must be ordered row by row and column by column.
+              Unlike add_next_value(), each row-column-pair may only occur once, duplicates are not summed up but rejected.
+              Row groups given in row_group_indices are started before the first entry of their starting row.
+
+              :param numpy.ndarray rows: The rows of the entries
+              :param numpy.ndarray columns: The columns of the entries
+              :param values: The values of the entries, a NumPy array for double matrices and a list otherwise
+              :param List[int] row_group_indices: The starting rows of all row groups in ascending order. Only used if the builder has a custom row grouping.
+            )dox", py::arg("rows"), py::arg("columns"), py::arg("values"), py::arg("row_group_indices") = std::vector<uint64_t>())
+
             .def("new_row_group", &SparseMatrixBuilder<ValueType>::newRowGroup, py::arg("starting_row"), "Start a new row group in the matrix")
             .def("build", &SparseMatrixBuilder<ValueType>::build, py::arg("overridden_row_count") = 0, py::arg("overridden_column_count") = 0, py::arg("overridden-row_group_count") = 0, "Finalize the sparse matrix")
             .def("get_last_row", &SparseMatrixBuilder<ValueType>::getLastRow, "Get the most recently used row")
@@ -65,8 +149,8 @@ void define_sparse_matrix(py::module& m, std::string const& vtSuffix) {
     ;
 
     // SparseMatrix
-    py::class_<SparseMatrix<ValueType>>(m, (vtSuffix + "SparseMatrix").c_str(), "Sparse matrix")
-        .def("__iter__", [](SparseMatrix<ValueType>& matrix) {
+    py::class_<SparseMatrix<ValueType>> sparseMatrix(m, (vtSuffix + "SparseMatrix").c_str(), "Sparse matrix");
+    sparseMatrix.def("__iter__", [](SparseMatrix<ValueType>& matrix) {
                 return py::make_iterator(matrix.begin(), matrix.end());
             }, py::keep_alive<0, 1>() /* Essential: keep object alive while iterator exists */)
         .def("__str__", &streamToString<SparseMatrix<ValueType>>)
@@ -118,6 +202,24 @@ void define_sparse_matrix(py::module& m, std::string const& vtSuffix) {
             }, py::return_value_policy::reference, py::keep_alive<1, 0>())
     ;
 
+    if constexpr (std::is_same_v<ValueType, double>) {
+        sparseMatrix.def("to_csr_arrays", &getCsrArrays, R"dox(
+
+              Get the matrix in compressed sparse row (CSR) format as NumPy arrays without iterating over the entries.
+
+              The column, value and row group arrays are read-only views on the matrix memory and keep the matrix alive.
+              The column and value arrays are strided as both are stored interleaved in the matrix.
+
+              :return: Tuple (row_indications, columns, values, row_group_indices) where row i spans the entries row_indications[i] to row_indications[i+1] and row group g spans the rows row_group_indices[g] to row_group_indices[g+1].
+            )dox")
+            .def("to_scipy", [](py::object const& pyMatrix) {
+                auto const& matrix = pyMatrix.cast<SparseMatrix<double> const&>();
+                py::tuple arrays = getCsrArrays(pyMatrix);
+                return py::module::import("scipy.sparse").attr("csr_matrix")(py::make_tuple(arrays[2], arrays[1], arrays[0]), "shape"_a = py::make_tuple(matrix.getRowCount(), matrix.getColumnCount()));
+            }, "Convert to a scipy.sparse.csr_matrix. Row groups are not part of the result.")
+        ;
+    }
+
 
     // Rows
     py::class_<typename SparseMatrix<ValueType>::rows>(m, (vtSuffix + "SparseMatrixRows").c_str(), "Set of rows in a sparse matrix")
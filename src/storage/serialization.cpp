@@ -0,0 +1,567 @@
+#include "serialization.h"
+
+#include "storm/adapters/RationalNumberAdapter.h"
+#include "storm/models/sparse/Model.h"
+#include "storm/models/sparse/Dtmc.h"
+#include "storm/models/sparse/Mdp.h"
+#include "storm/models/sparse/Pomdp.h"
+#include "storm/models/sparse/Ctmc.h"
+#include "storm/models/sparse/MarkovAutomaton.h"
+#include "storm/models/sparse/StandardRewardModel.h"
+#include "storm/storage/sparse/ModelComponents.h"
+#include "storm/storage/sparse/StateValuations.h"
+#include "storm/storage/expressions/ExpressionManager.h"
+#include "storm/utility/builder.h"
+#include "storm/utility/constants.h"
+#include "storm/exceptions/InvalidArgumentException.h"
+#include "storm/exceptions/NotSupportedException.h"
+
+#include <algorithm>
+#include <cassert>
+#include <cstring>
+#include <fstream>
+
+/*
+ * Binary encoding of sparse models (with double values).
+ * All numbers are stored in native byte order, arrays are 8-byte aligned.
+ *
+ * The encoding starts with a header of fixed size followed by the CSR arrays of the transition matrix:
+ *   magic, version, model type, #states, #rows, #columns, #entries,
+ *   row group indices (#states+1), row start indices (#rows+1), columns (#entries), values (#entries).
+ * The CSR arrays can therefore be used directly from (shared) memory.
+ * The remaining components (labelings, reward models, state valuations and type specific components) follow as a sequence of records.
+ */
+
+namespace {
+
+char const MAGIC[8] = {'S', 'T', 'R', 'M', 'M', 'O', 'D', 'L'};
+uint64_t const VERSION = 1;
+uint64_t const HEADER_SIZE = 56;
+
+class Writer {
+public:
+    template<typename T>
+    void write(T value) {
+        static_assert(std::is_trivially_copyable_v<T> && sizeof(T) == 8, "Only 8-byte values are written");
+        data.append(reinterpret_cast<char const*>(&value), sizeof(T));
+    }
+
+    template<typename T>
+    void writeVector(std::vector<T> const& vector) {
+        write<uint64_t>(vector.size());
+        for (auto const& value : vector) {
+            write(static_cast<std::conditional_t<std::is_floating_point_v<T>, double, uint64_t>>(value));
+        }
+    }
+
+    void writeString(std::string const& string) {
+        write<uint64_t>(string.size());
+        data.append(string);
+        data.append((8 - string.size() % 8) % 8, '\0');
+    }
+
+    void writeBitVector(storm::storage::BitVector const& bitVector) {
+        write<uint64_t>(bitVector.size());
+        for (uint64_t start = 0; start < bitVector.size(); start += 64) {
+            uint64_t length = std::min<uint64_t>(64, bitVector.size() - start);
+            write<uint64_t>(bitVector.getAsInt(start, length));
+        }
+    }
+
+    void writeMatrix(storm::storage::SparseMatrix<double> const& matrix) {
+        write<uint64_t>(matrix.getRowCount());
+        write<uint64_t>(matrix.getColumnCount());
+        uint64_t nrEntries = 0;
+        for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+            nrEntries += matrix.getRow(row).getNumberOfEntries();
+        }
+        write<uint64_t>(nrEntries);
+        for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+            write<uint64_t>(matrix.getRow(row).getNumberOfEntries());
+        }
+        for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+            for (auto const& entry : matrix.getRow(row)) {
+                write<uint64_t>(entry.getColumn());
+                write<double>(entry.getValue());
+            }
+        }
+    }
+
+    std::string data;
+};
+
+class Reader {
+public:
+    Reader(char const* data, uint64_t size) : data(data), size(size) {
+    }
+
+    template<typename T>
+    T read() {
+        STORM_LOG_THROW(position + sizeof(T) <= size, storm::exceptions::InvalidArgumentException, "Unexpected end of encoded model.");
+        T value;
+        std::memcpy(&value, data + position, sizeof(T));
+        position += sizeof(T);
+        return value;
+    }
+
+    template<typename T>
+    std::vector<T> readVector() {
+        uint64_t length = read<uint64_t>();
+        std::vector<T> result;
+        result.reserve(length);
+        for (uint64_t i = 0; i < length; ++i) {
+            result.push_back(static_cast<T>(read<std::conditional_t<std::is_floating_point_v<T>, double, uint64_t>>()));
+        }
+        return result;
+    }
+
+    std::string readString() {
+        uint64_t length = read<uint64_t>();
+        STORM_LOG_THROW(position + length <= size, storm::exceptions::InvalidArgumentException, "Unexpected end of encoded model.");
+        std::string result(data + position, length);
+        position += length + (8 - length % 8) % 8;
+        return result;
+    }
+
+    storm::storage::BitVector readBitVector() {
+        uint64_t length = read<uint64_t>();
+        storm::storage::BitVector result(length);
+        for (uint64_t start = 0; start < length; start += 64) {
+            result.setFromInt(start, std::min<uint64_t>(64, length - start), read<uint64_t>());
+        }
+        return result;
+    }
+
+    storm::storage::SparseMatrix<double> readMatrix(std::vector<uint64_t> const* rowGroupIndices) {
+        uint64_t nrRows = read<uint64_t>();
+        uint64_t nrColumns = read<uint64_t>();
+        uint64_t nrEntries = read<uint64_t>();
+        std::vector<uint64_t> rowLengths(nrRows);
+        for (auto& length : rowLengths) {
+            length = read<uint64_t>();
+        }
+        bool customRowGrouping = rowGroupIndices != nullptr;
+        storm::storage::SparseMatrixBuilder<double> builder(nrRows, nrColumns, nrEntries, true, customRowGrouping, customRowGrouping ? rowGroupIndices->size() - 1 : 0);
+        uint64_t group = 0;
+        for (uint64_t row = 0; row < nrRows; ++row) {
+            while (customRowGrouping && group + 1 < rowGroupIndices->size() && (*rowGroupIndices)[group] == row) {
+                builder.newRowGroup(row);
+                ++group;
+            }
+            for (uint64_t entry = 0; entry < rowLengths[row]; ++entry) {
+                uint64_t column = read<uint64_t>();
+                builder.addNextValue(row, column, read<double>());
+            }
+        }
+        // Remaining (empty) row groups at the end
+        while (customRowGrouping && group + 1 < rowGroupIndices->size()) {
+            builder.newRowGroup(nrRows);
+            ++group;
+        }
+        return builder.build();
+    }
+
+    void setPosition(uint64_t newPosition) {
+        position = newPosition;
+    }
+
+private:
+    char const* data;
+    uint64_t size;
+    uint64_t position = 0;
+};
+
+storm::storage::SparseMatrix<double> readTransitionMatrix(Reader& reader, uint64_t nrStates, uint64_t nrRows, uint64_t nrColumns, uint64_t nrEntries) {
+    // The CSR arrays are stored without length prefixes, the lengths are given by the header
+    std::vector<uint64_t> rowGroupIndices(nrStates + 1);
+    for (auto& index : rowGroupIndices) {
+        index = reader.read<uint64_t>();
+    }
+    std::vector<uint64_t> rowStarts(nrRows + 1);
+    for (auto& start : rowStarts) {
+        start = reader.read<uint64_t>();
+    }
+    std::vector<uint64_t> columns(nrEntries);
+    for (auto& column : columns) {
+        column = reader.read<uint64_t>();
+    }
+    bool trivialRowGrouping = nrStates == nrRows;
+    storm::storage::SparseMatrixBuilder<double> builder(nrRows, nrColumns, nrEntries, true, !trivialRowGrouping, trivialRowGrouping ? 0 : nrStates);
+    for (uint64_t state = 0; state < nrStates; ++state) {
+        if (!trivialRowGrouping) {
+            builder.newRowGroup(rowGroupIndices[state]);
+        }
+        for (uint64_t row = rowGroupIndices[state]; row < rowGroupIndices[state + 1]; ++row) {
+            for (uint64_t entry = rowStarts[row]; entry < rowStarts[row + 1]; ++entry) {
+                builder.addNextValue(row, columns[entry], reader.read<double>());
+            }
+        }
+    }
+    return builder.build(nrRows, nrColumns, trivialRowGrouping ? 0 : nrStates);
+}
+
+enum class ValuationType : uint64_t { Boolean = 0, Integer = 1, Rational = 2 };
+
+void writeStateValuations(Writer& writer, storm::storage::sparse::StateValuations const& valuations, uint64_t nrStates) {
+    // Variables are taken from the first state, all states have the same variables
+    std::vector<std::pair<storm::expressions::Variable, ValuationType>> variables;
+    if (nrStates > 0) {
+        for (auto it = valuations.at(0).begin(); it != valuations.at(0).end(); ++it) {
+            if (!it.isVariable()) {
+                continue;
+            }
+            variables.emplace_back(it.getVariable(), it.isBoolean() ? ValuationType::Boolean : (it.isInteger() ? ValuationType::Integer : ValuationType::Rational));
+        }
+    }
+    writer.write<uint64_t>(variables.size());
+    for (auto const& [variable, type] : variables) {
+        writer.writeString(variable.getName());
+        writer.write<uint64_t>(static_cast<uint64_t>(type));
+    }
+    for (uint64_t state = 0; state < nrStates; ++state) {
+        for (auto const& [variable, type] : variables) {
+            switch (type) {
+                case ValuationType::Boolean:
+                    writer.write<uint64_t>(valuations.getBooleanValue(state, variable));
+                    break;
+                case ValuationType::Integer:
+                    writer.write<int64_t>(valuations.getIntegerValue(state, variable));
+                    break;
+                case ValuationType::Rational:
+                    writer.writeString(storm::utility::to_string(valuations.getRationalValue(state, variable)));
+                    break;
+            }
+        }
+    }
+}
+
+bool hasVariableOfType(storm::expressions::ExpressionManager const& manager, std::string const& name, ValuationType type) {
+    if (!manager.hasVariable(name)) {
+        return false;
+    }
+    auto variable = manager.getVariable(name);
+    switch (type) {
+        case ValuationType::Boolean:
+            return variable.hasBooleanType();
+        case ValuationType::Integer:
+            return variable.hasIntegerType();
+        case ValuationType::Rational:
+            return variable.hasRationalType();
+    }
+    return false;
+}
+
+/*!
+ * Read the state valuations. The manager is replaced by a new manager declaring the variables if it does not contain all of them.
+ */
+std::shared_ptr<storm::storage::sparse::StateValuations> readStateValuations(Reader& reader, uint64_t nrStates,
+                                                                            std::shared_ptr<storm::expressions::ExpressionManager>& manager) {
+    std::vector<std::pair<std::string, ValuationType>> variables;
+    uint64_t nrVariables = reader.read<uint64_t>();
+    for (uint64_t i = 0; i < nrVariables; ++i) {
+        std::string name = reader.readString();
+        auto type = static_cast<ValuationType>(reader.read<uint64_t>());
+        STORM_LOG_THROW(type == ValuationType::Boolean || type == ValuationType::Integer || type == ValuationType::Rational,
+                        storm::exceptions::InvalidArgumentException, "Unknown type of variable " << name << ".");
+        variables.emplace_back(std::move(name), type);
+    }
+
+    // Use the variables of the given manager if it contains all of them, otherwise declare the variables in a new manager
+    bool useGivenManager = manager && std::all_of(variables.begin(), variables.end(), [&manager](auto const& variable) {
+                               return hasVariableOfType(*manager, variable.first, variable.second);
+                           });
+    if (!useGivenManager) {
+        manager = std::make_shared<storm::expressions::ExpressionManager>();
+    }
+
+    storm::storage::sparse::StateValuationsBuilder builder;
+    std::vector<ValuationType> types;
+    for (auto const& [name, type] : variables) {
+        if (useGivenManager) {
+            builder.addVariable(manager->getVariable(name));
+        } else if (type == ValuationType::Boolean) {
+            builder.addVariable(manager->declareBooleanVariable(name));
+        } else if (type == ValuationType::Integer) {
+            builder.addVariable(manager->declareIntegerVariable(name));
+        } else {
+            builder.addVariable(manager->declareRationalVariable(name));
+        }
+        types.push_back(type);
+    }
+    for (uint64_t state = 0; state < nrStates; ++state) {
+        std::vector<bool> booleanValues;
+        std::vector<int64_t> integerValues;
+        std::vector<storm::RationalNumber> rationalValues;
+        for (auto type : types) {
+            switch (type) {
+                case ValuationType::Boolean:
+                    booleanValues.push_back(reader.read<uint64_t>() != 0);
+                    break;
+                case ValuationType::Integer:
+                    integerValues.push_back(reader.read<int64_t>());
+                    break;
+                case ValuationType::Rational:
+                    rationalValues.push_back(storm::utility::convertNumber<storm::RationalNumber>(reader.readString()));
+                    break;
+            }
+        }
+        builder.addState(state, std::move(booleanValues), std::move(integerValues), std::move(rationalValues));
+    }
+    return std::make_shared<storm::storage::sparse::StateValuations>(builder.build());
+}
+
+}  // namespace
+
+/*!
+ * Encode a sparse model.
+ * Choice origins and observation valuations are not encoded.
+ */
+std::string serializeSparseModel(storm::models::sparse::Model<double> const& model) {
+    auto const& matrix = model.getTransitionMatrix();
+    auto const& rowGroupIndices = matrix.getRowGroupIndices();
+    uint64_t nrEntries = 0;
+    for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+        nrEntries += matrix.getRow(row).getNumberOfEntries();
+    }
+
+    Writer writer;
+    writer.data.append(MAGIC, sizeof(MAGIC));
+    writer.write<uint64_t>(VERSION);
+    writer.write<uint64_t>(static_cast<uint64_t>(model.getType()));
+    writer.write<uint64_t>(model.getNumberOfStates());
+    writer.write<uint64_t>(matrix.getRowCount());
+    writer.write<uint64_t>(matrix.getColumnCount());
+    writer.write<uint64_t>(nrEntries);
+    assert(writer.data.size() == HEADER_SIZE);
+
+    // CSR arrays
+    for (uint64_t state = 0; state <= model.getNumberOfStates(); ++state) {
+        writer.write<uint64_t>(rowGroupIndices[state]);
+    }
+    uint64_t start = 0;
+    for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+        writer.write<uint64_t>(start);
+        start += matrix.getRow(row).getNumberOfEntries();
+    }
+    writer.write<uint64_t>(start);
+    for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+        for (auto const& entry : matrix.getRow(row)) {
+            writer.write<uint64_t>(entry.getColumn());
+        }
+    }
+    for (uint64_t row = 0; row < matrix.getRowCount(); ++row) {
+        for (auto const& entry : matrix.getRow(row)) {
+            writer.write<double>(entry.getValue());
+        }
+    }
+
+    // State labeling
+    auto const& labeling = model.getStateLabeling();
+    writer.write<uint64_t>(labeling.getNumberOfLabels());
+    for (auto const& label : labeling.getLabels()) {
+        writer.writeString(label);
+        writer.writeBitVector(labeling.getStates(label));
+    }
+
+    // Choice labeling
+    writer.write<uint64_t>(model.hasChoiceLabeling());
+    if (model.hasChoiceLabeling()) {
+        auto const& choiceLabeling = model.getChoiceLabeling();
+        writer.write<uint64_t>(choiceLabeling.getNumberOfLabels());
+        for (auto const& label : choiceLabeling.getLabels()) {
+            writer.writeString(label);
+            writer.writeBitVector(choiceLabeling.getChoices(label));
+        }
+    }
+
+    // Reward models
+    writer.write<uint64_t>(model.getRewardModels().size());
+    for (auto const& [name, rewardModel] : model.getRewardModels()) {
+        writer.writeString(name);
+        writer.write<uint64_t>(rewardModel.hasStateRewards());
+        if (rewardModel.hasStateRewards()) {
+            writer.writeVector(rewardModel.getStateRewardVector());
+        }
+        writer.write<uint64_t>(rewardModel.hasStateActionRewards());
+        if (rewardModel.hasStateActionRewards()) {
+            writer.writeVector(rewardModel.getStateActionRewardVector());
+        }
+        writer.write<uint64_t>(rewardModel.hasTransitionRewards());
+        if (rewardModel.hasTransitionRewards()) {
+            writer.writeMatrix(rewardModel.getTransitionRewardMatrix());
+        }
+    }
+
+    // State valuations
+    writer.write<uint64_t>(model.hasStateValuations());
+    if (model.hasStateValuations()) {
+        writeStateValuations(writer, model.getStateValuations(), model.getNumberOfStates());
+    }
+
+    // Type specific components
+    switch (model.getType()) {
+        case storm::models::ModelType::Pomdp:
+            writer.writeVector(dynamic_cast<storm::models::sparse::Pomdp<double> const&>(model).getObservations());
+            break;
+        case storm::models::ModelType::Ctmc:
+            writer.writeVector(dynamic_cast<storm::models::sparse::Ctmc<double> const&>(model).getExitRateVector());
+            break;
+        case storm::models::ModelType::MarkovAutomaton: {
+            auto const& ma = dynamic_cast<storm::models::sparse::MarkovAutomaton<double> const&>(model);
+            writer.writeVector(ma.getExitRates());
+            writer.writeBitVector(ma.getMarkovianStates());
+            break;
+        }
+        case storm::models::ModelType::Dtmc:
+        case storm::models::ModelType::Mdp:
+            break;
+        default:
+            STORM_LOG_THROW(false, storm::exceptions::NotSupportedException, "Encoding of models of type " << model.getType() << " is not supported.");
+    }
+    return std::move(writer.data);
+}
+
+/*!
+ * Build a model which owns the expression manager of the variables of its state valuations.
+ * The manager is destroyed with the model, also if the model is only referenced by pointers obtained via shared_from_this.
+ */
+template<typename ModelType>
+std::shared_ptr<storm::models::sparse::Model<double>> makeModelOwningManager(storm::storage::sparse::ModelComponents<double>&& components,
+                                                                             std::shared_ptr<storm::expressions::ExpressionManager> manager) {
+    return std::shared_ptr<ModelType>(new ModelType(std::move(components)), [manager](ModelType* model) { delete model; });
+}
+
+/*!
+ * Decode a sparse model.
+ * If the given expression manager contains all variables of the state valuations, the valuations refer to its variables.
+ * Otherwise, the variables are declared in a new expression manager which is owned by the model.
+ */
+std::shared_ptr<storm::models::sparse::Model<double>> deserializeSparseModel(char const* data, uint64_t size,
+                                                                             std::shared_ptr<storm::expressions::ExpressionManager> manager = nullptr) {
+    STORM_LOG_THROW(size >= HEADER_SIZE && std::memcmp(data, MAGIC, sizeof(MAGIC)) == 0, storm::exceptions::InvalidArgumentException, "Data does not contain an encoded model.");
+    Reader reader(data, size);
+    reader.setPosition(sizeof(MAGIC));
+    uint64_t version = reader.read<uint64_t>();
+    STORM_LOG_THROW(version == VERSION, storm::exceptions::InvalidArgumentException, "Unsupported version " << version << " of encoded model.");
+    auto modelType = static_cast<storm::models::ModelType>(reader.read<uint64_t>());
+    uint64_t nrStates = reader.read<uint64_t>();
+    uint64_t nrRows = reader.read<uint64_t>();
+    uint64_t nrColumns = reader.read<uint64_t>();
+    uint64_t nrEntries = reader.read<uint64_t>();
+
+    storm::storage::SparseMatrix<double> matrix = readTransitionMatrix(reader, nrStates, nrRows, nrColumns, nrEntries);
+    std::vector<uint64_t> const& rowGroupIndices = matrix.getRowGroupIndices();
+
+    storm::models::sparse::StateLabeling labeling(nrStates);
+    uint64_t nrLabels = reader.read<uint64_t>();
+    for (uint64_t i = 0; i < nrLabels; ++i) {
+        std::string label = reader.readString();
+        labeling.addLabel(label, reader.readBitVector());
+    }
+    storm::storage::sparse::ModelComponents<double> components(std::move(matrix), std::move(labeling));
+
+    if (reader.read<uint64_t>()) {
+        storm::models::sparse::ChoiceLabeling choiceLabeling(nrRows);
+        uint64_t nrChoiceLabels = reader.read<uint64_t>();
+        for (uint64_t i = 0; i < nrChoiceLabels; ++i) {
+            std::string label = reader.readString();
+            choiceLabeling.addLabel(label, reader.readBitVector());
+        }
+        components.choiceLabeling = std::move(choiceLabeling);
+    }
+
+    uint64_t nrRewardModels = reader.read<uint64_t>();
+    for (uint64_t i = 0; i < nrRewardModels; ++i) {
+        std::string name = reader.readString();
+        std::optional<std::vector<double>> stateRewards, stateActionRewards;
+        std::optional<storm::storage::SparseMatrix<double>> transitionRewards;
+        if (reader.read<uint64_t>()) {
+            stateRewards = reader.readVector<double>();
+        }
+        if (reader.read<uint64_t>()) {
+            stateActionRewards = reader.readVector<double>();
+        }
+        if (reader.read<uint64_t>()) {
+            transitionRewards = reader.readMatrix(nrStates == nrRows ? nullptr : &components.transitionMatrix.getRowGroupIndices());
+        }
+        components.rewardModels.emplace(name, storm::models::sparse::StandardRewardModel<double>(std::move(stateRewards), std::move(stateActionRewards), std::move(transitionRewards)));
+    }
+
+    bool hasStateValuations = reader.read<uint64_t>();
+    if (hasStateValuations) {
+        components.stateValuations = std::move(*readStateValuations(reader, nrStates, manager));
+    }
+
+    switch (modelType) {
+        case storm::models::ModelType::Pomdp:
+            components.observabilityClasses = reader.readVector<uint32_t>();
+            break;
+        case storm::models::ModelType::Ctmc:
+            components.exitRates = reader.readVector<double>();
+            components.rateTransitions = true;
+            break;
+        case storm::models::ModelType::MarkovAutomaton:
+            components.exitRates = reader.readVector<double>();
+            components.markovianStates = reader.readBitVector();
+            break;
+        default:
+            break;
+    }
+    if (!hasStateValuations) {
+        return storm::utility::builder::buildModelFromComponents(modelType, std::move(components));
+    }
+    switch (modelType) {
+        case storm::models::ModelType::Dtmc:
+            return makeModelOwningManager<storm::models::sparse::Dtmc<double>>(std::move(components), manager);
+        case storm::models::ModelType::Mdp:
+            return makeModelOwningManager<storm::models::sparse::Mdp<double>>(std::move(components), manager);
+        case storm::models::ModelType::Pomdp:
+            return makeModelOwningManager<storm::models::sparse::Pomdp<double>>(std::move(components), manager);
+        case storm::models::ModelType::Ctmc:
+            return makeModelOwningManager<storm::models::sparse::Ctmc<double>>(std::move(components), manager);
+        case storm::models::ModelType::MarkovAutomaton:
+            return makeModelOwningManager<storm::models::sparse::MarkovAutomaton<double>>(std::move(components), manager);
+        default:
+            STORM_LOG_THROW(false, storm::exceptions::NotSupportedException, "Decoding of models of type " << modelType << " is not supported.");
+    }
+}
+
+template<typename ModelType>
+void defineSparseModelPickling(py::module& m, std::string const& name) {
+    auto modelClass = py::reinterpret_borrow<py::class_<ModelType, std::shared_ptr<ModelType>>>(m.attr(name.c_str()));
+    modelClass.def(py::pickle(
+        [](ModelType const& model) {
+            return py::bytes(serializeSparseModel(model));
+        },
+        [](py::bytes const& data) {
+            std::string_view view(data);
+            auto model = std::dynamic_pointer_cast<ModelType>(deserializeSparseModel(view.data(), view.size()));
+            STORM_LOG_THROW(model, storm::exceptions::InvalidArgumentException, "Encoded model has unexpected type.");
+            return model;
+        }));
+}
+
+void define_sparse_model_serialization(py::module& m) {
+    m.def("_serialize_sparse_model", [](storm::models::sparse::Model<double> const& model) {
+        return py::bytes(serializeSparseModel(model));
+    }, py::arg("model"), "Encode a sparse model (with double values) in the binary model format");
+    m.def("_export_sparse_model_binary", [](storm::models::sparse::Model<double> const& model, std::string const& path) {
+        std::string data = serializeSparseModel(model);
+        std::ofstream file(path, std::ios::binary);
+        STORM_LOG_THROW(file, storm::exceptions::InvalidArgumentException, "Could not open file " << path << ".");
+        file.write(data.data(), data.size());
+        STORM_LOG_THROW(file, storm::exceptions::InvalidArgumentException, "Could not write file " << path << ".");
+    }, py::arg("model"), py::arg("path"), "Write a sparse model (with double values) to a file in the binary model format", py::call_guard<py::gil_scoped_release>());
+    m.def("_deserialize_sparse_model", [](py::buffer const& buffer, std::shared_ptr<storm::expressions::ExpressionManager> manager) {
+        py::buffer_info info = buffer.request();
+        STORM_LOG_THROW(info.ndim == 1 && info.itemsize == 1, storm::exceptions::InvalidArgumentException, "Encoded model must be a contiguous byte buffer.");
+        py::gil_scoped_release release;
+        return deserializeSparseModel(static_cast<char const*>(info.ptr), static_cast<uint64_t>(info.size), manager);
+    }, py::arg("data"), py::arg("expression_manager") = nullptr, "Decode a sparse model from a buffer in the binary model format");
+
+    defineSparseModelPickling<storm::models::sparse::Dtmc<double>>(m, "SparseDtmc");
+    defineSparseModelPickling<storm::models::sparse::Mdp<double>>(m, "SparseMdp");
+    defineSparseModelPickling<storm::models::sparse::Pomdp<double>>(m, "SparsePomdp");
+    defineSparseModelPickling<storm::models::sparse::Ctmc<double>>(m, "SparseCtmc");
+    defineSparseModelPickling<storm::models::sparse::MarkovAutomaton<double>>(m, "SparseMA");
+}
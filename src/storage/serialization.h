@@ -0,0 +1,5 @@
+#pragma once
+
+#include "common.h"
+
+void define_sparse_model_serialization(py::module& m);
@@ -35,4 +35,5 @@ pars = pytest.mark.skipif(not has_pars, reason="No support for parametric model
 pomdp = pytest.mark.skipif(not has_pomdp, reason="No support for POMDPs")
 spot = pytest.mark.skipif(not has_spot, reason="No support for LTL via spot")
 numpy_avail = pytest.mark.skipif(not has_numpy, reason="Numpy not available")
+scipy_avail = pytest.mark.skipif(not has_numpy or not has_scipy, reason="Scipy not available")
 plotting = pytest.mark.skipif(not has_matplotlib or not has_scipy, reason="Libraries for plotting not available")
@@ -1,6 +1,9 @@
+import pytest
+
 import stormpy
 import stormpy.examples
 import stormpy.examples.files
+from helpers.helper import get_example_path
 
 class TestBuilding:
     def test_explicit_builder(self):
@@ -34,3 +37,137 @@ class TestBuilding:
         assert model.state_valuations.get_integer_value(id, s_var) == 7
         assert model.state_valuations.get_integer_value(id, d_var) == 3
 
+
+    def _assert_identical(self, model, expected):
+        assert type(model) is type(expected)
+        assert model.nr_states == expected.nr_states
+        assert model.nr_choices == expected.nr_choices
+        assert model.initial_states == expected.initial_states
+        for row in range(expected.nr_choices):
+            assert str(model.transition_matrix.get_row(row)) == str(expected.transition_matrix.get_row(row))
+        for label in expected.labeling.get_labels():
+            assert model.labeling.get_states(label) == expected.labeling.get_states(label)
+        assert model.reward_models.keys() == expected.reward_models.keys()
+
+    def test_parallel_exploration_dtmc(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_brp)
+        options = stormpy.BuilderOptions(True, True)
+        options.set_build_state_valuations()
+        expected = stormpy.build_sparse_model_with_options(program, options)
+        assert options.exploration_threads == 1
+        options.set_exploration_threads(4)
+        assert options.exploration_threads == 4
+        model = stormpy.build_sparse_model_with_options(program, options)
+        self._assert_identical(model, expected)
+        for state in range(model.nr_states):
+            assert model.state_valuations.get_string(state) == expected.state_valuations.get_string(state)
+
+    def test_parallel_exploration_mdp(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_mdp_coin_2_2)
+        options = stormpy.BuilderOptions(True, True)
+        options.set_build_choice_labels()
+        expected = stormpy.build_sparse_model_with_options(program, options)
+        options.set_exploration_threads(3)
+        model = stormpy.build_sparse_model_with_options(program, options)
+        self._assert_identical(model, expected)
+        for choice in range(model.nr_choices):
+            assert model.choice_labeling.get_labels_of_choice(choice) == expected.choice_labeling.get_labels_of_choice(choice)
+        for name, reward_model in expected.reward_models.items():
+            assert model.reward_models[name].state_action_rewards == reward_model.state_action_rewards
+
+    def test_partial_exploration_bounds(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+        formula = stormpy.parse_properties_for_prism_program('P=? [F "one"]', program)[0]
+        exact = stormpy.model_checking(stormpy.build_model(program), formula).at(0)
+        for heuristic in [stormpy.ExplorationHeuristic.BFS, stormpy.ExplorationHeuristic.DFS, stormpy.ExplorationHeuristic.PROBABILITY]:
+            options = stormpy.BuilderOptions(True, True)
+            options.set_exploration_budget(states=6)
+            options.set_exploration_heuristic(heuristic)
+            assert options.has_exploration_budget
+            model = stormpy.build_sparse_model_with_options(program, options)
+            assert model.nr_states >= 6
+            assert model.nr_states < 13
+            unexplored = model.labeling.get_states("unexplored")
+            assert unexplored.number_of_set_bits() > 0
+            for state in unexplored:
+                assert model.states[state].actions[0].transitions[0].column == state
+            properties = stormpy.parse_properties_for_prism_program('P=? [F "one"]; P=? [F ("one" | "unexplored")]', program)
+            lower = stormpy.model_checking(model, properties[0]).at(model.initial_states[0])
+            upper = stormpy.model_checking(model, properties[1]).at(model.initial_states[0])
+            assert lower <= exact + 1e-6
+            assert exact <= upper + 1e-6
+            assert lower < upper
+
+    def test_partial_exploration_complete(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_mdp_coin_2_2)
+        options = stormpy.BuilderOptions(True, True)
+        expected = stormpy.build_sparse_model_with_options(program, options)
+        options.set_exploration_budget(states=10**6, time=60)
+        model = stormpy.build_sparse_model_with_options(program, options)
+        assert model.nr_states == expected.nr_states
+        assert model.nr_transitions == expected.nr_transitions
+        assert model.labeling.get_states("unexplored").number_of_set_bits() == 0
+
+    def test_build_progress(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_brp)
+        expected = stormpy.build_model(program)
+        reports = []
+        progress = stormpy.BuildProgress(lambda p: reports.append((p.explored_states, p.frontier_size, p.running)), interval=1e-6)
+        model = stormpy.build_model(program, progress=progress)
+        self._assert_identical(model, expected)
+        assert progress.finished
+        assert not progress.running
+        assert progress.states == model.nr_states
+        assert progress.explored_states == model.nr_states
+        assert progress.transitions == model.nr_transitions
+        assert progress.frontier_size == 0
+        assert progress.elapsed > 0
+        assert progress.states_per_second > 0
+        assert len(reports) > 0
+        # Reports during the build contain the explored states
+        assert any(running and explored > 0 for explored, _, running in reports)
+        # Last report after the build
+        assert reports[-1] == (model.nr_states, 0, False)
+
+    def test_build_progress_cancel(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_brp)
+        # The callback is called when the build starts, so the build is cancelled before the first state is explored
+        progress = stormpy.BuildProgress(lambda p: False)
+        options = stormpy.BuilderOptions(True, True)
+        options.set_exploration_threads(2)
+        with pytest.raises(RuntimeError):
+            stormpy.build_sparse_model_with_options(program, options, progress)
+        assert progress.cancelled
+        assert not progress.finished
+        assert not progress.running
+        assert progress.explored_states <= 1
+
+    def test_build_progress_cancel_during_build(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "crowds5_5.pm"))
+        # Cancel as soon as states are explored
+        progress = stormpy.BuildProgress(lambda p: p.explored_states == 0, interval=1e-6)
+        with pytest.raises(RuntimeError):
+            stormpy.build_model(program, progress=progress)
+        assert progress.cancelled
+        assert not progress.finished
+        # The build stopped before all 8607 states were explored
+        assert 0 < progress.explored_states < 8607
+
+    def test_build_progress_cancel_storm_builder(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+        options = stormpy.BuilderOptions(True, True)
+        progress = stormpy.BuildProgress(lambda p: False)
+        # The builder of Storm cannot be interrupted, cancelling raises an error after the build
+        with pytest.raises(RuntimeError):
+            stormpy.make_sparse_model_builder(program, options).build(progress)
+        assert progress.cancelled
+        assert not progress.finished
+
+    def test_explicit_builder_progress(self):
+        program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+        options = stormpy.BuilderOptions(True, True)
+        progress = stormpy.BuildProgress()
+        model = stormpy.make_sparse_model_builder(program, options).build(progress)
+        assert progress.finished
+        assert progress.states == model.nr_states == 13
+        assert progress.transitions == model.nr_transitions
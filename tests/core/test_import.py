@@ -0,0 +1,84 @@
+import subprocess
+import sys
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+
+
+def _cumulative_import_time(output, module):
+    # Lines of -X importtime have the form 'import time: self [us] | cumulative | imported package'
+    for line in output.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError("No import time for module {}".format(module))
+
+
+def _total_import_time(output):
+    # Sum of the cumulative times of the top-level imports, nested imports are indented
+    total = 0
+    for line in output.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit() and not parts[2].startswith("  "):
+            total += int(parts[1])
+    return total
+
+
+class TestImport:
+    def test_import_is_lazy(self):
+        _run(
+            "import sys, stormpy\n"
+            "loaded = [module for module in ['stormpy.core', 'stormpy.storage', 'stormpy.logic', 'pycarl'] if module in sys.modules]\n"
+            "assert not loaded, loaded\n"
+            "assert stormpy.ModelType.DTMC is not None\n"
+            "assert 'stormpy.core' in sys.modules\n"
+        )
+
+    def test_import_subpackage(self):
+        _run("import stormpy.storage\nimport stormpy\nassert stormpy.BitVector is stormpy.storage.BitVector\nassert stormpy.build_sparse_matrix is not None\n")
+
+    def test_subpackages_after_load(self):
+        _run(
+            "import stormpy\n"
+            "assert stormpy.BitVector is not None\n"
+            "assert stormpy.storage.__name__ == 'stormpy.storage', stormpy.storage\n"
+            "assert stormpy.logic.__name__ == 'stormpy.logic', stormpy.logic\n"
+            "assert stormpy.storage.build_sparse_matrix is stormpy.build_sparse_matrix\n"
+            "assert stormpy.storage.share_sparse_model is not None\n"
+            "assert stormpy.storage.get_maximal_end_components is not None\n"
+        )
+
+    def test_import_time(self, record_property):
+        # Storm is only loaded on first use. Importing stormpy should not take longer than the imports of the interpreter startup.
+        # Minimum over several runs to reduce noise
+        startup_time = min(_total_import_time(_run("pass").stderr) for _ in range(3))
+        import_time = min(_cumulative_import_time(_run("import stormpy").stderr, "stormpy") for _ in range(3))
+        load_time = min(_cumulative_import_time(_run("import stormpy\nstormpy._load()").stderr, "stormpy._api") for _ in range(3))
+        record_property("startup_time_us", startup_time)
+        record_property("import_time_us", import_time)
+        record_property("load_time_us", load_time)
+        assert import_time < load_time, "Importing stormpy took {} us, loading Storm took {} us".format(import_time, load_time)
+        # Allow 10 ms for noise
+        assert import_time < startup_time + 10000, "Importing stormpy took {} us, the imports of the interpreter startup took {} us".format(
+            import_time, startup_time
+        )
+
+    def test_load_from_threads(self):
+        # Threads accessing stormpy while another thread is loading wait until loading is finished
+        _run(
+            "import threading, stormpy\n"
+            "errors = []\n"
+            "def access():\n"
+            "    try:\n"
+            "        assert stormpy.ModelType.DTMC is not None\n"
+            "        assert stormpy.build_model is not None\n"
+            "    except BaseException as e:\n"
+            "        errors.append(e)\n"
+            "threads = [threading.Thread(target=access) for _ in range(8)]\n"
+            "for thread in threads:\n"
+            "    thread.start()\n"
+            "for thread in threads:\n"
+            "    thread.join()\n"
+            "assert not errors, errors\n"
+        )
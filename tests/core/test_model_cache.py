@@ -0,0 +1,94 @@
+import os
+
+import stormpy
+import stormpy.cache
+from helpers.helper import get_example_path
+
+
+class TestModelCache:
+    def test_cache_hit(self, tmpdir):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        prop = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", program)
+        cache = stormpy.cache.enable_model_cache(str(tmpdir))
+        try:
+            model = stormpy.build_model(program, prop)
+            assert cache.misses == 1 and cache.hits == 0
+            assert len(cache.entries()) == 1
+
+            # Same program and properties, parsed again
+            program2 = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+            prop2 = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", program2)
+            cached = stormpy.build_model(program2, prop2)
+            assert cache.hits == 1
+            assert type(cached) is stormpy.SparseDtmc
+            assert cached.nr_states == model.nr_states
+            assert cached.nr_transitions == model.nr_transitions
+            assert stormpy.model_checking(cached, prop2[0]).at(cached.initial_states[0]) == stormpy.model_checking(model, prop[0]).at(model.initial_states[0])
+
+            # Other properties give another model
+            stormpy.build_model(program)
+            assert cache.misses == 2
+            assert len(cache.entries()) == 2
+        finally:
+            stormpy.cache.disable_model_cache()
+
+    def test_cache_constants_and_options(self, tmpdir):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "brp.pm"))
+        cache = stormpy.cache.enable_model_cache(str(tmpdir))
+        try:
+            # Different values of constants give different models
+            model = stormpy.build_model(stormpy.preprocess_symbolic_input(program, [], "N=16,MAX=2")[0].as_prism_program())
+            model3 = stormpy.build_model(stormpy.preprocess_symbolic_input(program, [], "N=16,MAX=3")[0].as_prism_program())
+            assert cache.misses == 2
+            assert model3.nr_states != model.nr_states
+
+            program = stormpy.parse_prism_program(get_example_path("dtmc", "brp-16-2.pm"))
+            options = stormpy.BuilderOptions()
+            options.set_build_state_valuations()
+            model = stormpy.build_sparse_model_with_options(program, options)
+            cached = stormpy.build_sparse_model_with_options(program, options)
+            assert cache.hits == 1
+            assert cached.nr_states == model.nr_states
+            # Variables of the program can be used for cached state valuations
+            variable = program.get_module("sender").get_integer_variable("s").expression_variable
+            for state in range(model.nr_states):
+                assert cached.state_valuations.get_integer_value(state, variable) == model.state_valuations.get_integer_value(state, variable)
+
+            options.set_build_choice_labels()
+            stormpy.build_sparse_model_with_options(program, options)
+            assert cache.hits == 1
+        finally:
+            stormpy.cache.disable_model_cache()
+
+    def test_corrupt_entry(self, tmpdir):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        cache = stormpy.cache.enable_model_cache(str(tmpdir))
+        try:
+            model = stormpy.build_model(program)
+            ((key, size, _),) = cache.entries()
+            # Truncate the cached model
+            path = os.path.join(str(tmpdir), next(name for name in os.listdir(str(tmpdir)) if name.startswith(key)))
+            with open(path, "r+b") as f:
+                f.truncate(size // 2)
+
+            # The corrupt entry is a miss and the model is rebuilt
+            rebuilt = stormpy.build_model(program)
+            assert cache.misses == 2 and cache.hits == 0
+            assert rebuilt.nr_states == model.nr_states
+            assert rebuilt.nr_transitions == model.nr_transitions
+            assert cache.entries()[0][1] == size
+
+            stormpy.build_model(program)
+            assert cache.hits == 1
+        finally:
+            stormpy.cache.disable_model_cache()
+
+    def test_eviction(self, tmpdir):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        cache = stormpy.cache.ModelCache(str(tmpdir), max_size=0)
+        model = stormpy.build_model(program)
+        key = cache.key(program)
+        assert cache.put(key, model)
+        assert cache.entries() == []
+        assert cache.get(key) is None
+        assert not any(name.endswith(".tmp") for name in os.listdir(str(tmpdir)))
@@ -1,7 +1,9 @@
+import pytest
+
 import stormpy
 from helpers.helper import get_example_path
 
-from configurations import spot
+from configurations import spot, numpy_avail
 
 import math
 
@@ -117,6 +119,77 @@ class TestModelChecking:
         reference = [1 / 6, 1 / 3, 0, 2 / 3, 0, 0, 0, 1, 0, 0, 0, 0, 0]
         assert all(map(math.isclose, result.get_values(), reference))
 
+    @numpy_avail
+    def test_model_checking_all_dtmc_numpy(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("P=? [ F \"one\" ]", program)
+        model = stormpy.build_model(program, formulas)
+        result = stormpy.model_checking(model, formulas[0])
+        values = result.to_numpy()
+        assert values.shape == (13,)
+        assert not values.flags.writeable
+        reference = [1 / 6, 1 / 3, 0, 2 / 3, 0, 0, 0, 1, 0, 0, 0, 0, 0]
+        assert all(map(math.isclose, values, reference))
+        # The array keeps the result alive
+        del result
+        assert all(map(math.isclose, values, reference))
+
+    def test_check_properties(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("P=? [ F \"one\" ]; P=? [ F \"two\" ]; R=? [ F \"done\" ]; P=? [ F \"one\" ]", program)
+        model = stormpy.build_model(program, formulas)
+        results = stormpy.check_properties(model, formulas)
+        assert len(results) == 4
+        initial_state = model.initial_states[0]
+        for formula, result in zip(formulas, results):
+            assert math.isclose(result.at(initial_state), stormpy.model_checking(model, formula).at(initial_state))
+        assert math.isclose(results[0].at(initial_state), 1 / 6)
+        assert math.isclose(results[2].at(initial_state), 11 / 3)
+        # Results of duplicate properties are independent copies
+        assert results[0] is not results[3]
+
+    def test_check_properties_mdp(self):
+        program = stormpy.parse_prism_program(get_example_path("mdp", "coin2-2.nm"))
+        formulas = stormpy.parse_properties_for_prism_program("Pmin=? [ F \"finished\" & \"all_coins_equal_1\"]; Pmax=? [ F \"finished\" & \"all_coins_equal_1\"]", program)
+        model = stormpy.build_model(program, formulas)
+        results = stormpy.check_properties(model, formulas, only_initial_states=True)
+        initial_state = model.initial_states[0]
+        assert math.isclose(results[0].at(initial_state), 49 / 128, rel_tol=1e-5)
+        assert results[1].at(initial_state) >= results[0].at(initial_state)
+
+    def test_check_properties_shared_precomputation(self):
+        program = stormpy.parse_prism_program(get_example_path("mdp", "coin2-2.nm"))
+        formulas = stormpy.parse_properties_for_prism_program(
+            "Pmin=? [ F \"finished\" & \"all_coins_equal_1\"]; Pmin>=0.3 [ F \"finished\" & \"all_coins_equal_1\"]; Pmin=? [ true U \"finished\" & \"all_coins_equal_1\"]; Pmax=? [ F \"finished\" & \"all_coins_equal_1\"]",
+            program)
+        model = stormpy.build_model(program, formulas)
+        results = stormpy.check_properties(model, formulas)
+        for formula, result in zip(formulas, results):
+            reference = stormpy.model_checking(model, formula)
+            for state in range(model.nr_states):
+                if formula.raw_formula.has_bound:
+                    assert result.at(state) == reference.at(state)
+                else:
+                    assert math.isclose(result.at(state), reference.at(state), abs_tol=1e-6)
+
+    def test_check_properties_pomdp(self):
+        program = stormpy.parse_prism_program(get_example_path("pomdp", "maze_2.prism"))
+        formulas = stormpy.parse_properties_for_prism_program("P=? [F \"goal\"]", program)
+        model = stormpy.build_model(program, formulas)
+        with pytest.raises(NotImplementedError):
+            stormpy.check_properties(model, formulas)
+
+    def test_model_checking_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("P=? [ F \"one\" ]; P=? [ F \"two\" ]; R=? [ F \"done\" ]", program)
+        model = stormpy.build_model(program, formulas)
+        initial_state = model.initial_states[0]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda formula: stormpy.model_checking(model, formula), formulas * 4))
+        reference = [1 / 6, 1 / 6, 11 / 3] * 4
+        assert all(math.isclose(result.at(initial_state), value) for result, value in zip(results, reference))
+
     def test_model_checking_only_initial(self):
         program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
         formulas = stormpy.parse_properties_for_prism_program("Pmax=? [F{\"coin_flips\"}<=3 \"one\"]", program)
@@ -163,6 +236,28 @@ class TestModelChecking:
         result = stormpy.model_checking(model, formulas[0])
         assert math.isclose(result.at(initial_state), 4.166666667)
 
+    def test_compute_transient_probabilities(self):
+        program = stormpy.parse_prism_program(get_example_path("ctmc", "tiny.sm"))
+        model = stormpy.build_model(program)
+        phi_states = stormpy.BitVector(model.nr_states, True)
+        psi_states = model.labeling.get_states("full")
+        env = stormpy.Environment()
+        values = stormpy.compute_transient_probabilities(env, model, phi_states, psi_states, 1.0)
+        assert len(values) == model.nr_states
+        assert all(0 <= v <= 1 for v in values)
+
+    @numpy_avail
+    def test_compute_transient_probabilities_numpy(self):
+        program = stormpy.parse_prism_program(get_example_path("ctmc", "tiny.sm"))
+        model = stormpy.build_model(program)
+        phi_states = stormpy.BitVector(model.nr_states, True)
+        psi_states = model.labeling.get_states("full")
+        env = stormpy.Environment()
+        reference = stormpy.compute_transient_probabilities(env, model, phi_states, psi_states, 1.0)
+        values = stormpy.compute_transient_probabilities(env, model, phi_states, psi_states, 1.0, as_numpy=True)
+        assert values.shape == (model.nr_states,)
+        assert all(map(math.isclose, values, reference))
+
     def test_filter(self):
         program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
         formulas = stormpy.parse_properties_for_prism_program("P=? [ F \"one\" ]", program)
@@ -224,3 +319,14 @@ class TestModelChecking:
             assert values[i] == 0
         for i in range(7,13):
             assert math.isclose(values[i], 1.0/6)
+
+    @numpy_avail
+    def test_compute_steady_state_distribution_numpy(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        model = stormpy.build_model(program)
+        environment = stormpy.Environment()
+        result = stormpy.compute_steady_state_distribution(environment, model)
+        values = result.to_numpy()
+        assert values.shape == (13,)
+        assert math.isclose(values.sum(), 1)
+        assert all(map(math.isclose, values, result.get_values()))
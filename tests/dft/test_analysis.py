@@ -24,6 +24,14 @@ class TestAnalysis:
         assert model.nr_transitions == 5
         assert not model.supports_parameters
 
+    def test_build_model_progress(self):
+        dft = stormpy.dft.load_dft_json_file(get_example_path("dft", "and.json"))
+        progress = stormpy.BuildProgress()
+        model = stormpy.dft.build_model(dft, progress=progress)
+        assert progress.finished
+        assert progress.states == model.nr_states == 4
+        assert progress.transitions == model.nr_transitions == 5
+
     def test_explicit_model_builder(self):
         dft = stormpy.dft.load_dft_json_file(get_example_path("dft", "and.json"))
         builder = stormpy.dft.ExplicitDFTModelBuilder_double(dft)
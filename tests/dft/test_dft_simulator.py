@@ -2,7 +2,7 @@ import stormpy
 from helpers.helper import get_example_path
 
 import math
-from configurations import dft
+from configurations import dft, numpy_avail
 
 
 @dft
@@ -166,3 +166,29 @@ class TestSimulator:
         failable = state.failable()
         for f in failable:
             assert False  # no failable elements
+
+    def test_simulate_traces_parallel(self):
+        dft = stormpy.dft.load_dft_galileo_file(get_example_path("dft", "rc2.dft"))
+        dft = stormpy.dft.prepare_for_analysis(dft)
+        from stormpy.dft.simulator import DftSimulator
+        simulator = DftSimulator(dft, seed=5)
+        failures, (lower, upper) = simulator.simulate_traces_parallel(2, 4000, threads=4, seed=42)
+        assert 0 <= failures <= 4000
+        assert lower <= failures / 4000 <= upper
+        # Same seed and number of threads give the same result
+        failures2, _ = simulator.simulate_traces_parallel(2, 4000, threads=4, seed=42)
+        assert failures == failures2
+        # Result is close to the sequential simulation
+        sequential = simulator.simulate_traces(2, 4000)
+        assert abs(sequential - failures) / 4000 < 0.05
+
+    @numpy_avail
+    def test_simulate_traces_parallel_failure_times(self):
+        dft = stormpy.dft.load_dft_galileo_file(get_example_path("dft", "rc2.dft"))
+        dft = stormpy.dft.prepare_for_analysis(dft)
+        from stormpy.dft.simulator import DftSimulator
+        simulator = DftSimulator(dft, seed=5)
+        failures, _, times = simulator.simulate_traces_parallel(2, 1000, threads=2, failure_times=True)
+        assert times.shape == (1000,)
+        assert (times <= 2).sum() == failures
+        assert (times[times > 2] == math.inf).all()
@@ -1,7 +1,8 @@
+import pytest
 import stormpy
 from helpers.helper import get_example_path
 
-from configurations import pars
+from configurations import pars, numpy_avail
 import math
 
 
@@ -78,3 +79,111 @@ class TestModelInstantiator:
         res = result.at(model.initial_states[0])
         assert isinstance(res, stormpy.Rational)
         assert res == stormpy.Rational("29/15")
+
+    @numpy_avail
+    def test_pdtmc_instantiation_checker_batch(self):
+        import numpy as np
+
+        program = stormpy.parse_prism_program(get_example_path("pdtmc", "herman5.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("R=? [F \"stable\"]", program)
+        model = stormpy.build_parametric_model(program, formulas)
+
+        parameters = list(model.collect_probability_parameters())
+        inst_checker = stormpy.pars.PDtmcInstantiationChecker(model)
+        inst_checker.specify_formula(stormpy.ParametricCheckTask(formulas[0].raw_formula, True))
+        inst_checker.set_graph_preserving(True)
+        env = stormpy.Environment()
+
+        values = [0.3, 0.5, 0.7, 0.5, 0.9]
+        valuations = np.array([[v] * len(parameters) for v in values])
+        results = inst_checker.check_batch(env, parameters, valuations, threads=2)
+        assert results.shape == (len(values),)
+        assert math.isclose(results[1], 29 / 15)
+        assert math.isclose(results[3], 29 / 15)
+        for v, res in zip(values, results):
+            point = {p: stormpy.RationalRF(v) for p in parameters}
+            expected = inst_checker.check(env, point).at(model.initial_states[0])
+            assert math.isclose(res, expected)
+
+    @numpy_avail
+    def test_pdtmc_instantiation_checker_warm_start(self):
+        import numpy as np
+
+        program = stormpy.parse_prism_program(get_example_path("pdtmc", "herman5.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("R=? [F \"stable\"]", program)
+        model = stormpy.build_parametric_model(program, formulas)
+
+        parameters = list(model.collect_probability_parameters())
+        inst_checker = stormpy.pars.PDtmcInstantiationChecker(model)
+        inst_checker.specify_formula(stormpy.ParametricCheckTask(formulas[0].raw_formula, True))
+        inst_checker.set_graph_preserving(True)
+        assert inst_checker.warm_start
+        env = stormpy.Environment()
+
+        values = [0.9, 0.2, 0.5, 0.4, 0.6]
+        valuations = np.array([[v] * len(parameters) for v in values])
+        warm_results = inst_checker.check_batch(env, parameters, valuations, threads=1)
+        # All checks but the first one start from the previous result
+        assert inst_checker.nr_warm_starts == len(values) - 1
+
+        inst_checker.set_warm_start(False)
+        assert not inst_checker.warm_start
+        cold_results = inst_checker.check_batch(env, parameters, valuations, threads=1)
+        assert inst_checker.nr_warm_starts == len(values) - 1
+        assert np.allclose(warm_results, cold_results)
+        assert math.isclose(warm_results[2], 29 / 15)
+
+        point = {p: stormpy.RationalRF(1 / 2) for p in parameters}
+        res = inst_checker.check(env, point).at(model.initial_states[0])
+        assert math.isclose(res, 29 / 15)
+
+    @numpy_avail
+    def test_pdtmc_instantiation_checker_batch_not_finite(self):
+        import numpy as np
+
+        program = stormpy.parse_prism_program(get_example_path("pdtmc", "herman5.pm"))
+        formulas = stormpy.parse_properties_for_prism_program("R=? [F \"stable\"]", program)
+        model = stormpy.build_parametric_model(program, formulas)
+
+        parameters = list(model.collect_probability_parameters())
+        inst_checker = stormpy.pars.PDtmcInstantiationChecker(model)
+        inst_checker.specify_formula(stormpy.ParametricCheckTask(formulas[0].raw_formula, True))
+        inst_checker.set_graph_preserving(True)
+        env = stormpy.Environment()
+
+        valuations = np.array([[0.5] * len(parameters), [np.nan] * len(parameters), [0.3] * len(parameters)])
+        with pytest.raises(RuntimeError, match="not finite"):
+            inst_checker.check_batch(env, parameters, valuations)
+
+
+@pars
+class TestIncrementalModelBuilder:
+    def test_incremental(self):
+        program = stormpy.parse_prism_program(get_example_path("pdtmc", "parametric_die.pm"))
+        prop = stormpy.parse_properties_for_prism_program("P=? [F s=7 & d=1]", program)
+        builder = stormpy.pars.IncrementalModelBuilder(program, prop)
+        assert builder.incremental
+
+        for p, q in [(0.5, 0.5), (0.3, 0.6)]:
+            model = builder.build({"p": p, "q": q})
+            assert type(model) is stormpy.SparseDtmc
+            # Compare with the model built from scratch
+            description = stormpy.preprocess_symbolic_input(program, [], "p={},q={}".format(p, q))[0].as_prism_program()
+            expected = stormpy.build_model(description, prop)
+            assert model.nr_states == expected.nr_states
+            result = stormpy.model_checking(model, prop[0]).at(model.initial_states[0])
+            assert math.isclose(result, stormpy.model_checking(expected, prop[0]).at(expected.initial_states[0]))
+
+        model = builder.build("p=0.2,q=0.4")
+        assert model.nr_states == 13
+
+        # Misspelled constants are not silently ignored
+        with pytest.raises(stormpy.StormError):
+            builder.build({"p": 0.5, "q": 0.5, "r": 0.1})
+
+    def test_not_graph_preserving(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "brp.pm"))
+        builder = stormpy.pars.IncrementalModelBuilder(program)
+        assert not builder.incremental
+        model = builder.build({"N": 16, "MAX": 2})
+        assert model.nr_states == 677
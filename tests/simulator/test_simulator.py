@@ -1,6 +1,9 @@
+import pytest
+
 import stormpy
 import stormpy.simulator
 from helpers.helper import get_example_path
+from configurations import numpy_avail
 
 
 class TestSparseSimulator:
@@ -21,6 +24,36 @@ class TestSparseSimulator:
             final_outcomes[observation] += 1
         simulator.restart()
 
+    @numpy_avail
+    def test_simulate_batch(self):
+        simulator = stormpy.simulator.create_simulator(self.model, seed=42)
+        states, rewards, hits = simulator.simulate_batch(20000, 100, target="done")
+        assert states.shape == (20000, 101)
+        assert rewards.shape == (20000, 1)
+        assert simulator.get_reward_names() == ["coin_flips"]
+        assert hits.all()
+        assert (states[:, 0] == self.model.initial_states[0]).all()
+        # Expected number of coin flips is 11/3
+        assert abs(rewards[:, 0].mean() - 11 / 3) < 0.1
+
+        final_states, _, hits_one = simulator.simulate_batch(20000, 100, target="one", record_paths=False)
+        assert final_states.shape == (20000,)
+        assert abs(hits_one.mean() - 1 / 6) < 0.02
+        one_states = self.model.labeling.get_states("one")
+        assert all(one_states.get(int(s)) for s in final_states[hits_one])
+
+    @numpy_avail
+    def test_simulate_batch_scheduler(self):
+        program = stormpy.parse_prism_program(get_example_path("mdp", "die_selection.nm"))
+        formula = stormpy.parse_properties_for_prism_program("Pmax=? [F \"done\"]", program)
+        model = stormpy.build_model(program, formula)
+        result = stormpy.model_checking(model, formula[0], extract_scheduler=True)
+        simulator = stormpy.simulator.create_simulator(model, seed=7)
+        states, rewards, hits = simulator.simulate_batch(10000, 200, scheduler=result.scheduler, target="done")
+        assert states.shape == (10000, 201)
+        assert abs(hits.mean() - result.at(model.initial_states[0])) < 0.03
+
+
 class TestPrismSimulator:
 
     def test_negative_values(self):
@@ -33,3 +66,184 @@ class TestPrismSimulator:
         assert state["s"] ==  -1
         assert int(state["s"]) == -1
 
+
+    def test_random_step(self):
+        prism_program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+        simulator = stormpy.simulator.create_simulator(prism_program, seed=42)
+        for n in range(10):
+            simulator.restart()
+            steps = 0
+            while not simulator.is_done():
+                state, reward, labels = simulator.random_step()
+                steps += 1
+                assert steps < 1000
+            assert "done" in labels
+            assert state["s"] == 7
+            assert 1 <= int(state["d"]) <= 6
+
+    def test_state_cache(self):
+        prism_program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+        simulator = stormpy.simulator.create_simulator(prism_program, seed=42)
+        for n in range(20):
+            simulator.restart()
+            while not simulator.is_done():
+                simulator.random_step()
+        info = simulator.cache_info()
+        # The die has only 13 reachable states
+        assert info.size <= 13
+        assert info.misses <= 13
+        assert info.hits > 0
+
+        simulator.set_cache_capacity(2)
+        assert simulator.cache_info().size <= 2
+        simulator.clear_cache()
+        info = simulator.cache_info()
+        assert info.size == 0
+        assert info.hits == 0
+        assert info.misses == 0
+
+        simulator.set_cache_capacity(0)
+        for n in range(5):
+            simulator.restart()
+            while not simulator.is_done():
+                simulator.random_step()
+        info = simulator.cache_info()
+        assert info.size == 0
+        assert info.hits == 0
+        assert info.misses > 0
+
+    def test_global_names(self):
+        prism_program = stormpy.parse_prism_program(get_example_path("mdp", "die_selection.nm"))
+        simulator = stormpy.simulator.create_simulator(prism_program, seed=42)
+        simulator.set_action_mode(stormpy.simulator.SimulatorActionMode.GLOBAL_NAMES)
+        state, _, _ = simulator.restart()
+        assert simulator.available_actions() == ["fair", "ufair1", "ufair2"]
+        state, _, _ = simulator.step("ufair2")
+        assert state["s"] in [1, 2]
+        try:
+            simulator.step("unknown")
+            assert False
+        except ValueError:
+            pass
+
+
+class TestSparseSimulatorActionNames:
+
+    def test_global_names(self):
+        prism_program = stormpy.parse_prism_program(get_example_path("mdp", "die_selection.nm"))
+        options = stormpy.BuilderOptions()
+        options.set_build_choice_labels(True)
+        model = stormpy.build_sparse_model_with_options(prism_program, options)
+        simulator = stormpy.simulator.create_simulator(model, seed=42)
+        simulator.set_action_mode(stormpy.simulator.SimulatorActionMode.GLOBAL_NAMES)
+        simulator.restart()
+        assert sorted(simulator.available_actions()) == ["fair", "ufair1", "ufair2"]
+        while not simulator.is_done():
+            actions = simulator.available_actions()
+            action = "fair" if "fair" in actions else actions[0]
+            simulator.step(action)
+        try:
+            simulator.restart()
+            simulator.step("unknown")
+            assert False
+        except ValueError:
+            pass
+
+
+@numpy_avail
+class TestVectorizedSimulator:
+
+    def test_die(self):
+        import numpy as np
+        model = stormpy.build_model(stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die))
+        simulator = stormpy.simulator.VectorizedSimulator(model, 100, seed=42)
+        observations = simulator.reset()
+        assert observations.shape == (100,)
+        assert (observations == model.initial_states[0]).all()
+        labels = simulator.get_label_names()
+        done_bit = labels.index("done")
+        assert simulator.get_reward_names() == ["coin_flips"]
+        finished = 0
+        for _ in range(20):
+            observations, rewards, dones, label_masks = simulator.step()
+            assert rewards.shape == (100, 1)
+            assert label_masks.shape == (100, 1)
+            # Finished instances are reset
+            assert (observations[dones] == model.initial_states[0]).all()
+            assert ((label_masks[dones, 0] >> np.uint64(done_bit)) & np.uint64(1) == 1).all()
+            finished += dones.sum()
+        assert finished > 100
+
+    def test_mdp_actions(self):
+        import numpy as np
+        model = stormpy.build_model(stormpy.parse_prism_program(get_example_path("mdp", "die_selection.nm")))
+        simulator = stormpy.simulator.VectorizedSimulator(model, 10, seed=1, max_steps=3)
+        simulator.reset()
+        assert (simulator.nr_available_actions() == 3).all()
+        simulator.step(np.full(10, 2))
+        simulator.step(np.zeros(10, dtype=np.int64))
+        observations, _, dones, _ = simulator.step(np.zeros(10, dtype=np.int64))
+        # All episodes are truncated after three steps
+        assert dones.all()
+        assert (observations == model.initial_states[0]).all()
+
+    def test_invalid_action(self):
+        import numpy as np
+        model = stormpy.build_model(stormpy.parse_prism_program(get_example_path("mdp", "die_selection.nm")))
+        simulator = stormpy.simulator.VectorizedSimulator(model, 10, seed=1)
+        simulator.reset()
+        simulator.step(np.zeros(10, dtype=np.int64))
+        states = simulator._engine.get_current_states().copy()
+        actions = np.zeros(10, dtype=np.int64)
+        actions[-1] = 5
+        with pytest.raises(RuntimeError):
+            simulator.step(actions)
+        # No instance was advanced
+        assert (simulator._engine.get_current_states() == states).all()
+
+
+class TestContinuousTimeSimulator:
+
+    def test_ctmc_steps(self):
+        program = stormpy.parse_prism_program(get_example_path("ctmc", "tiny.sm"))
+        model = stormpy.build_model(program)
+        simulator = stormpy.simulator.create_simulator(model, seed=42)
+        assert isinstance(simulator, stormpy.simulator.ContinuousTimeSparseSimulator)
+        simulator.restart()
+        assert simulator.get_current_time() == 0
+        time = 0
+        for _ in range(10):
+            simulator.step()
+            assert simulator.get_last_sojourn_time() > 0
+            time += simulator.get_last_sojourn_time()
+            assert simulator.get_current_time() == time
+        simulator.restart()
+        assert simulator.get_current_time() == 0
+
+    def test_ma_steps(self):
+        program = stormpy.parse_prism_program(get_example_path("ma", "simple.ma"))
+        model = stormpy.build_model(program)
+        simulator = stormpy.simulator.create_simulator(model, seed=42)
+        simulator.restart()
+        # Probabilistic states are left without delay
+        assert simulator.nr_available_actions() == 2
+        while simulator.nr_available_actions() > 1:
+            simulator.step(0)
+            assert simulator.get_current_time() == 0
+        # Markovian states have a delay
+        simulator.step()
+        assert simulator.get_current_time() > 0
+
+    @numpy_avail
+    def test_time_bounded_batch(self):
+        program = stormpy.parse_prism_program(get_example_path("ctmc", "tiny.sm"))
+        model = stormpy.build_model(program)
+        prop = stormpy.parse_properties_for_prism_program("P=? [F<=1 \"full\"]", program)[0]
+        exact = stormpy.model_checking(model, prop).at(model.initial_states[0])
+        simulator = stormpy.simulator.ContinuousTimeSparseSimulator(model, seed=5)
+        states, times, rewards, hits = simulator.simulate_batch(20000, 1.0, target="full")
+        assert states.shape == (20000,)
+        assert rewards.shape == (20000, 0)
+        assert (times <= 1.0).all()
+        assert (times[~hits] == 1.0).all()
+        assert abs(hits.mean() - exact) < 0.02
@@ -0,0 +1,130 @@
+import pytest
+import stormpy
+import stormpy.examples
+import stormpy.examples.files
+from helpers.helper import get_example_path
+
+from configurations import numpy_avail
+
+
+@numpy_avail
+class TestStatisticalModelChecking:
+    program = stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die)
+    model = stormpy.build_model(program)
+
+    def test_chernoff_hoeffding(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.ChernoffHoeffding(epsilon=0.01, delta=0.05), threads=2, seed=42)
+        assert result.converged
+        assert result.samples == 18445
+        assert abs(result.estimate - 1 / 6) < 0.01
+        assert result.interval[0] <= 1 / 6 <= result.interval[1]
+
+        # Same seed gives the same result
+        result2 = stormpy.smc.estimate(self.model, prop, stormpy.smc.ChernoffHoeffding(epsilon=0.01, delta=0.05), threads=2, seed=42)
+        assert result.estimate == result2.estimate
+
+    def test_bounded_until(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P=? [F<=3 \"done\"]", self.program)[0]
+        exact = stormpy.model_checking(self.model, prop).at(self.model.initial_states[0])
+        result = stormpy.smc.estimate(self.model, prop, seed=1)
+        assert abs(result.estimate - exact) < 0.01
+
+    def test_sprt(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P>=0.1 [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.SequentialProbabilityRatioTest(), batch_size=100, seed=3)
+        assert result.converged
+        assert result.holds
+
+        prop = stormpy.parse_properties_for_prism_program("P<=0.1 [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.SequentialProbabilityRatioTest(), batch_size=100, seed=3)
+        assert not result.holds
+
+        prop = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.SequentialProbabilityRatioTest(threshold=0.25), batch_size=100, seed=3)
+        assert not result.holds
+
+    def test_sprt_reuse(self):
+        import stormpy.smc
+        # The threshold of a formula is not kept for the next formula
+        rule = stormpy.smc.SequentialProbabilityRatioTest()
+        prop = stormpy.parse_properties_for_prism_program("P>=0.1 [F \"one\"]", self.program)[0]
+        assert stormpy.smc.estimate(self.model, prop, rule, batch_size=100, seed=3).holds
+        prop = stormpy.parse_properties_for_prism_program("P>=0.3 [F \"one\"]", self.program)[0]
+        assert not stormpy.smc.estimate(self.model, prop, rule, batch_size=100, seed=3).holds
+
+    def test_bayesian(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.BayesianInterval(half_width=0.01, confidence=0.95), batch_size=1000, seed=5)
+        assert result.converged
+        assert abs(result.estimate - 1 / 6) < 0.02
+        assert result.interval[1] - result.interval[0] <= 0.02 + 1e-12
+
+    def test_expected_reward(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("R=? [F \"done\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.model, prop, stormpy.smc.ChernoffHoeffding(epsilon=0.2, delta=0.05, value_range=20), seed=7)
+        assert abs(result.estimate - 11 / 3) < 0.2
+
+    def test_prism_program(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P=? [F \"one\"]", self.program)[0]
+        result = stormpy.smc.estimate(self.program, prop, stormpy.smc.ChernoffHoeffding(epsilon=0.05, delta=0.05), batch_size=100, seed=11)
+        assert result.converged
+        assert abs(result.estimate - 1 / 6) < 0.05
+
+    def test_ctmc_time_bounded(self):
+        import stormpy.smc
+        program = stormpy.parse_prism_program(get_example_path("ctmc", "tiny.sm"))
+        model = stormpy.build_model(program)
+        prop = stormpy.parse_properties_for_prism_program("P=? [F<=0.5 \"full\"]", program)[0]
+        exact = stormpy.model_checking(model, prop).at(model.initial_states[0])
+        result = stormpy.smc.estimate(model, prop, stormpy.smc.ChernoffHoeffding(epsilon=0.02, delta=0.05), seed=13)
+        assert abs(result.estimate - exact) < 0.02
+
+
+@numpy_avail
+class TestImportanceSplitting:
+    program = stormpy.parse_prism_program(get_example_path("dtmc", "random_walk.pm"))
+    options = stormpy.BuilderOptions()
+    options.set_build_state_valuations()
+    model = stormpy.build_sparse_model_with_options(program, options)
+    prop = stormpy.parse_properties_for_prism_program("P=? [F \"full\"]", program)[0]
+    exact = stormpy.model_checking(model, prop).at(model.initial_states[0])
+    thresholds = list(range(2, 10))
+
+    def test_restart(self):
+        import stormpy.smc
+        assert self.exact < 1e-5
+        result = stormpy.smc.estimate_rare_event(self.model, self.prop, "x", self.thresholds, stormpy.smc.Restart(splits=4, paths=2000),
+                                                 program=self.program, threads=2, seed=42)
+        assert result.samples == 2000
+        assert abs(result.estimate - self.exact) < 0.3 * self.exact
+        assert result.interval[0] < result.estimate < result.interval[1]
+
+    def test_restart_initial_level(self):
+        import stormpy.smc
+        # The initial state is already above the first threshold
+        result = stormpy.smc.estimate_rare_event(self.model, self.prop, "x", list(range(1, 10)), stormpy.smc.Restart(splits=4, paths=2000),
+                                                 program=self.program, threads=2, seed=42)
+        assert abs(result.estimate - self.exact) < 0.3 * self.exact
+
+    def test_fixed_effort(self):
+        import numpy as np
+        import stormpy.smc
+        # Importance given per state
+        importance = np.array([self.model.state_valuations.get_integer_value(state, self.program.get_module("walk").get_integer_variable("x").expression_variable)
+                               for state in range(self.model.nr_states)])
+        result = stormpy.smc.estimate_rare_event(self.model, self.prop, importance, self.thresholds, stormpy.smc.FixedEffort(effort=2000, runs=5), seed=7)
+        assert result.samples == 5
+        assert abs(result.estimate - self.exact) < 0.3 * self.exact
+
+    def test_unsupported(self):
+        import stormpy.smc
+        prop = stormpy.parse_properties_for_prism_program("P=? [F<=20 \"full\"]", self.program)[0]
+        with pytest.raises(NotImplementedError):
+            stormpy.smc.estimate_rare_event(self.model, prop, "x", self.thresholds, stormpy.smc.FixedEffort(), program=self.program)
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+import stormpy
+import stormpy.simulator
+import stormpy.examples
+import stormpy.examples.files
+from helpers.helper import get_example_path
+
+from configurations import numpy_avail
+
+
+@numpy_avail
+class TestTraces:
+
+    def test_writer_reader(self, tmpdir):
+        import numpy as np
+        import stormpy.traces
+        path = os.path.join(str(tmpdir), "traces.bin")
+        columns = {"states": ("i8", ()), "rewards": ("f8", (2,))}
+        for compression in [None, "zlib"]:
+            with stormpy.traces.TraceWriter(path, columns, chunk_size=4, compression=compression, metadata={"name": "test"}) as writer:
+                for trace in range(3):
+                    writer.start_trace()
+                    for step in range(trace * 3 + 1):
+                        writer.append(states=step, rewards=[step, -step])
+            with stormpy.traces.TraceReader(path) as reader:
+                assert len(reader) == 3
+                assert reader.nr_steps == 13
+                assert reader.nr_chunks == 4
+                assert reader.metadata == {"name": "test"}
+                assert list(reader.trace_lengths()) == [1, 4, 7]
+                # The last trace spans two chunks
+                trace = reader[2]
+                assert list(trace["states"]) == list(range(7))
+                assert trace["rewards"].shape == (7, 2)
+                assert (trace["rewards"][:, 1] == -np.arange(7)).all()
+                assert not reader.chunk(0)["states"].flags.writeable
+
+    def test_sparse_simulator(self, tmpdir):
+        import stormpy.traces
+        path = os.path.join(str(tmpdir), "die.bin")
+        model = stormpy.build_model(stormpy.parse_prism_program(stormpy.examples.files.prism_dtmc_die))
+        simulator = stormpy.simulator.create_simulator(model, seed=42)
+        simulator.start_recording(path, chunk_size=16)
+        for _ in range(5):
+            while not simulator.is_done():
+                simulator.step()
+            simulator.restart()
+        simulator.stop_recording()
+
+        with stormpy.traces.TraceReader(path) as reader:
+            # Restarting starts a new trace
+            assert len(reader) == 6
+            assert reader.trace_lengths()[-1] == 1
+            label_names = reader.metadata["label_names"]
+            assert reader.metadata["reward_names"] == ["coin_flips"]
+            for trace in list(reader)[:5]:
+                assert trace["states"][0] == model.initial_states[0]
+                assert trace["actions"][0] == -1
+                assert (trace["actions"][1:] == 0).all()
+                assert (trace["rewards"][1:, 0] == 1).all()
+                assert "done" in stormpy.traces.decode_labels(trace["labels"][-1], label_names)
+                assert model.is_sink_state(int(trace["states"][-1]))
+
+    @pytest.mark.parametrize("sparse", [True, False])
+    def test_random_step_actions(self, tmpdir, sparse):
+        import stormpy.traces
+        path = os.path.join(str(tmpdir), "two_dice.bin")
+        program = stormpy.parse_prism_program(get_example_path("mdp", "two_dice.nm"))
+        simulator = stormpy.simulator.create_simulator(stormpy.build_model(program) if sparse else program, seed=42)
+        simulator.start_recording(path)
+        nr_actions = []
+        for _ in range(20):
+            nr_actions.append(simulator.nr_available_actions())
+            simulator.random_step()
+        simulator.stop_recording()
+
+        with stormpy.traces.TraceReader(path) as reader:
+            actions = reader[0]["actions"][1:]
+            # The chosen actions are recorded
+            assert all(0 <= action < nr for action, nr in zip(actions, nr_actions))
+
+    def test_prism_simulator(self, tmpdir):
+        import stormpy.traces
+        path = os.path.join(str(tmpdir), "die_program.bin")
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        simulator = stormpy.simulator.create_simulator(program, seed=42)
+        simulator.start_recording(path, compression="zlib")
+        while not simulator.is_done():
+            simulator.step()
+        simulator.stop_recording()
+
+        with stormpy.traces.TraceReader(path) as reader:
+            assert len(reader) == 1
+            trace = reader[0]
+            assert trace["states"].ndim == 2
+            assert "done" in stormpy.traces.decode_labels(trace["labels"][-1], reader.metadata["label_names"])
@@ -1,5 +1,7 @@
 import stormpy
 
+from configurations import numpy_avail
+
 
 class TestBitvector:
     def test_init_default(self):
@@ -40,3 +42,37 @@ class TestBitvector:
         assert bit.get(6) is False
         for i in range(bit.size()):
             assert bit.get(i) is not bit2.get(i)
+
+    @numpy_avail
+    def test_from_numpy(self):
+        import numpy as np
+        bit = stormpy.BitVector.from_numpy(np.array([True, False, False, True, True]))
+        assert bit == stormpy.BitVector(5, [0, 3, 4])
+        bit = stormpy.BitVector.from_numpy(np.arange(70) % 3 == 0)
+        assert bit.size() == 70
+        assert bit.number_of_set_bits() == 24
+        assert bit.get(69) is True
+
+    @numpy_avail
+    def test_to_numpy(self):
+        import numpy as np
+        bit = stormpy.BitVector(70, [0, 6, 64, 69])
+        array = bit.to_numpy()
+        assert array.dtype == np.bool_
+        assert array.shape == (70,)
+        assert list(np.flatnonzero(array)) == [0, 6, 64, 69]
+        assert stormpy.BitVector.from_numpy(array) == bit
+
+    @numpy_avail
+    def test_set_indices(self):
+        bit = stormpy.BitVector(70, [0, 6, 64, 69])
+        assert list(bit.set_indices()) == [0, 6, 64, 69]
+        assert len(stormpy.BitVector(10).set_indices()) == 0
+
+    @numpy_avail
+    def test_to_buckets(self):
+        bit = stormpy.BitVector(70, [0, 63, 64, 69])
+        buckets = bit.to_buckets()
+        assert len(buckets) == 2
+        assert buckets[0] == (1 << 63) | 1
+        assert buckets[1] == (1 << 63) | (1 << 58)
@@ -1,6 +1,8 @@
 import stormpy
 from helpers.helper import get_example_path
 
+from configurations import numpy_avail, scipy_avail
+
 import math
 
 
@@ -51,6 +53,50 @@ class TestMatrix:
         for e in matrix:
             assert e.value() == 0.5 or e.value() == 0 or (e.value() == 1 and e.column > 6)
 
+    @numpy_avail
+    def test_matrix_csr_arrays(self):
+        model = stormpy.build_sparse_model_from_explicit(get_example_path("mdp", "two_dice.tra"),
+                                                         get_example_path("mdp", "two_dice.lab"))
+        matrix = model.transition_matrix
+        row_indications, columns, values, row_groups = matrix.to_csr_arrays()
+        assert len(row_indications) == matrix.nr_rows + 1
+        assert row_indications[-1] == matrix.nr_entries
+        assert len(columns) == matrix.nr_entries
+        assert len(values) == matrix.nr_entries
+        assert len(row_groups) == model.nr_states + 1
+        assert row_groups[-1] == matrix.nr_rows
+        for state in range(model.nr_states):
+            assert list(matrix.get_rows_for_group(state)) == list(range(row_groups[state], row_groups[state + 1]))
+        for row in range(matrix.nr_rows):
+            entries = list(matrix.get_row(row))
+            assert list(columns[row_indications[row]:row_indications[row + 1]]) == [e.column for e in entries]
+            assert list(values[row_indications[row]:row_indications[row + 1]]) == [e.value() for e in entries]
+        assert not values.flags.writeable
+
+    @numpy_avail
+    def test_matrix_csr_arrays_view(self):
+        model = stormpy.build_sparse_model_from_explicit(get_example_path("dtmc", "die.tra"),
+                                                         get_example_path("dtmc", "die.lab"))
+        matrix = model.transition_matrix
+        _, _, values, _ = matrix.to_csr_arrays()
+        for e in matrix:
+            e.set_value(0.25)
+        # The values are a view on the matrix and reflect the change
+        assert all(v == 0.25 for v in values)
+        del model, matrix
+        assert all(v == 0.25 for v in values)
+
+    @scipy_avail
+    def test_matrix_to_scipy(self):
+        model = stormpy.build_sparse_model_from_explicit(get_example_path("dtmc", "die.tra"),
+                                                         get_example_path("dtmc", "die.lab"))
+        matrix = model.transition_matrix
+        csr = matrix.to_scipy()
+        assert csr.shape == (matrix.nr_rows, matrix.nr_columns)
+        assert csr.nnz == matrix.nr_entries
+        for e in matrix.get_row(0):
+            assert csr[0, e.column] == e.value()
+
     def test_change_matrix(self):
         model = stormpy.build_sparse_model_from_explicit(get_example_path("dtmc", "die.tra"),
                                                          get_example_path("dtmc", "die.lab"))
@@ -1,3 +1,4 @@
+import pytest
 import stormpy
 
 from configurations import numpy_avail
@@ -333,3 +334,90 @@ class TestMatrixBuilder:
 
         assert matrix.get_row_group_start(1) == 3
         assert matrix.get_row_group_end(1) == 4
+
+    @numpy_avail
+    def test_matrix_builder_add_entries(self):
+        import numpy as np
+        builder = stormpy.SparseMatrixBuilder(5, 5, force_dimensions=False)
+        builder.add_entries(np.array([0, 0, 2, 2, 3, 3, 4]), np.array([0, 1, 2, 3, 2, 4, 3]), np.array([0, 0.1, 22, 23, 32, 34, 43]))
+        matrix = builder.build()
+
+        assert matrix.nr_columns == 5
+        assert matrix.nr_rows == 5
+        assert matrix.nr_entries == 7
+        for e in matrix:
+            assert (e.value() == 0.1 and e.column == 1) or e.value() == 0 or (e.value() > 20 and e.column > 1)
+
+    @numpy_avail
+    def test_matrix_builder_add_entries_duplicate(self):
+        import numpy as np
+        builder = stormpy.SparseMatrixBuilder(3, 3, force_dimensions=False)
+        with pytest.raises(RuntimeError, match="Duplicate entry"):
+            builder.add_entries(np.array([0, 1, 1]), np.array([0, 2, 2]), np.array([1, 0.5, 0.5]))
+
+    @numpy_avail
+    def test_exact_matrix_builder_add_entries(self):
+        import numpy as np
+        builder = stormpy.ExactSparseMatrixBuilder(3, 3, force_dimensions=False)
+        values = [stormpy.Rational(1), stormpy.Rational("1/2"), stormpy.Rational("1/2"), stormpy.Rational(1)]
+        builder.add_entries(np.array([0, 1, 1, 2]), np.array([0, 0, 2, 2]), values)
+        matrix = builder.build()
+
+        assert matrix.nr_entries == 4
+        for e in matrix.get_row(1):
+            assert e.value() == stormpy.Rational("1/2")
+
+    @numpy_avail
+    def test_matrix_from_coo(self):
+        import numpy as np
+        # Entries are not ordered
+        rows = np.array([3, 0, 1, 3, 1])
+        columns = np.array([1, 2, 0, 0, 3])
+        values = np.array([0.5, 1, 0.1, 0.5, 0.9])
+
+        matrix = stormpy.build_sparse_matrix_from_coo(rows, columns, values, nr_rows=5)
+
+        assert matrix.nr_rows == 5
+        assert matrix.nr_columns == 4
+        assert matrix.nr_entries == 5
+        for r, c, v in zip(rows, columns, values):
+            assert any(e.column == c and e.value() == v for e in matrix.get_row(r))
+        assert len(matrix.get_row(2)) == 0
+        assert len(matrix.get_row(4)) == 0
+
+    @numpy_avail
+    def test_matrix_from_coo_row_grouping(self):
+        import numpy as np
+        rows = np.array([0, 1, 1, 2, 3])
+        columns = np.array([1, 0, 1, 1, 0])
+        values = np.array([1, 0.5, 0.5, 1, 1])
+
+        matrix = stormpy.build_sparse_matrix_from_coo(rows, columns, values, row_group_indices=[0, 2, 3])
+
+        assert matrix.nr_rows == 4
+        assert matrix.nr_columns == 2
+        assert matrix.nr_entries == 5
+        assert matrix.get_row_group_start(0) == 0
+        assert matrix.get_row_group_end(0) == 2
+        assert matrix.get_row_group_start(1) == 2
+        assert matrix.get_row_group_end(1) == 3
+        assert matrix.get_row_group_start(2) == 3
+        assert matrix.get_row_group_end(2) == 4
+
+    @numpy_avail
+    def test_parametric_matrix_from_coo(self):
+        import numpy as np
+        one_pol = stormpy.FactorizedPolynomial(stormpy.RationalRF(1))
+        two_pol = stormpy.FactorizedPolynomial(stormpy.RationalRF(2))
+        first_val = stormpy.FactorizedRationalFunction(one_pol, one_pol)
+        sec_val = stormpy.FactorizedRationalFunction(one_pol, two_pol)
+
+        matrix = stormpy.build_parametric_sparse_matrix_from_coo(np.array([1, 0, 1]), np.array([1, 0, 0]), [sec_val, first_val, sec_val])
+
+        assert matrix.nr_rows == 2
+        assert matrix.nr_columns == 2
+        assert matrix.nr_entries == 3
+        for e in matrix.get_row(0):
+            assert e.value() == first_val
+        for e in matrix.get_row(1):
+            assert e.value() == sec_val
@@ -0,0 +1,119 @@
+import os
+import pickle
+
+import pytest
+
+import stormpy
+from helpers.helper import get_example_path
+
+from configurations import numpy_avail
+
+
+def _assert_equal_models(model, restored):
+    assert type(restored) is type(model)
+    assert restored.nr_states == model.nr_states
+    assert restored.nr_choices == model.nr_choices
+    assert restored.nr_transitions == model.nr_transitions
+    assert restored.labeling.get_labels() == model.labeling.get_labels()
+    for label in model.labeling.get_labels():
+        assert restored.labeling.get_states(label) == model.labeling.get_states(label)
+    assert restored.initial_states == model.initial_states
+    assert restored.reward_models.keys() == model.reward_models.keys()
+    for row in range(model.nr_choices):
+        original = [(entry.column, entry.value()) for entry in model.transition_matrix.get_row(row)]
+        assert [(entry.column, entry.value()) for entry in restored.transition_matrix.get_row(row)] == original
+
+
+class TestSerialization:
+    def test_pickle_dtmc(self):
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        options = stormpy.BuilderOptions(True, True)
+        options.set_build_state_valuations()
+        model = stormpy.build_sparse_model_with_options(program, options)
+        restored = pickle.loads(pickle.dumps(model))
+        _assert_equal_models(model, restored)
+        assert restored.reward_models["coin_flips"].state_action_rewards == model.reward_models["coin_flips"].state_action_rewards
+        assert restored.has_state_valuations()
+        for state in range(model.nr_states):
+            assert restored.state_valuations.get_string(state) == model.state_valuations.get_string(state)
+
+        prop = stormpy.parse_properties_for_prism_program("R=? [F \"done\"]", program)[0]
+        result = stormpy.model_checking(restored, prop)
+        assert result.at(restored.initial_states[0]) == stormpy.model_checking(model, prop).at(model.initial_states[0])
+
+    def test_pickle_mdp(self):
+        program = stormpy.parse_prism_program(get_example_path("mdp", "two_dice.nm"))
+        options = stormpy.BuilderOptions()
+        options.set_build_choice_labels()
+        model = stormpy.build_sparse_model_with_options(program, options)
+        restored = pickle.loads(pickle.dumps(model))
+        _assert_equal_models(model, restored)
+        assert restored.transition_matrix.get_row_group_start(5) == model.transition_matrix.get_row_group_start(5)
+        assert restored.has_choice_labeling()
+        for choice in range(model.nr_choices):
+            assert restored.choice_labeling.get_labels_of_choice(choice) == model.choice_labeling.get_labels_of_choice(choice)
+
+    def test_pickle_ma(self):
+        program = stormpy.parse_prism_program(get_example_path("ma", "simple.ma"))
+        model = stormpy.build_model(program)
+        restored = pickle.loads(pickle.dumps(model))
+        _assert_equal_models(model, restored)
+        assert restored.markovian_states == model.markovian_states
+        assert restored.exit_rates == model.exit_rates
+
+    def test_binary_file(self, tmpdir):
+        model = stormpy.build_model_from_drn(get_example_path("ctmc", "dft.drn"))
+        path = os.path.join(str(tmpdir), "dft.bin")
+        stormpy.export_binary(model, path)
+        for mmap in [True, False]:
+            restored = stormpy.load_binary(path, mmap=mmap)
+            _assert_equal_models(model, restored)
+            assert restored.exit_rates == model.exit_rates
+
+    def test_binary_file_state_valuations(self, tmpdir):
+        import gc
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        options = stormpy.BuilderOptions()
+        options.set_build_state_valuations()
+        model = stormpy.build_sparse_model_with_options(program, options)
+        path = os.path.join(str(tmpdir), "die.bin")
+        stormpy.export_binary(model, path)
+        # The variables of the state valuations are declared in an expression manager owned by the restored model
+        restored = stormpy.load_binary(path)
+        gc.collect()
+        assert restored.has_state_valuations()
+        for state in range(model.nr_states):
+            assert restored.state_valuations.get_string(state) == model.state_valuations.get_string(state)
+
+    def test_binary_file_pomdp(self, tmpdir):
+        model = stormpy.build_model_from_drn(get_example_path("pomdp", "maze.drn"))
+        path = os.path.join(str(tmpdir), "maze.bin")
+        stormpy.export_binary(model, path)
+        restored = stormpy.load_binary(path)
+        _assert_equal_models(model, restored)
+        assert restored.observations == model.observations
+
+    def test_binary_file_unsupported(self, tmpdir):
+        model = stormpy.build_parametric_model_from_drn(get_example_path("pdtmc", "die.drn"))
+        with pytest.raises(stormpy.StormError):
+            stormpy.export_binary(model, os.path.join(str(tmpdir), "die.bin"))
+        symbolic_model = stormpy.build_symbolic_model(stormpy.parse_prism_program(get_example_path("dtmc", "die.pm")))
+        with pytest.raises(stormpy.StormError):
+            stormpy.export_binary(symbolic_model, os.path.join(str(tmpdir), "die.bin"))
+
+    @numpy_avail
+    def test_shared_model(self):
+        import numpy as np
+        program = stormpy.parse_prism_program(get_example_path("dtmc", "die.pm"))
+        model = stormpy.build_model(program)
+        with stormpy.share_sparse_model(model) as shared:
+            handle = pickle.loads(pickle.dumps(shared))
+            assert handle.name == shared.name
+            _assert_equal_models(model, handle.attach())
+            arrays = handle.arrays()
+            assert len(arrays["row_group_indices"]) == model.nr_states + 1
+            assert arrays["row_starts"][-1] == model.nr_transitions
+            assert not arrays["values"].flags.writeable
+            assert np.isclose(arrays["values"][arrays["row_starts"][0]:arrays["row_starts"][1]].sum(), 1)
+            del arrays
+            handle.close()